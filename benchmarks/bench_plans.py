@@ -0,0 +1,99 @@
+"""Throughput of the fleet plan fan-out against an offline fake terraform.
+
+Usage: python benchmarks/bench_plans.py [--envs 64] [--concurrency 1,4,16] [--latency 0.2]
+                                        [--init-latency 1.0] [--fail-rate 0.05]
+                                        [--output benchmarks/results/plans.json]
+
+Installs ``benchmarks/fake_terraform.py`` as ``terraform`` on PATH (no network, no
+providers), synthesizes ``--envs`` environments and runs ``FleetPlanService`` over them at
+each ``--concurrency``, every run with a cold terraform cache. ``--latency`` is what each
+fake plan takes, ``--init-latency`` each fake ``terraform init`` (paid once per worker
+slot), and ``--fail-rate`` the share of plans that fail transiently and are retried.
+Reports wall time, plans per second, retries and the ``terraform init`` count per run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from okml.config import Settings
+from okml.domain.synth import SynthConfig, synth_environments
+from okml.services.plan_service import FleetPlanService
+
+ROOT = Path(__file__).resolve().parents[1]
+FAKE_TERRAFORM = Path(__file__).resolve().parent / "fake_terraform.py"
+SEED = 2026
+
+
+def install_fake_terraform(bin_dir: Path) -> None:
+    script = bin_dir / "terraform"
+    script.write_text(
+        f"#!{sys.executable}\n" + FAKE_TERRAFORM.read_text(encoding="utf-8"), encoding="utf-8"
+    )
+    script.chmod(0o755)
+    os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ['PATH']}"
+
+
+def bench(tmp: Path, fleet: Path, concurrency: int) -> dict[str, object]:
+    run_dir = tmp / f"c{concurrency}"
+    calls = run_dir / "terraform-calls.ndjson"
+    settings = Settings(artifacts_dir=run_dir / "artifacts", terraform_cache_dir=run_dir / "cache")
+    os.environ["FAKE_TF_LOG"] = str(calls)
+    summary = FleetPlanService(settings=settings, run_id="bench").run(
+        input_path=fleet, concurrency=concurrency, retries=3, backoff_s=0.05
+    )
+    commands = [json.loads(line)["args"][0] for line in calls.read_text().splitlines()]
+    return {
+        "concurrency": concurrency,
+        "plans": summary.total,
+        "failed": summary.failed,
+        "retried": summary.retried,
+        "inits": commands.count("init"),
+        "wall_s": summary.wall_s,
+        "plans_per_s": round(summary.total / summary.wall_s, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--envs", type=int, default=64)
+    parser.add_argument("--concurrency", default="1,4,16")
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--init-latency", type=float, default=1.0)
+    parser.add_argument("--fail-rate", type=float, default=0.05)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # the plan service plans ./iac/terraform
+    os.environ["FAKE_TF_LATENCY_S"] = str(args.latency)
+    os.environ["FAKE_TF_INIT_LATENCY_S"] = str(args.init_latency)
+    os.environ["FAKE_TF_FAIL_RATE"] = str(args.fail_rate)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="okml-bench-plans-") as td:
+        tmp = Path(td)
+        (tmp / "bin").mkdir()
+        install_fake_terraform(tmp / "bin")
+        fleet = tmp / "fleet.ndjson"
+        with fleet.open("w", encoding="utf-8") as f:
+            for record in synth_environments(SynthConfig(count=args.envs, seed=SEED)):
+                f.write(json.dumps(record, default=str) + "\n")
+        print(f"{'concurrency':>11} {'wall_s':>8} {'plans/s':>8} {'retried':>7} {'inits':>5}")
+        for concurrency in (int(c) for c in args.concurrency.split(",")):
+            row = bench(tmp, fleet, concurrency)
+            results.append(row)
+            print(
+                f"{concurrency:>11} {row['wall_s']:>8.2f} {row['plans_per_s']:>8.2f} "
+                f"{row['retried']:>7} {row['inits']:>5}"
+            )
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
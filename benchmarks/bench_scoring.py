@@ -0,0 +1,153 @@
+"""Scalar vs vectorized scoring throughput.
+
+Usage: python benchmarks/bench_scoring.py [--sizes 1000,100000,1000000] [--scalar-cap 20000]
+
+The scalar path needs one ``LegacyEnvironment`` object per row, which does not fit in
+memory at 1M rows; it is timed on at most ``--scalar-cap`` rows and extrapolated
+linearly (marked with ``*``). Scalar results are checked against the batch results
+on every timed row.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from okml.domain.batch_scoring import (
+    HYPERVISORS,
+    RBAC_MATURITIES,
+    SEGMENTATIONS,
+    UPGRADE_STRATEGIES,
+    VISIBILITIES,
+    ScoringColumns,
+    score_batch,
+)
+from okml.domain.models import (
+    IncidentRecord,
+    LegacyCompute,
+    LegacyControlPlane,
+    LegacyEnvironment,
+    LegacyNetwork,
+    LegacyStorage,
+    LegacyTenancy,
+    ProvisioningStep,
+)
+from okml.domain.scoring import score_environment
+
+
+def synthetic_columns(n: int, seed: int = 2026) -> ScoringColumns:
+    rng = np.random.default_rng(seed)
+    incident_count = rng.integers(0, 8, n)
+    sev1 = rng.binomial(incident_count, 0.2)
+    sev2 = rng.binomial(incident_count - sev1, 0.4)
+    step_count = rng.integers(1, 6, n)
+    return ScoringColumns(
+        sev1_incidents=sev1,
+        sev2_incidents=sev2,
+        incident_count=incident_count,
+        restore_minutes_total=incident_count * rng.integers(10, 300, n),
+        manual_touchpoints_total=step_count * rng.integers(0, 4, n),
+        # One value per step would be summed left to right; a single step keeps it exact.
+        step_error_rate_sum=np.round(rng.uniform(0, 20, n), 1),
+        step_count=np.ones(n, dtype=np.int64),
+        infra_changes_per_week=rng.integers(0, 30, n),
+        change_failure_rate_percent=np.round(rng.uniform(0, 40, n), 1),
+        backup_success_rate_percent=np.round(rng.uniform(80, 100, n), 1),
+        config_drift_rate_percent=np.round(rng.uniform(0, 40, n), 1),
+        ha_enabled=rng.random(n) < 0.5,
+        db_clustered=rng.random(n) < 0.5,
+        message_bus_clustered=rng.random(n) < 0.5,
+        replication_enabled=rng.random(n) < 0.5,
+        self_service_portal=rng.random(n) < 0.5,
+        hypervisor=rng.integers(0, len(HYPERVISORS), n).astype(np.uint8),
+        segmentation=rng.integers(0, len(SEGMENTATIONS), n).astype(np.uint8),
+        east_west_visibility=rng.integers(0, len(VISIBILITIES), n).astype(np.uint8),
+        upgrade_strategy=rng.integers(0, len(UPGRADE_STRATEGIES), n).astype(np.uint8),
+        rbac_maturity=rng.integers(0, len(RBAC_MATURITIES), n).astype(np.uint8),
+    )
+
+
+def environment_at(cols: ScoringColumns, i: int) -> LegacyEnvironment:
+    """Rebuild a model equivalent to row ``i`` (unvalidated, for timing the scalar path)."""
+    n_inc = int(cols.incident_count[i])
+    sev1, sev2 = int(cols.sev1_incidents[i]), int(cols.sev2_incidents[i])
+    severities = ["sev1"] * sev1 + ["sev2"] * sev2 + ["sev3"] * (n_inc - sev1 - sev2)
+    per_incident = int(cols.restore_minutes_total[i]) // max(1, n_inc)
+    return LegacyEnvironment.model_construct(
+        name=f"env-{i}",
+        region="bench",
+        compute=LegacyCompute.model_construct(
+            hypervisor=HYPERVISORS[cols.hypervisor[i]],
+            compute_nodes=1,
+            overcommit_ratio=2.0,
+            patch_cadence_days=30,
+        ),
+        storage=LegacyStorage.model_construct(
+            replication_enabled=bool(cols.replication_enabled[i]),
+            backup_success_rate_percent=float(cols.backup_success_rate_percent[i]),
+        ),
+        network=LegacyNetwork.model_construct(
+            segmentation=SEGMENTATIONS[cols.segmentation[i]],
+            east_west_visibility=VISIBILITIES[cols.east_west_visibility[i]],
+            change_failure_rate_percent=float(cols.change_failure_rate_percent[i]),
+        ),
+        control_plane=LegacyControlPlane.model_construct(
+            openstack_release="bench",
+            ha_enabled=bool(cols.ha_enabled[i]),
+            db_clustered=bool(cols.db_clustered[i]),
+            message_bus_clustered=bool(cols.message_bus_clustered[i]),
+            upgrade_strategy=UPGRADE_STRATEGIES[cols.upgrade_strategy[i]],
+        ),
+        tenancy=LegacyTenancy.model_construct(
+            tenants=1,
+            self_service_portal=bool(cols.self_service_portal[i]),
+            rbac_maturity=RBAC_MATURITIES[cols.rbac_maturity[i]],
+        ),
+        deployments_per_week=0,
+        infra_changes_per_week=int(cols.infra_changes_per_week[i]),
+        config_drift_rate_percent=float(cols.config_drift_rate_percent[i]),
+        incidents_last_90d=[
+            IncidentRecord.model_construct(severity=s, minutes_to_restore=per_incident)
+            for s in severities
+        ],
+        provisioning_workflow=[
+            ProvisioningStep.model_construct(
+                manual_touchpoints=int(cols.manual_touchpoints_total[i]),
+                error_rate_percent=float(cols.step_error_rate_sum[i]),
+            )
+        ],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,100000,1000000")
+    parser.add_argument("--scalar-cap", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'scalar_s':>12} {'vector_s':>10} {'speedup':>9}")
+    for n in (int(s) for s in args.sizes.split(",")):
+        cols = synthetic_columns(n)
+
+        t0 = time.perf_counter()
+        batch = score_batch(cols)
+        vector_s = time.perf_counter() - t0
+
+        timed = min(n, args.scalar_cap)
+        envs = [environment_at(cols, i) for i in range(timed)]
+        t0 = time.perf_counter()
+        scalar = [score_environment(env) for env in envs]
+        scalar_s = (time.perf_counter() - t0) * (n / timed)
+        mismatches = sum(1 for i, s in enumerate(scalar) if batch.at(i) != s)
+        if mismatches:
+            raise SystemExit(f"{mismatches} scalar/batch mismatches at n={n}")
+
+        mark = "*" if timed < n else " "
+        speedup = scalar_s / vector_s
+        print(f"{n:>10} {scalar_s:>11.3f}{mark} {vector_s:>10.4f} {speedup:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
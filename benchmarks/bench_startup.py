@@ -0,0 +1,81 @@
+"""CLI cold-start budget for ``okml --help``.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--budget-ms 400] [--command "--help"]
+                                          [--forbid matplotlib,pydantic,numpy]
+
+Runs ``python -X importtime -m okml <command>`` in fresh interpreters and reports the
+median total import time (sum of ``-X importtime`` self times) and wall time, plus the
+heaviest top-level imports. Exits non-zero when the median import time exceeds
+``--budget-ms`` or when a ``--forbid`` package (by default the ones only pipeline stages
+need) is imported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """(module, self_us, cumulative_us, depth) for every ``import time:`` line."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cum_us), depth))
+    return rows
+
+
+def measure(args: list[str]) -> tuple[float, float, list[tuple[str, int, int, int]]]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "okml", *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    wall_ms = (time.perf_counter() - t0) * 1000
+    rows = parse_importtime(proc.stderr)
+    return sum(r[1] for r in rows) / 1000, wall_ms, rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=400.0)
+    parser.add_argument("--command", default="--help")
+    parser.add_argument("--forbid", default="matplotlib,pydantic,numpy")
+    args = parser.parse_args()
+
+    samples = [measure(args.command.split()) for _ in range(args.runs)]
+    import_ms = statistics.median(s[0] for s in samples)
+    wall_ms = statistics.median(s[1] for s in samples)
+    rows = samples[-1][2]
+
+    print(f"okml {args.command}: import {import_ms:.1f} ms, wall {wall_ms:.1f} ms (median)")
+    print("heaviest top-level imports:")
+    for name, _, cum_us, _ in sorted((r for r in rows if r[3] == 1), key=lambda r: -r[2])[:8]:
+        print(f"  {cum_us / 1000:8.1f} ms  {name}")
+
+    loaded = sorted({r[0].split(".")[0] for r in rows} & set(filter(None, args.forbid.split(","))))
+    if loaded:
+        raise SystemExit(f"FAIL: okml {args.command} imported {', '.join(loaded)}")
+    if import_ms > args.budget_ms:
+        raise SystemExit(f"FAIL: import time {import_ms:.1f} ms > budget {args.budget_ms} ms")
+    print(f"OK: within {args.budget_ms} ms budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""Pipeline benchmark suite across synthetic fleet sizes, with a baseline regression gate.
+
+Usage: python benchmarks/bench_suite.py [--sizes 1,100,10000,100000] [--repeat 5] [--min-time 0.1]
+                                        [--cap 2000] [--chart-cap 5] [--workers N]
+                                        [--e2e-repeat 1]
+                                        [--output benchmarks/results/latest.json]
+                                        [--baseline benchmarks/baseline.json]
+                                        [--threshold 0.25] [--save-baseline]
+                                        [--require-baseline]
+
+For every size it times two steps over the whole fleet: batch scoring, and
+``fleet_ndjson``, a full ``okml assess --input-ndjson`` run (``FleetAssessmentService``
+on ``--workers`` processes, per-environment artifacts and fleet index included) over an
+NDJSON file of that many synthetic records, best of ``--e2e-repeat`` runs. It also times
+scalar scoring, assessment, recommendations, KPI generation, chart rendering (built-in
+SVG, and the opt-in matplotlib PNGs), dashboard writing and assessment artifact writing
+per environment; those run on at most ``--cap`` environments (``--chart-cap`` for
+matplotlib) and are extrapolated linearly to the full size. ``measured`` records how
+many actually ran and extrapolated rows are flagged ``extrapolated``.
+Each step keeps the best of ``--repeat`` rounds of at least ``--min-time`` seconds.
+
+Results are written as JSON to ``--output``. When ``--baseline`` exists, every
+``(bench, size)`` measured at full size whose per-environment time is more than
+``--threshold`` slower than the baseline is reported and the script exits non-zero.
+Extrapolated rows are recorded but not gated: they would repeat the ``--cap``
+measurement and hide anything that grows faster than linearly with the fleet.
+``--save-baseline`` writes the current results to ``--baseline`` instead. With
+``--require-baseline`` (as ``make bench`` runs it) a missing baseline is an error,
+reported before anything is timed; otherwise the results are only recorded. Everything
+runs offline: inputs are generated by ``okml.domain.synth`` and inputs and artifacts go
+to a temporary directory.
+Baselines are per machine; record one on the box that gates releases and keep it
+otherwise idle while benchmarking.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Sequence
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from bench_scoring import synthetic_columns
+
+from okml import __version__
+from okml.config import Settings
+from okml.domain.batch_scoring import score_batch
+from okml.domain.kpis import generate_kpis
+from okml.domain.models import AssessmentScores, LegacyEnvironment, RoadmapItem
+from okml.domain.recommendations import recommend
+from okml.domain.scoring import score_environment
+from okml.domain.synth import SynthConfig, synth_environments
+from okml.reporting.artifact_writer import ArtifactWriter
+from okml.reporting.svg_charts import provisioning_time_svg, uptime_trend_svg
+from okml.reporting.writers import (
+    plot_provisioning_time_png,
+    plot_uptime_trend_png,
+    render_dashboard_html,
+)
+from okml.services.assessment_service import assess_environment, write_assessment_artifacts
+from okml.services.fleet_service import FleetAssessmentService
+
+ROOT = Path(__file__).resolve().parents[1]
+SEED = 2026
+
+
+def synthetic_environments(count: int, seed: int = SEED) -> list[LegacyEnvironment]:
+    config = SynthConfig(count=count, seed=seed)
+    return [LegacyEnvironment.model_validate(r) for r in synth_environments(config)]
+
+
+def write_synthetic_ndjson(path: Path, count: int, seed: int = SEED) -> None:
+    with path.open("w", encoding="utf-8") as f:
+        for record in synth_environments(SynthConfig(count=count, seed=seed)):
+            f.write(json.dumps(record) + "\n")
+
+
+def best_of(repeat: int, fn: Callable[[], object], min_time: float) -> float:
+    """Best seconds per call over ``repeat`` rounds of at least ``min_time`` each.
+
+    Calls are looped within a round (like ``timeit.autorange``) so microsecond steps on
+    tiny fleets are not swamped by timer and scheduler noise.
+    """
+    t0 = time.perf_counter()
+    fn()
+    loops = max(1, int(min_time / max(time.perf_counter() - t0, 1e-9)))
+    best = float("inf")
+    gc.collect()
+    gc.disable()  # as timeit does: collector pauses land on whichever step allocates next
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            for _ in range(loops):
+                fn()
+            best = min(best, (time.perf_counter() - t0) / loops)
+    finally:
+        gc.enable()
+    return best
+
+
+def result(bench: str, size: int, measured: int, seconds: float) -> dict[str, Any]:
+    per_item = seconds / measured
+    return {
+        "bench": bench,
+        "size": size,
+        "measured": measured,
+        "per_item_us": round(per_item * 1e6, 3),
+        "total_s": round(per_item * size, 6),
+        "extrapolated": measured < size,
+    }
+
+
+def run_size(
+    n: int,
+    *,
+    repeat: int,
+    min_time: float,
+    cap: int,
+    chart_cap: int,
+    workers: int,
+    e2e_repeat: int,
+    tmp: Path,
+) -> list[dict[str, Any]]:
+    fleet = tmp / f"fleet-{n}.ndjson"
+    write_synthetic_ndjson(fleet, n)
+    service = FleetAssessmentService(
+        settings=Settings(artifacts_dir=tmp / f"artifacts-{n}"), run_id="bench"
+    )
+
+    def fleet_ndjson() -> None:
+        summary = service.run_ndjson(input_path=fleet, workers=workers)
+        if summary.succeeded != n:
+            raise RuntimeError(f"fleet_ndjson @ {n}: only {summary.succeeded} assessed")
+
+    e2e = result("fleet_ndjson", n, n, best_of(e2e_repeat, fleet_ndjson, 0.0))
+    cols = synthetic_columns(n, seed=SEED)
+    envs = synthetic_environments(min(n, cap))
+    scores: list[AssessmentScores] = [score_environment(env) for env in envs]
+    recs: list[list[RoadmapItem]] = [recommend(env, s) for env, s in zip(envs, scores, strict=True)]
+    kpis = [
+        generate_kpis(scores=s, recommendations=r, seed=SEED)
+        for s, r in zip(scores, recs, strict=True)
+    ]
+    m, c = len(envs), min(n, chart_cap)
+
+    def charts() -> list[tuple[str, str]]:
+        return [
+            (
+                uptime_trend_svg(
+                    before_uptime=k["before"]["uptime_monthly_percent"],
+                    after_uptime=k["after"]["uptime_monthly_percent"],
+                ),
+                provisioning_time_svg(
+                    before_p50=k["before"]["provisioning_time_minutes_p50"],
+                    after_p50=k["after"]["provisioning_time_minutes_p50"],
+                ),
+            )
+            for k in kpis
+        ]
+
+    def charts_png() -> None:
+        for k in kpis[:c]:
+            plot_uptime_trend_png(
+                before_uptime=k["before"]["uptime_monthly_percent"],
+                after_uptime=k["after"]["uptime_monthly_percent"],
+            )
+            plot_provisioning_time_png(
+                before_p50=k["before"]["provisioning_time_minutes_p50"],
+                after_p50=k["after"]["provisioning_time_minutes_p50"],
+            )
+
+    svgs = charts()
+
+    def dashboards() -> None:
+        with ArtifactWriter() as out:
+            for i, (k, (uptime, prov)) in enumerate(zip(kpis, svgs, strict=True)):
+                html = render_dashboard_html(kpis=k, uptime_chart=uptime, provisioning_chart=prov)
+                out.write_text(tmp / f"dashboard-{i % 100}.html", html)
+
+    reports = [assess_environment(env) for env in envs]
+
+    def write_artifacts() -> None:
+        with ArtifactWriter() as out:
+            for i, report in enumerate(reports):
+                write_assessment_artifacts(tmp / f"env-{i % 100}", report, out)
+
+    pairs = list(zip(envs, scores, strict=True))
+    steps: Sequence[tuple[str, int, Callable[[], object]]] = [
+        ("score_batch", n, lambda: score_batch(cols)),
+        ("score", m, lambda: [score_environment(env) for env in envs]),
+        ("recommend", m, lambda: [recommend(env, s) for env, s in pairs]),
+        ("assess", m, lambda: [assess_environment(env) for env in envs]),
+        (
+            "kpis",
+            m,
+            lambda: [
+                generate_kpis(scores=s, recommendations=r, seed=SEED)
+                for s, r in zip(scores, recs, strict=True)
+            ],
+        ),
+        ("charts", m, charts),
+        ("charts_png", c, charts_png),
+        ("dashboard", m, dashboards),
+        ("write_artifacts", m, write_artifacts),
+    ]
+    return [e2e] + [
+        result(name, n, measured, best_of(repeat, fn, min_time))
+        for name, measured, fn in steps
+        if measured
+    ]
+
+
+def compare(
+    results: list[dict[str, Any]], baseline: list[dict[str, Any]], threshold: float
+) -> list[str]:
+    base = {(b["bench"], b["size"]): b["per_item_us"] for b in baseline}
+    regressions = []
+    for r in results:
+        if r["extrapolated"]:
+            continue
+        before = base.get((r["bench"], r["size"]))
+        if before is None or before <= 0:
+            continue
+        change = r["per_item_us"] / before - 1
+        r["vs_baseline"] = round(change, 3)
+        if change > threshold:
+            regressions.append(
+                f"{r['bench']} @ {r['size']}: {r['per_item_us']:.1f} us/env vs "
+                f"{before:.1f} baseline (+{change:.0%})"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1,100,10000,100000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.1)
+    parser.add_argument("--cap", type=int, default=2000)
+    parser.add_argument("--chart-cap", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--e2e-repeat", type=int, default=1)
+    parser.add_argument("--output", type=Path, default=ROOT / "benchmarks/results/latest.json")
+    parser.add_argument("--baseline", type=Path, default=ROOT / "benchmarks/baseline.json")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--require-baseline", action="store_true")
+    args = parser.parse_args()
+    if args.require_baseline and not args.save_baseline and not args.baseline.exists():
+        print(
+            f"FAIL: no baseline at {args.baseline}, so nothing would be gated. Record one on "
+            "this machine first: make bench-baseline",
+            file=sys.stderr,
+        )
+        raise SystemExit(2)
+
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="okml-bench-") as tmp:
+        for n in (int(s) for s in args.sizes.split(",")):
+            results += run_size(
+                n,
+                repeat=args.repeat,
+                min_time=args.min_time,
+                cap=args.cap,
+                chart_cap=args.chart_cap,
+                workers=args.workers,
+                e2e_repeat=args.e2e_repeat,
+                tmp=Path(tmp),
+            )
+
+    regressions: list[str] = []
+    if not args.save_baseline and args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.threshold)
+
+    print(
+        f"{'bench':<15} {'size':>8} {'measured':>9} {'us/env':>12} {'total_s':>10} {'vs base':>8}"
+    )
+    for r in results:
+        mark = "*" if r["extrapolated"] else " "
+        vs = f"{r['vs_baseline']:+.0%}" if "vs_baseline" in r else "-"
+        print(
+            f"{r['bench']:<15} {r['size']:>8} {r['measured']:>9} {r['per_item_us']:>12.1f} "
+            f"{r['total_s']:>9.3f}{mark} {vs:>8}"
+        )
+
+    payload = {
+        "meta": {
+            "okml_version": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "created": datetime.now(UTC).isoformat(timespec="seconds"),
+            "argv": sys.argv[1:],
+        },
+        "results": results,
+    }
+    target = args.baseline if args.save_baseline else args.output
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    print("* extrapolated from `measured` environments; recorded, not gated")
+    print(f"Results written to {target}")
+
+    if regressions:
+        print(f"FAIL: {len(regressions)} regression(s) over {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        raise SystemExit(1)
+    if not args.save_baseline and not args.baseline.exists():
+        print(
+            f"WARNING: no baseline at {args.baseline}; nothing was gated. "
+            "Run with --save-baseline to create one.",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Offline stand-in for the terraform CLI, for benchmarking plan fan-out without a network.
+
+Install it as ``terraform`` on PATH (``bench_plans.py`` does). It implements just enough
+of ``init``, ``plan -out=FILE``, ``apply FILE`` and ``output -json`` for
+``TerraformRunner``, sleeping to model real latency:
+
+  FAKE_TF_INIT_LATENCY_S  seconds per ``init`` (provider download), default 1.0
+  FAKE_TF_LATENCY_S       seconds per ``plan``/``apply``, default 0.2
+  FAKE_TF_FAIL_RATE       chance a plan fails with a transient registry error, default 0
+  FAKE_TF_FAIL_ONCE_DIR   fail each environment's first plan that way (markers go here)
+  FAKE_TF_LOG             append one JSON line per call to this file
+"""
+
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+
+def main(args: list[str]) -> int:
+    if log := os.environ.get("FAKE_TF_LOG"):
+        with open(log, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"args": args, "cwd": os.getcwd(), "pid": os.getpid()}) + "\n")
+    cmd = args[0] if args else ""
+    latency = float(os.environ.get("FAKE_TF_LATENCY_S", "0.2"))
+    tfvars = Path("okml.auto.tfvars.json")
+    variables = json.loads(tfvars.read_text()) if tfvars.is_file() else {}
+    units = variables.get("provisioning_units", 12)
+    if cmd == "init":
+        # Like terraform, installing into a shared plugin cache is not safe concurrently.
+        cache = Path(os.environ.get("TF_PLUGIN_CACHE_DIR", "."), ".fake-installing")
+        try:
+            cache.touch(exist_ok=False)
+        except FileExistsError:
+            print("Error: plugin cache is being written by another init", file=sys.stderr)
+            return 1
+        time.sleep(float(os.environ.get("FAKE_TF_INIT_LATENCY_S", "1.0")))
+        cache.unlink()
+        Path(".terraform").mkdir(exist_ok=True)
+        Path(".terraform.lock.hcl").write_text('provider "registry.terraform.io/hashicorp/null"\n')
+        print("Terraform has been successfully initialized!")
+    elif cmd == "plan":
+        if not Path(".terraform").is_dir():
+            print("Error: Inconsistent dependency lock file; run terraform init", file=sys.stderr)
+            return 1
+        time.sleep(latency)
+        flaky = random.random() < float(os.environ.get("FAKE_TF_FAIL_RATE", "0"))
+        if once := os.environ.get("FAKE_TF_FAIL_ONCE_DIR"):
+            marker = Path(once, str(variables.get("environment", "lab")))
+            flaky = not marker.exists()
+            marker.touch()
+        if flaky:
+            print("Error: Failed to query provider: connection reset by peer", file=sys.stderr)
+            return 1
+        out = next(a.split("=", 1)[1] for a in args if a.startswith("-out="))
+        Path(out).write_text(json.dumps(variables))
+        print(f"  # null_resource.provision_units will be created ({units} units)")
+        print(f"  environment = {variables.get('environment', 'lab')!r}")
+        print("Plan: 3 to add, 0 to change, 0 to destroy.")
+    elif cmd == "apply":
+        time.sleep(latency)
+        Path("terraform.tfstate").write_text(Path(args[-1]).read_text())
+        print("Apply complete! Resources: 3 added, 0 changed, 0 destroyed.")
+    elif cmd == "output":
+        print(json.dumps({"provisioning_units": {"value": units, "type": "number"}}))
+    else:
+        print(f"fake terraform: unsupported command {cmd!r}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,134 @@
+"""Load test for ``okml serve``.
+
+Usage: python benchmarks/load_serve.py [--url http://127.0.0.1:8787] [--requests 2000]
+                                       [--concurrency 16] [--workers 2] [--queue-size 256]
+
+Without ``--url`` an ``okml serve`` subprocess is started on a free port and stopped at
+the end. Each client thread keeps one HTTP/1.1 connection open and posts the sample
+environment back to back; the report shows throughput, latency percentiles and how
+many requests were turned away with 503 (backpressure) rather than queued.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import re
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import yaml
+
+from okml.domain.models import LegacyEnvironment
+
+ROOT = Path(__file__).resolve().parents[1]
+_results_lock = threading.Lock()
+
+
+def start_server(workers: int, queue_size: int) -> tuple[subprocess.Popen[str], str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT / "src"), env.get("PYTHONPATH")]))
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "okml",
+            "serve",
+            "--port",
+            "0",
+            "--workers",
+            str(workers),
+            "--queue-size",
+            str(queue_size),
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        env=env,
+    )
+    assert proc.stdout is not None
+    for line in proc.stdout:  # log lines come first; the banner carries the address
+        match = re.search(r"Serving on (http://\S+)", line)
+        if match is not None:
+            return proc, match.group(1)
+    proc.kill()
+    raise SystemExit("okml serve exited before it started serving")
+
+
+def client(
+    url: str, payload: bytes, n: int, latencies: list[float], statuses: dict[int, int]
+) -> None:
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.netloc, timeout=60)
+    headers = {"Content-Type": "application/json"}
+    local: list[float] = []
+    codes: dict[int, int] = {}
+    for _ in range(n):
+        t0 = time.perf_counter()
+        conn.request("POST", "/assess", body=payload, headers=headers)
+        resp = conn.getresponse()
+        resp.read()
+        local.append(time.perf_counter() - t0)
+        codes[resp.status] = codes.get(resp.status, 0) + 1
+    conn.close()
+    with _results_lock:
+        latencies.extend(local)
+        for code, count in codes.items():
+            statuses[code] = statuses.get(code, 0) + count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--queue-size", type=int, default=256)
+    args = parser.parse_args()
+
+    raw = yaml.safe_load((ROOT / "sample_data" / "legacy_env.yaml").read_text(encoding="utf-8"))
+    payload = LegacyEnvironment.model_validate(raw).model_dump_json().encode()
+
+    proc, url = (None, args.url) if args.url else start_server(args.workers, args.queue_size)
+    try:
+        latencies: list[float] = []
+        statuses: dict[int, int] = {}
+        per_client = max(1, args.requests // args.concurrency)
+        threads = [
+            threading.Thread(target=client, args=(url, payload, per_client, latencies, statuses))
+            for _ in range(args.concurrency)
+        ]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - t0
+
+        conn = http.client.HTTPConnection(urlsplit(url).netloc)
+        conn.request("GET", "/healthz")
+        health = json.loads(conn.getresponse().read())
+    finally:
+        if proc is not None:
+            proc.send_signal(signal.SIGINT)
+            proc.wait(timeout=30)
+
+    ms = sorted(x * 1000 for x in latencies)
+    q = statistics.quantiles(ms, n=100)
+    print(f"{len(ms)} requests, concurrency {args.concurrency}, {wall:.2f}s")
+    print(f"throughput: {len(ms) / wall:,.0f} req/s")
+    print(f"latency ms: p50 {q[49]:.2f}  p95 {q[94]:.2f}  p99 {q[98]:.2f}  max {ms[-1]:.2f}")
+    print(f"status: {dict(sorted(statuses.items()))}")
+    print(f"server: mean batch {health['mean_batch_size']}, 503s {health['rejected_overloaded']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,13 +23,26 @@ variable "provisioning_units" {
   default     = 12
 }
 
+variable "environment" {
+  type        = string
+  description = "Legacy environment this plan provisions (one plan per environment in fleet runs)."
+  default     = "lab"
+}
+
+variable "region" {
+  type    = string
+  default = "local"
+}
+
 resource "random_id" "run" {
   byte_length = 4
 }
 
 resource "null_resource" "provision_units" {
   triggers = {
-    run_id            = random_id.run.hex
+    run_id             = random_id.run.hex
+    environment        = var.environment
+    region             = var.region
     provisioning_units = tostring(var.provisioning_units)
   }
 }
@@ -40,6 +53,7 @@ resource "local_file" "change_plan" {
 OKML Local Terraform Model
 
 Run: ${random_id.run.hex}
+Environment: ${var.environment} (${var.region})
 Provisioning units: ${var.provisioning_units}
 
 This config intentionally models "provisioning units" locally and is safe to run without infrastructure.
@@ -50,6 +64,10 @@ output "provisioning_units" {
   value = var.provisioning_units
 }
 
+output "environment" {
+  value = var.environment
+}
+
 output "standardized_k8s_baseline" {
   value = true
 }
@@ -25,8 +25,8 @@ req_files=(
   "${ART_DIR}/automation/ansible_run.log"
   "${ART_DIR}/kpis/kpis.json"
   "${ART_DIR}/kpis/kpis.md"
-  "${ART_DIR}/kpis/uptime_trend.png"
-  "${ART_DIR}/kpis/provisioning_time.png"
+  "${ART_DIR}/kpis/uptime_trend.svg"
+  "${ART_DIR}/kpis/provisioning_time.svg"
   "${ART_DIR}/kpis/dashboard.html"
   "${ART_DIR}/executive/executive_summary.md"
 )
@@ -5,8 +5,9 @@ import tempfile
 from dataclasses import dataclass
 from pathlib import Path
 
+from okml.utils.fs import ensure_dir
 from okml.utils.logging import get_logger
-from okml.utils.subprocess import run_cmd
+from okml.utils.subprocess import CmdResult, StreamResult, run_cmd, stream_cmd
 
 
 @dataclass(frozen=True)
@@ -16,8 +17,15 @@ class AnsibleResult:
 
 
 class AnsibleRunner:
-    def __init__(self, repo_root: Path) -> None:
+    """Runs ``iac/ansible/site.yml`` against localhost, falling back to a mock.
+
+    With ``log_dir``, playbook output streams to ``ansible_run.log`` there and ``run_log``
+    keeps only its tail.
+    """
+
+    def __init__(self, repo_root: Path, *, log_dir: Path | None = None) -> None:
         self._repo_root = repo_root
+        self._log_dir = log_dir
         self._log = get_logger(__name__)
 
     def run(self) -> AnsibleResult:
@@ -43,12 +51,13 @@ class AnsibleRunner:
             inv = cwd / "inventory.ini"
             inv.write_text("[local]\nlocalhost ansible_connection=local\n", encoding="utf-8")
 
-            res = run_cmd(
-                [ansible_playbook, "-i", str(inv), "site.yml"],
-                cwd=cwd,
-                timeout_s=180,
-                check=True,
-            )
+            cmd = [ansible_playbook, "-i", str(inv), "site.yml"]
+            res: CmdResult | StreamResult
+            if self._log_dir is None:
+                res = run_cmd(cmd, cwd=cwd, timeout_s=180, check=True)
+            else:
+                tee = ensure_dir(self._log_dir) / "ansible_run.log"
+                res = stream_cmd(cmd, cwd=cwd, timeout_s=180, check=True, tee=tee)
             return AnsibleResult(run_log=res.stdout + "\n" + res.stderr, mode="real")
 
     def _mock(self) -> AnsibleResult:
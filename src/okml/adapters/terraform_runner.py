@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+import fcntl
+import hashlib
 import json
 import shutil
-import tempfile
+import subprocess
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
 
+from okml.storage.build_cache import fingerprint
+from okml.utils.fs import ensure_dir
 from okml.utils.logging import get_logger
-from okml.utils.subprocess import run_cmd
+from okml.utils.subprocess import CmdResult, StreamResult, run_cmd, stream_cmd
+
+DEFAULT_CACHE_DIR = Path(".okml-cache") / "terraform"
 
 
 @dataclass(frozen=True)
@@ -17,53 +26,146 @@ class TerraformResult:
     mode: str  # "real" | "mock"
 
 
+# Files in a workspace that survive between runs: the initialized providers, the lock file
+# terraform init wrote and our marker of it. Everything else is reset to the config.
+_INIT_DIR = ".terraform"
+_LOCK_FILE = ".terraform.lock.hcl"
+_INIT_MARKER = ".okml-init"
+_MUTEX = ".okml-mutex"
+_KEEP = frozenset({_INIT_DIR, _LOCK_FILE, _INIT_MARKER, _MUTEX})
+_PLUGINS_MUTEX = "plugins.lock"  # next to plugins/, which terraform owns
+PLAN_FILE = "okml.tfplan"
+VARS_FILE = "okml.auto.tfvars.json"  # terraform loads *.auto.tfvars.json by itself
+
+
 class TerraformRunner:
-    def __init__(self, repo_root: Path) -> None:
+    """Runs ``iac/terraform`` in a persistent workspace, falling back to a mock.
+
+    Workspaces live under ``cache_dir`` and are keyed by a hash of the config, so ``terraform
+    init`` only runs for a new config or when the lock file changed since the last init.
+    Providers are shared through ``TF_PLUGIN_CACHE_DIR`` (``cache_dir/plugins``). Each run
+    starts from empty state, plans once into a plan file and applies that file.
+
+    With ``log_dir``, plan and apply output streams to ``terraform_plan.log`` and
+    ``terraform_apply.log`` there and ``plan_text`` keeps only the tail of each.
+
+    Runners that may run at the same time on one config get distinct ``slot`` numbers, and
+    with them workspaces of their own (each initialized once). ``timeout_s`` bounds a whole
+    run rather than each command, and ``fallback=False`` raises terraform failures instead of
+    returning the mock, so a caller can retry them.
+    """
+
+    def __init__(
+        self,
+        repo_root: Path,
+        *,
+        cache_dir: Path | None = None,
+        log_dir: Path | None = None,
+        slot: int | None = None,
+        timeout_s: float | None = None,
+        fallback: bool = True,
+    ) -> None:
         self._repo_root = repo_root
+        self._cache_dir = cache_dir or repo_root / DEFAULT_CACHE_DIR
+        self._log_dir = log_dir
+        self._slot = slot
+        self._timeout_s = timeout_s
+        self._fallback = fallback
         self._log = get_logger(__name__)
 
-    def run(self) -> TerraformResult:
+    def run(
+        self, *, variables: Mapping[str, object] | None = None, apply: bool = True
+    ) -> TerraformResult:
+        """Plan (and unless ``apply=False``, apply) with ``variables`` set on the config.
+
+        A plan-only run returns empty ``outputs``.
+        """
         tf_dir = self._repo_root / "iac" / "terraform"
         if not tf_dir.exists():
             raise FileNotFoundError(f"Missing terraform dir: {tf_dir}")
 
         tf = shutil.which("terraform")
         if tf is None:
-            return self._mock()
+            return self._mock(variables or {}, apply=apply)
 
         try:
-            return self._real(terraform_bin=tf, tf_dir=tf_dir)
+            return self._real(terraform_bin=tf, tf_dir=tf_dir, variables=variables, apply=apply)
         except Exception as e:
+            if not self._fallback:
+                raise
             self._log.info("terraform_real_failed_fallback_to_mock", extra={"error": str(e)})
-            return self._mock()
-
-    def _real(self, *, terraform_bin: str, tf_dir: Path) -> TerraformResult:
-        with tempfile.TemporaryDirectory(prefix="okml-tf-") as td:
-            work = Path(td)
-            shutil.copytree(tf_dir, work / "tf", dirs_exist_ok=True)
-            cwd = work / "tf"
-
-            # WARNING: terraform init may require provider downloads; fallback to mock on failure.
-            run_cmd([terraform_bin, "init", "-input=false"], cwd=cwd, timeout_s=180, check=True)
-            plan = run_cmd(
-                [terraform_bin, "plan", "-input=false", "-no-color"],
+            return self._mock(variables or {}, apply=apply)
+
+    def _real(
+        self,
+        *,
+        terraform_bin: str,
+        tf_dir: Path,
+        variables: Mapping[str, object] | None,
+        apply: bool,
+    ) -> TerraformResult:
+        deadline = None if self._timeout_s is None else time.monotonic() + self._timeout_s
+        plugins = ensure_dir(self._cache_dir / "plugins")
+        env = {"TF_PLUGIN_CACHE_DIR": str(plugins.resolve()), "TF_IN_AUTOMATION": "1"}
+        name = f"ws-{fingerprint(tf_dir)[:16]}"
+        if self._slot is not None:
+            name += f"-s{self._slot}"
+        cwd = ensure_dir(self._cache_dir / name)
+        with _locked(cwd / _MUTEX):
+            _reset_workspace(cwd, tf_dir)
+            if variables:
+                (cwd / VARS_FILE).write_text(json.dumps(dict(variables)), encoding="utf-8")
+            if _needs_init(cwd):
+                # WARNING: init may need to download providers; failures fall back to mock.
+                # Terraform does not make the plugin cache safe for concurrent installs, so
+                # workspaces (slots) initialize one at a time; plans still run side by side.
+                cmd = [terraform_bin, "init", "-input=false"]
+                with _locked(self._cache_dir / _PLUGINS_MUTEX):
+                    timeout_s = _budget(deadline, cmd, 180)
+                    run_cmd(cmd, cwd=cwd, timeout_s=timeout_s, check=True, env=env)
+                (cwd / _INIT_MARKER).write_text(_lock_digest(cwd), encoding="utf-8")
+            else:
+                self._log.info("terraform_init_skipped", extra={"workspace": str(cwd)})
+            plan = self._run_logged(
+                [terraform_bin, "plan", "-input=false", "-no-color", f"-out={PLAN_FILE}"],
                 cwd=cwd,
-                timeout_s=180,
-                check=True,
+                env=env,
+                log_name="terraform_plan.log",
+                deadline=deadline,
             )
-            apply = run_cmd(
-                [terraform_bin, "apply", "-input=false", "-auto-approve", "-no-color"],
+            if not apply:
+                return TerraformResult(plan_text=plan.stdout, outputs={}, mode="real")
+            applied = self._run_logged(
+                [terraform_bin, "apply", "-input=false", "-no-color", PLAN_FILE],
                 cwd=cwd,
-                timeout_s=180,
-                check=True,
+                env=env,
+                log_name="terraform_apply.log",
+                deadline=deadline,
             )
-            out = run_cmd([terraform_bin, "output", "-json"], cwd=cwd, timeout_s=60, check=True)
+            cmd = [terraform_bin, "output", "-json"]
+            out = run_cmd(cmd, cwd=cwd, timeout_s=_budget(deadline, cmd, 60), check=True, env=env)
 
             outputs = json.loads(out.stdout) if out.stdout.strip() else {}
-            plan_text = plan.stdout + "\n" + apply.stdout
+            plan_text = plan.stdout + "\n" + applied.stdout
             return TerraformResult(plan_text=plan_text, outputs=outputs, mode="real")
 
-    def _mock(self) -> TerraformResult:
+    def _run_logged(
+        self,
+        cmd: list[str],
+        *,
+        cwd: Path,
+        env: dict[str, str],
+        log_name: str,
+        deadline: float | None,
+    ) -> CmdResult | StreamResult:
+        timeout_s = _budget(deadline, cmd, 180)
+        if self._log_dir is None:
+            return run_cmd(cmd, cwd=cwd, timeout_s=timeout_s, check=True, env=env)
+        tee = ensure_dir(self._log_dir) / log_name
+        return stream_cmd(cmd, cwd=cwd, timeout_s=timeout_s, check=True, env=env, tee=tee)
+
+    def _mock(self, variables: Mapping[str, object], *, apply: bool) -> TerraformResult:
+        units = variables.get("provisioning_units", 12)
         plan_text = (
             "Terraform used the selected providers to generate the following execution plan.\n\n"
             "  # null_resource.provision_units will be created\n"
@@ -72,9 +174,56 @@ class TerraformRunner:
             "    }\n\n"
             "Plan: 1 to add, 0 to change, 0 to destroy.\n"
         )
+        if not apply:
+            return TerraformResult(plan_text=plan_text, outputs={}, mode="mock")
         outputs = {
-            "provisioning_units": {"value": 12, "type": "number"},
+            "provisioning_units": {"value": units, "type": "number"},
             "standardized_k8s_baseline": {"value": True, "type": "bool"},
             "run_mode": {"value": "mock", "type": "string"},
         }
         return TerraformResult(plan_text=plan_text, outputs=outputs, mode="mock")
+
+
+def _reset_workspace(cwd: Path, tf_dir: Path) -> None:
+    """Make ``cwd`` the config plus the kept init files: no state or outputs of earlier runs."""
+    for p in cwd.iterdir():
+        if p.name in _KEEP:
+            continue
+        if p.is_dir() and not p.is_symlink():
+            shutil.rmtree(p)
+        else:
+            p.unlink()
+    shutil.copytree(tf_dir, cwd, dirs_exist_ok=True, ignore=shutil.ignore_patterns(_INIT_DIR))
+
+
+def _budget(deadline: float | None, cmd: list[str], default: float) -> float:
+    """Seconds ``cmd`` may take: ``default``, or what is left of the run's ``deadline``."""
+    if deadline is None:
+        return default
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise subprocess.TimeoutExpired(cmd, 0)
+    return left
+
+
+def _needs_init(cwd: Path) -> bool:
+    marker = cwd / _INIT_MARKER
+    if not (cwd / _INIT_DIR).is_dir() or not marker.is_file():
+        return True
+    return marker.read_text(encoding="utf-8") != _lock_digest(cwd)
+
+
+def _lock_digest(cwd: Path) -> str:
+    lock = cwd / _LOCK_FILE
+    return hashlib.sha256(lock.read_bytes()).hexdigest() if lock.is_file() else ""
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    """Exclusive use of a workspace across threads and processes."""
+    with path.open("a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
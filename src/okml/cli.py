@@ -1,21 +1,25 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated
 
 import typer
 
-from okml.config import load_settings
-from okml.services.assessment_service import AssessmentService
-from okml.services.automation_service import AutomationService
-from okml.services.design_service import DesignService
-from okml.services.executive_service import ExecutiveService
-from okml.services.kpi_service import KPIService
-from okml.utils.logging import configure_logging, get_logger
+from okml.utils.logging import configure_logging, get_logger, parse_sample_rates
 from okml.utils.run_id import new_run_id
 
+if TYPE_CHECKING:
+    from okml.config import Settings
+
+# Settings (pydantic), services, NumPy and matplotlib are imported inside the commands that
+# use them, so `okml --help` and single-stage commands skip the ones they never touch.
+# benchmarks/bench_startup.py guards the cold-start budget.
+
 app = typer.Typer(no_args_is_help=True, add_completion=False)
+dataset_app = typer.Typer(no_args_is_help=True, help="Columnar fleet datasets.")
+app.add_typer(dataset_app, name="dataset")
+bundle_app = typer.Typer(no_args_is_help=True, help="Read artifact bundles written with --bundle.")
+app.add_typer(bundle_app, name="bundle")
 
 
 ArtifactsDirOpt = Annotated[
@@ -30,24 +34,382 @@ ArtifactsDirOpt = Annotated[
 SeedOpt = Annotated[
     int | None, typer.Option("--seed", help="Deterministic seed for KPI simulation.")
 ]
+SimulationsOpt = Annotated[
+    int | None,
+    typer.Option(
+        "--simulations",
+        min=0,
+        help="Monte Carlo KPI scenarios for p5/p50/p95 bands (default: 0, point estimates).",
+    ),
+]
+ChartFormatOpt = Annotated[
+    str | None,
+    typer.Option(
+        "--chart-format",
+        help="KPI charts: svg (built-in, default) or png (matplotlib).",
+    ),
+]
 LogFormatOpt = Annotated[
     str | None, typer.Option("--log-format", help="Log format: pretty|json (default: pretty).")
 ]
+TraceFileOpt = Annotated[
+    Path | None,
+    typer.Option(
+        "--trace-file",
+        dir_okay=False,
+        help="Write trace spans for this run to PATH as OTLP/JSON.",
+    ),
+]
+
+
+BundleOpt = Annotated[
+    Path | None,
+    typer.Option(
+        "--bundle",
+        dir_okay=False,
+        help="Write every artifact into one archive (.tar.zst, .tar.gz or .zip) instead of "
+        "a directory tree.",
+    ),
+]
+BundlePathArg = Annotated[
+    Path, typer.Argument(exists=True, dir_okay=False, help="Bundle written with --bundle.")
+]
+
+
+def _configure_logging(settings: Settings, run_id: str) -> None:
+    try:
+        sample = parse_sample_rates(settings.log_sample)
+    except ValueError as e:
+        raise typer.BadParameter(f"OKML_LOG_SAMPLE: {e}") from None
+    configure_logging(
+        settings.log_format,
+        run_id=run_id,
+        queue=settings.log_queue,
+        log_file=settings.log_file,
+        max_bytes=settings.log_file_max_bytes,
+        backups=settings.log_file_backups,
+        sample=sample,
+    )
+
+
+def _check_chart_format(chart_format: str | None) -> None:
+    if chart_format not in (None, "svg", "png"):
+        raise typer.BadParameter("--chart-format must be svg or png.")
+
+
+def _check_bundle(bundle: Path | None) -> None:
+    import importlib.util
+
+    from okml.storage.bundle import bundle_kind
+
+    if bundle is None:
+        return
+    try:
+        kind = bundle_kind(bundle)
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from None
+    if kind == "zst" and importlib.util.find_spec("zstandard") is None:
+        raise typer.BadParameter(
+            ".tar.zst bundles need the optional 'zstandard' package; use .tar.gz or .zip."
+        )
 
 
 @app.command()
 def assess(
     input_path: Annotated[
-        Path, typer.Option("--input", exists=True, dir_okay=False, help="Legacy env YAML/JSON.")
-    ],
+        Path | None,
+        typer.Option(
+            "--input",
+            exists=True,
+            dir_okay=False,
+            help="Legacy env YAML/JSON, or an NDJSON fleet (.ndjson/.jsonl, one env per line).",
+        ),
+    ] = None,
+    input_dir: Annotated[
+        Path | None,
+        typer.Option(
+            "--input-dir",
+            exists=True,
+            file_okay=False,
+            help="Fleet mode: directory of legacy env YAML/JSON files.",
+        ),
+    ] = None,
+    pattern: Annotated[
+        str, typer.Option("--pattern", help="Glob applied under --input-dir (default: *).")
+    ] = "*",
+    dataset: Annotated[
+        Path | None,
+        typer.Option(
+            "--dataset",
+            exists=True,
+            file_okay=False,
+            help="Fleet mode: columnar dataset built with `okml dataset build`.",
+        ),
+    ] = None,
+    workers: Annotated[
+        int | None,
+        typer.Option("--workers", min=1, help="Fleet mode worker processes (default: CPUs)."),
+    ] = None,
+    force: Annotated[
+        bool,
+        typer.Option("--force", help="--input-dir: rescore every input, ignoring the manifest."),
+    ] = False,
     artifacts_dir: ArtifactsDirOpt = None,
     seed: SeedOpt = None,
     log_format: LogFormatOpt = None,
+    trace_path: TraceFileOpt = None,
+    bundle: BundleOpt = None,
 ) -> None:
+    from okml.config import load_settings
+    from okml.services.assessment_service import AssessmentService
+    from okml.services.fleet_service import NDJSON_SUFFIXES, FleetAssessmentService
+    from okml.storage.bundle import bundle_output
+    from okml.utils.tracing import trace_file
+
+    if sum(x is not None for x in (input_path, input_dir, dataset)) != 1:
+        raise typer.BadParameter("Pass exactly one of --input, --input-dir or --dataset.")
+    _check_bundle(bundle)
     settings = load_settings(artifacts_dir=artifacts_dir, log_format=log_format, seed=seed)
     run_id = new_run_id()
-    configure_logging(settings.log_format, run_id=run_id)
-    AssessmentService(settings=settings, run_id=run_id).run(input_path=input_path)
+    _configure_logging(settings, run_id)
+    fleet = FleetAssessmentService(settings=settings, run_id=run_id)
+    with (
+        bundle_output(bundle) as out,
+        trace_file(trace_path, "okml assess", run_id=run_id),
+    ):
+        if dataset is not None:
+            summary = fleet.run_dataset(dataset_path=dataset, workers=workers)
+        elif input_dir is not None:
+            summary = fleet.run(
+                input_dir=input_dir, pattern=pattern, workers=workers, incremental=not force
+            )
+        elif input_path is not None and input_path.suffix.lower() in NDJSON_SUFFIXES:
+            summary = fleet.run_ndjson(input_path=input_path, workers=workers)
+        else:
+            assert input_path is not None
+            AssessmentService(settings=settings, run_id=run_id).run(input_path=input_path)
+            summary = None
+
+    if out is not None:
+        typer.echo(f"Bundle: {out.path} ({out.count} artifacts)")
+    if summary is None:
+        return
+    index = str(summary.index_path)
+    if out is not None:
+        index = f"{out.path}:{summary.index_path.relative_to(settings.artifacts_dir).as_posix()}"
+    typer.echo(
+        f"Assessed {summary.succeeded}/{summary.total} environments "
+        f"({summary.failed} rejected, {summary.skipped} unchanged and skipped). "
+        f"Index: {index}"
+    )
+    if summary.dashboard_path is not None and out is None:
+        typer.echo(f"Dashboard: {summary.dashboard_path}")
+    if summary.failed:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def risks(
+    index_path: Annotated[
+        Path | None,
+        typer.Option(
+            "--index",
+            exists=True,
+            dir_okay=False,
+            help="Fleet index.ndjson (default: <artifacts>/fleet/index.ndjson).",
+        ),
+    ] = None,
+    top: Annotated[
+        int | None, typer.Option("--top", min=1, help="Only the K most urgent risks.")
+    ] = None,
+    by: Annotated[
+        str, typer.Option("--by", help="Rank --top by priority | impact | risk_reduction.")
+    ] = "priority",
+    tag: Annotated[
+        str | None, typer.Option("--tag", help="Only risks whose mitigation has this tag.")
+    ] = None,
+    output: Annotated[
+        Path | None, typer.Option("--output", dir_okay=False, help="CSV file (default: stdout).")
+    ] = None,
+    artifacts_dir: ArtifactsDirOpt = None,
+) -> None:
+    """Query the consolidated fleet risk register, streamed from a fleet index."""
+    import sys
+
+    from okml.config import load_settings
+    from okml.reporting.risk_register import (
+        RANK_BY,
+        iter_fleet_risks,
+        iter_index,
+        top_risks,
+        write_risk_rows,
+    )
+
+    if by not in RANK_BY:
+        raise typer.BadParameter(f"--by must be one of {', '.join(RANK_BY)}.")
+    if index_path is None:
+        index_path = (
+            load_settings(artifacts_dir=artifacts_dir).artifacts_dir / "fleet" / "index.ndjson"
+        )
+        if not index_path.is_file():
+            raise typer.BadParameter(f"No fleet index at {index_path}; run `okml assess` first.")
+    rows = iter_fleet_risks(iter_index(index_path))
+    if top is not None:
+        rows = iter(top_risks(rows, top, by=by, tag=tag))
+    elif tag is not None:
+        rows = (r for r in rows if tag in r.item.tags)
+    if output is None:
+        write_risk_rows(sys.stdout, rows)
+        return
+    with output.open("w", encoding="utf-8", newline="") as f:
+        n = write_risk_rows(f, rows)
+    typer.echo(f"Wrote {n} risks to {output}.")
+
+
+@dataset_app.command("build")
+def dataset_build(
+    output: Annotated[
+        Path, typer.Option("--output", file_okay=False, help="Dataset directory to write.")
+    ],
+    input_path: Annotated[
+        Path | None,
+        typer.Option("--input", exists=True, dir_okay=False, help="NDJSON fleet inventory."),
+    ] = None,
+    input_dir: Annotated[
+        Path | None,
+        typer.Option(
+            "--input-dir", exists=True, file_okay=False, help="Directory of env YAML/JSON files."
+        ),
+    ] = None,
+    pattern: Annotated[
+        str, typer.Option("--pattern", help="Glob applied under --input-dir (default: *).")
+    ] = "*",
+    log_format: LogFormatOpt = None,
+) -> None:
+    from okml.config import load_settings
+    from okml.services.dataset_service import DatasetService
+
+    if (input_path is None) == (input_dir is None):
+        raise typer.BadParameter("Pass exactly one of --input or --input-dir.")
+    settings = load_settings(log_format=log_format)
+    run_id = new_run_id()
+    _configure_logging(settings, run_id)
+    summary = DatasetService(settings=settings, run_id=run_id).build(
+        output=output, input_path=input_path, input_dir=input_dir, pattern=pattern
+    )
+    typer.echo(
+        f"Wrote {summary.rows} environments to {summary.path} ({summary.rejected} rejected)."
+    )
+
+
+@app.command()
+def synth(
+    output: Annotated[
+        Path,
+        typer.Option(
+            "--output",
+            help="NDJSON file, or directory for yaml/json files and shards.",
+        ),
+    ],
+    count: Annotated[int, typer.Option("--count", min=0, help="Environments to generate.")],
+    fmt: Annotated[
+        str, typer.Option("--format", help="yaml | json | ndjson (default: ndjson).")
+    ] = "ndjson",
+    shards: Annotated[
+        int, typer.Option("--shards", min=0, help="Split the fleet into N shard files/dirs.")
+    ] = 0,
+    seed: SeedOpt = None,
+    regions: Annotated[int, typer.Option("--regions", min=1, help="Number of regions.")] = 8,
+    region_skew: Annotated[
+        float,
+        typer.Option("--region-skew", min=0, help="Zipf exponent of region sizes (0: uniform)."),
+    ] = 1.0,
+    hot_regions: Annotated[
+        int,
+        typer.Option("--hot-regions", min=0, help="Regions whose environments are incident-heavy."),
+    ] = 0,
+    hot_incidents: Annotated[
+        int,
+        typer.Option("--hot-incidents", min=0, help="Incidents per environment in hot regions."),
+    ] = 10_000,
+    log_format: LogFormatOpt = None,
+) -> None:
+    """Generate a deterministic synthetic legacy fleet for load tests and benchmarks."""
+    from okml.config import load_settings
+    from okml.domain.synth import SynthConfig
+    from okml.services.synth_service import FORMATS, SynthService
+
+    if fmt not in FORMATS:
+        raise typer.BadParameter(f"--format must be one of {', '.join(FORMATS)}.")
+    if hot_regions > regions:
+        raise typer.BadParameter("--hot-regions cannot exceed --regions.")
+    settings = load_settings(log_format=log_format, seed=seed)
+    run_id = new_run_id()
+    _configure_logging(settings, run_id)
+    config = SynthConfig(
+        count=count,
+        seed=settings.seed,
+        regions=regions,
+        region_skew=region_skew,
+        hot_regions=hot_regions,
+        hot_incidents=hot_incidents,
+    )
+    summary = SynthService(settings=settings, run_id=run_id).run(
+        config=config,
+        output=output,
+        fmt=fmt,  # type: ignore[arg-type]
+        shards=shards,
+    )
+    typer.echo(
+        f"Wrote {summary.environments} environments to {summary.path} ({summary.files} files)."
+    )
+
+
+@app.command()
+def serve(
+    host: Annotated[str, typer.Option("--host", help="Bind address.")] = "127.0.0.1",
+    port: Annotated[int, typer.Option("--port", help="TCP port (0 picks a free one).")] = 8787,
+    socket_path: Annotated[
+        Path | None,
+        typer.Option("--socket", dir_okay=False, help="Serve on a Unix socket instead of TCP."),
+    ] = None,
+    workers: Annotated[
+        int | None, typer.Option("--workers", min=1, help="Worker processes (default: CPUs).")
+    ] = None,
+    queue_size: Annotated[
+        int, typer.Option("--queue-size", min=1, help="Pending requests before 503s.")
+    ] = 256,
+    batch_size: Annotated[
+        int, typer.Option("--batch-size", min=1, help="Max requests per worker batch.")
+    ] = 16,
+    batch_wait_ms: Annotated[
+        float, typer.Option("--batch-wait-ms", min=0, help="Max wait to fill a batch.")
+    ] = 2.0,
+    log_format: LogFormatOpt = None,
+) -> None:
+    """Serve POST /assess (LegacyEnvironment JSON -> AssessmentReport JSON) until Ctrl-C."""
+    from okml.config import load_settings
+    from okml.services.serve_service import AssessmentServer
+
+    settings = load_settings(log_format=log_format)
+    run_id = new_run_id()
+    _configure_logging(settings, run_id)
+    server = AssessmentServer(
+        settings=settings,
+        run_id=run_id,
+        workers=workers,
+        queue_size=queue_size,
+        batch_size=batch_size,
+        batch_wait_ms=batch_wait_ms,
+    )
+    address = server.start(host=host, port=port, socket_path=socket_path)
+    typer.echo(f"Serving on {address} (POST /assess, GET /healthz). Ctrl-C to stop.")
+    try:
+        server.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
 
 
 @app.command()
@@ -56,9 +418,12 @@ def design(
     seed: SeedOpt = None,
     log_format: LogFormatOpt = None,
 ) -> None:
+    from okml.config import load_settings
+    from okml.services.design_service import DesignService
+
     settings = load_settings(artifacts_dir=artifacts_dir, log_format=log_format, seed=seed)
     run_id = new_run_id()
-    configure_logging(settings.log_format, run_id=run_id)
+    _configure_logging(settings, run_id)
     DesignService(settings=settings, run_id=run_id).run()
 
 
@@ -68,21 +433,87 @@ def automate(
     seed: SeedOpt = None,
     log_format: LogFormatOpt = None,
 ) -> None:
+    from okml.config import load_settings
+    from okml.services.automation_service import AutomationService
+
     settings = load_settings(artifacts_dir=artifacts_dir, log_format=log_format, seed=seed)
     run_id = new_run_id()
-    configure_logging(settings.log_format, run_id=run_id)
+    _configure_logging(settings, run_id)
     AutomationService(settings=settings, run_id=run_id).run()
 
 
+@app.command()
+def plan(
+    input_path: Annotated[
+        Path,
+        typer.Option(
+            "--input",
+            exists=True,
+            help="Legacy env file, NDJSON fleet, or directory of env YAML/JSON files.",
+        ),
+    ],
+    pattern: Annotated[
+        str, typer.Option("--pattern", help="Glob applied under a directory --input.")
+    ] = "*",
+    concurrency: Annotated[
+        int, typer.Option("--concurrency", min=1, help="Terraform plans running at once.")
+    ] = 4,
+    timeout: Annotated[
+        float, typer.Option("--timeout", min=1, help="Seconds each plan attempt may take.")
+    ] = 600.0,
+    retries: Annotated[
+        int, typer.Option("--retries", min=0, help="Retries of transient terraform failures.")
+    ] = 2,
+    artifacts_dir: ArtifactsDirOpt = None,
+    log_format: LogFormatOpt = None,
+    trace_path: TraceFileOpt = None,
+) -> None:
+    """Terraform-plan every environment of a fleet, most urgent recommendations first."""
+    from okml.config import load_settings
+    from okml.services.plan_service import FleetPlanService
+    from okml.utils.tracing import trace_file
+
+    settings = load_settings(artifacts_dir=artifacts_dir, log_format=log_format)
+    run_id = new_run_id()
+    _configure_logging(settings, run_id)
+    with trace_file(trace_path, "okml plan", run_id=run_id):
+        summary = FleetPlanService(settings=settings, run_id=run_id).run(
+            input_path=input_path,
+            pattern=pattern,
+            concurrency=concurrency,
+            timeout_s=timeout,
+            retries=retries,
+        )
+    typer.echo(
+        f"Planned {summary.succeeded}/{summary.total} environments in {summary.wall_s:.1f}s "
+        f"({summary.failed} failed, {summary.retried} retried, {summary.rejected} rejected). "
+        f"Index: {summary.index_path}"
+    )
+    if summary.failed or summary.rejected:
+        raise typer.Exit(code=1)
+
+
 @app.command()
 def kpis(
     artifacts_dir: ArtifactsDirOpt = None,
     seed: SeedOpt = None,
+    simulations: SimulationsOpt = None,
+    chart_format: ChartFormatOpt = None,
     log_format: LogFormatOpt = None,
 ) -> None:
-    settings = load_settings(artifacts_dir=artifacts_dir, log_format=log_format, seed=seed)
+    from okml.config import load_settings
+    from okml.services.kpi_service import KPIService
+
+    _check_chart_format(chart_format)
+    settings = load_settings(
+        artifacts_dir=artifacts_dir,
+        log_format=log_format,
+        seed=seed,
+        simulations=simulations,
+        chart_format=chart_format,
+    )
     run_id = new_run_id()
-    configure_logging(settings.log_format, run_id=run_id)
+    _configure_logging(settings, run_id)
     KPIService(settings=settings, run_id=run_id).run()
 
 
@@ -92,9 +523,12 @@ def executive_summary(
     seed: SeedOpt = None,
     log_format: LogFormatOpt = None,
 ) -> None:
+    from okml.config import load_settings
+    from okml.services.executive_service import ExecutiveService
+
     settings = load_settings(artifacts_dir=artifacts_dir, log_format=log_format, seed=seed)
     run_id = new_run_id()
-    configure_logging(settings.log_format, run_id=run_id)
+    _configure_logging(settings, run_id)
     ExecutiveService(settings=settings, run_id=run_id).run()
 
 
@@ -102,25 +536,133 @@ def executive_summary(
 def demo(
     artifacts_dir: ArtifactsDirOpt = None,
     seed: SeedOpt = None,
+    simulations: SimulationsOpt = None,
+    chart_format: ChartFormatOpt = None,
     log_format: LogFormatOpt = None,
+    force: Annotated[
+        bool, typer.Option("--force", help="Ignore the build cache and rerun every stage.")
+    ] = False,
+    profile: Annotated[
+        bool,
+        typer.Option(
+            "--profile",
+            help="Record wall/CPU time and peak RSS per stage and sub-step in run_metadata.json.",
+        ),
+    ] = False,
+    pstats: Annotated[
+        bool,
+        typer.Option(
+            "--pstats", help="With --profile: also dump cProfile stats to <artifacts>/profile/."
+        ),
+    ] = False,
+    trace_path: TraceFileOpt = None,
+    bundle: BundleOpt = None,
 ) -> None:
-    settings = load_settings(artifacts_dir=artifacts_dir, log_format=log_format, seed=seed)
+    from contextlib import nullcontext
+
+    from okml.config import load_settings
+    from okml.reporting.artifact_writer import ArtifactWriter
+    from okml.services.pipeline import demo_pipeline
+    from okml.storage.build_cache import CACHE_FILE, BuildCache
+    from okml.storage.bundle import bundle_output
+    from okml.utils.profiling import Profiler, profiling
+    from okml.utils.tracing import trace_file
+
+    _check_chart_format(chart_format)
+    _check_bundle(bundle)
+    settings = load_settings(
+        artifacts_dir=artifacts_dir,
+        log_format=log_format,
+        seed=seed,
+        simulations=simulations,
+        chart_format=chart_format,
+    )
     run_id = new_run_id()
-    configure_logging(settings.log_format, run_id=run_id)
+    _configure_logging(settings, run_id)
     log = get_logger(__name__)
 
     input_path = Path("sample_data/legacy_env.yaml")
-    AssessmentService(settings=settings, run_id=run_id).run(input_path=input_path)
-    DesignService(settings=settings, run_id=run_id).run()
-    AutomationService(settings=settings, run_id=run_id).run()
-    KPIService(settings=settings, run_id=run_id).run()
-    ExecutiveService(settings=settings, run_id=run_id).run()
+    cache_path = settings.artifacts_dir / CACHE_FILE
+    # A bundle is written from scratch, so the build cache has no outputs to check.
+    cache = None
+    if bundle is None:
+        cache = BuildCache(cache_path) if force else BuildCache.load(cache_path)
+    profiler = None
+    if profile or pstats:
+        profiler = Profiler(
+            pstats_dir=settings.artifacts_dir / "profile" if pstats else None, settings=settings
+        )
+    pipeline = demo_pipeline(
+        settings=settings, run_id=run_id, input_path=input_path, cache=cache, profiler=profiler
+    )
+    with bundle_output(bundle) as out:
+        with (
+            profiling(profiler) if profiler is not None else nullcontext(),
+            trace_file(trace_path, "okml demo", run_id=run_id),
+        ):
+            result = pipeline.run()
 
-    meta_path = settings.artifacts_dir / "run_metadata.json"
-    meta = {"run_id": run_id, "artifacts_dir": str(settings.artifacts_dir)}
-    meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        meta: dict[str, object] = {
+            "run_id": run_id,
+            "artifacts_dir": str(settings.artifacts_dir),
+            "pipeline": result.as_dict(),
+        }
+        if out is not None:
+            meta["bundle"] = str(out.path)
+        if profiler is not None:
+            meta["profile"] = profiler.as_dict()
+        ArtifactWriter.from_settings(settings).write_json(
+            settings.artifacts_dir / "run_metadata.json", meta
+        )
 
     log.info(
-        "demo_complete", extra={"artifacts_dir": str(settings.artifacts_dir), "run_id": run_id}
+        "demo_complete",
+        extra={
+            "artifacts_dir": str(settings.artifacts_dir),
+            "run_id": run_id,
+            "wall_s": round(result.wall_s, 4),
+            "critical_path": result.critical_path,
+        },
+    )
+    for t in result.timings.values():
+        status = "cached" if t.cached else f"started +{t.start_s:.3f}s"
+        typer.echo(f"  {t.name:<12} {t.wall_s:8.3f}s  ({status})")
+    typer.echo(
+        f"Critical path: {' -> '.join(result.critical_path)} "
+        f"({result.critical_path_s:.3f}s of {result.wall_s:.3f}s wall)"
     )
-    typer.echo(f"Artifacts written to: {settings.artifacts_dir}")
+    if out is not None:
+        typer.echo(f"Artifacts written to: {out.path} ({out.count} artifacts)")
+    else:
+        typer.echo(f"Artifacts written to: {settings.artifacts_dir}")
+
+
+@bundle_app.command("ls")
+def bundle_ls(path: BundlePathArg) -> None:
+    """List the artifacts in a bundle with their sizes."""
+    from okml.storage.bundle import BundleReader
+
+    with BundleReader(path) as reader:
+        for entry in reader.entries():
+            typer.echo(f"{entry.size:>12}  {entry.name}")
+
+
+@bundle_app.command("cat")
+def bundle_cat(
+    path: BundlePathArg,
+    name: Annotated[str, typer.Argument(help="Artifact to print, e.g. kpis/kpis.json.")],
+) -> None:
+    """Write one artifact to stdout without unpacking the rest of the bundle."""
+    from okml.storage.bundle import BundleReader
+
+    with BundleReader(path) as reader:
+        try:
+            chunks = reader.iter_chunks(name)
+            first = next(chunks, b"")
+        except KeyError as e:
+            raise typer.BadParameter(e.args[0], param_hint="NAME") from None
+        stdout = typer.get_binary_stream("stdout")
+        stdout.write(first)
+        for chunk in chunks:
+            stdout.write(chunk)
+        stdout.flush()
@@ -11,12 +11,24 @@ class Settings(BaseSettings):
     artifacts_dir: Path = Path("artifacts")
     log_format: str = "pretty"  # "pretty" | "json"
     seed: int = 2026
+    simulations: int = 0  # Monte Carlo KPI scenarios; 0 keeps point estimates only
+    chart_format: str = "svg"  # "svg" (built-in) | "png" (matplotlib)
+    artifact_fsync: bool = False  # fsync artifacts (in batches) before they are renamed into place
+    artifact_write_workers: int = 0  # threads writing artifacts; 0 writes inline
+    terraform_cache_dir: Path | None = None  # workspaces + plugin cache (.okml-cache/terraform)
+    log_queue: bool = False  # format and write logs on a background thread
+    log_file: Path | None = None  # log to this size-rotated file instead of stdout
+    log_file_max_bytes: int = 10 << 20
+    log_file_backups: int = 3
+    log_sample: str = ""  # "event=N,...": keep one in N of these log events
 
 
 def load_settings(
     artifacts_dir: Path | None = None,
     log_format: str | None = None,
     seed: int | None = None,
+    simulations: int | None = None,
+    chart_format: str | None = None,
 ) -> Settings:
     settings = Settings()
     if artifacts_dir is not None:
@@ -25,4 +37,8 @@ def load_settings(
         settings.log_format = log_format
     if seed is not None:
         settings.seed = seed
+    if simulations is not None:
+        settings.simulations = simulations
+    if chart_format is not None:
+        settings.chart_format = chart_format
     return settings
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, fields
+from typing import Any, get_args
+
+import numpy as np
+import numpy.typing as npt
+
+from okml.domain.models import (
+    AssessmentScores,
+    LegacyCompute,
+    LegacyControlPlane,
+    LegacyEnvironment,
+    LegacyNetwork,
+    LegacyTenancy,
+)
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+BoolArray = npt.NDArray[np.bool_]
+CodeArray = npt.NDArray[np.uint8]
+
+
+def _literal_values(model: Any, field: str) -> tuple[str, ...]:
+    return tuple(get_args(model.model_fields[field].annotation))
+
+
+# Categorical columns are stored as indexes into these tuples (derived from the model Literals).
+HYPERVISORS = _literal_values(LegacyCompute, "hypervisor")
+SEGMENTATIONS = _literal_values(LegacyNetwork, "segmentation")
+VISIBILITIES = _literal_values(LegacyNetwork, "east_west_visibility")
+UPGRADE_STRATEGIES = _literal_values(LegacyControlPlane, "upgrade_strategy")
+RBAC_MATURITIES = _literal_values(LegacyTenancy, "rbac_maturity")
+
+
+def _codes(values: tuple[str, ...], wanted: Iterable[str]) -> list[int]:
+    return [values.index(v) for v in wanted]
+
+
+@dataclass(frozen=True)
+class ScoringColumns:
+    """Columnar view of the per-environment inputs that ``score_environment`` reads.
+
+    Child collections (incidents, provisioning steps) are pre-aggregated per
+    environment. ``step_error_rate_sum`` must come from the builtin ``sum()``, as the
+    scalar scorer's does (compensated since Python 3.12), for results to match bit-for-bit.
+    """
+
+    sev1_incidents: IntArray
+    sev2_incidents: IntArray
+    incident_count: IntArray
+    restore_minutes_total: IntArray
+    manual_touchpoints_total: IntArray
+    step_error_rate_sum: FloatArray
+    step_count: IntArray
+    infra_changes_per_week: IntArray
+    change_failure_rate_percent: FloatArray
+    backup_success_rate_percent: FloatArray
+    config_drift_rate_percent: FloatArray
+    ha_enabled: BoolArray
+    db_clustered: BoolArray
+    message_bus_clustered: BoolArray
+    replication_enabled: BoolArray
+    self_service_portal: BoolArray
+    hypervisor: CodeArray
+    segmentation: CodeArray
+    east_west_visibility: CodeArray
+    upgrade_strategy: CodeArray
+    rbac_maturity: CodeArray
+
+    def __post_init__(self) -> None:
+        lengths = {len(getattr(self, f.name)) for f in fields(self)}
+        if len(lengths) > 1:
+            raise ValueError(f"ScoringColumns have mismatched lengths: {sorted(lengths)}")
+
+    def __len__(self) -> int:
+        return len(self.sev1_incidents)
+
+    @classmethod
+    def from_environments(cls, envs: Iterable[LegacyEnvironment]) -> ScoringColumns:
+        rows: dict[str, list[Any]] = {f.name: [] for f in fields(cls)}
+        for env in envs:
+            incidents = env.incidents_last_90d
+            steps = env.provisioning_workflow
+            rows["sev1_incidents"].append(sum(1 for i in incidents if i.severity == "sev1"))
+            rows["sev2_incidents"].append(sum(1 for i in incidents if i.severity == "sev2"))
+            rows["incident_count"].append(len(incidents))
+            rows["restore_minutes_total"].append(sum(i.minutes_to_restore for i in incidents))
+            rows["manual_touchpoints_total"].append(sum(s.manual_touchpoints for s in steps))
+            rows["step_error_rate_sum"].append(sum(s.error_rate_percent for s in steps))
+            rows["step_count"].append(len(steps))
+            rows["infra_changes_per_week"].append(env.infra_changes_per_week)
+            rows["change_failure_rate_percent"].append(env.network.change_failure_rate_percent)
+            rows["backup_success_rate_percent"].append(env.storage.backup_success_rate_percent)
+            rows["config_drift_rate_percent"].append(env.config_drift_rate_percent)
+            rows["ha_enabled"].append(env.control_plane.ha_enabled)
+            rows["db_clustered"].append(env.control_plane.db_clustered)
+            rows["message_bus_clustered"].append(env.control_plane.message_bus_clustered)
+            rows["replication_enabled"].append(env.storage.replication_enabled)
+            rows["self_service_portal"].append(env.tenancy.self_service_portal)
+            rows["hypervisor"].append(HYPERVISORS.index(env.compute.hypervisor))
+            rows["segmentation"].append(SEGMENTATIONS.index(env.network.segmentation))
+            rows["east_west_visibility"].append(
+                VISIBILITIES.index(env.network.east_west_visibility)
+            )
+            rows["upgrade_strategy"].append(
+                UPGRADE_STRATEGIES.index(env.control_plane.upgrade_strategy)
+            )
+            rows["rbac_maturity"].append(RBAC_MATURITIES.index(env.tenancy.rbac_maturity))
+        return cls(**{name: np.asarray(vals, dtype=_DTYPES[name]) for name, vals in rows.items()})
+
+
+_DTYPES: dict[str, type[np.generic]] = {
+    **dict.fromkeys(
+        (
+            "sev1_incidents",
+            "sev2_incidents",
+            "incident_count",
+            "restore_minutes_total",
+            "manual_touchpoints_total",
+            "step_count",
+            "infra_changes_per_week",
+        ),
+        np.int64,
+    ),
+    **dict.fromkeys(
+        (
+            "step_error_rate_sum",
+            "change_failure_rate_percent",
+            "backup_success_rate_percent",
+            "config_drift_rate_percent",
+        ),
+        np.float64,
+    ),
+    **dict.fromkeys(
+        (
+            "ha_enabled",
+            "db_clustered",
+            "message_bus_clustered",
+            "replication_enabled",
+            "self_service_portal",
+        ),
+        np.bool_,
+    ),
+    **dict.fromkeys(
+        (
+            "hypervisor",
+            "segmentation",
+            "east_west_visibility",
+            "upgrade_strategy",
+            "rbac_maturity",
+        ),
+        np.uint8,
+    ),
+}
+
+
+@dataclass(frozen=True)
+class BatchScores:
+    reliability_risk: FloatArray
+    operational_maturity: FloatArray
+    automation_maturity: FloatArray
+    standardization: FloatArray
+
+    def __len__(self) -> int:
+        return len(self.reliability_risk)
+
+    def at(self, i: int) -> AssessmentScores:
+        return AssessmentScores(
+            reliability_risk=float(self.reliability_risk[i]),
+            operational_maturity=float(self.operational_maturity[i]),
+            automation_maturity=float(self.automation_maturity[i]),
+            standardization=float(self.standardization[i]),
+        )
+
+
+def score_batch(cols: ScoringColumns) -> BatchScores:
+    """Vectorized ``score_environment`` over N environments.
+
+    Every term is evaluated in the same order and precision as the scalar
+    function, so results are identical, not merely close.
+    """
+    sev1 = cols.sev1_incidents
+    sev2 = cols.sev2_incidents
+    mttr_avg = np.where(
+        cols.incident_count > 0,
+        cols.restore_minutes_total / np.maximum(cols.incident_count, 1),
+        30.0,
+    )
+    prov_manual = cols.manual_touchpoints_total
+    prov_error = cols.step_error_rate_sum / np.maximum(1, cols.step_count)
+
+    in_place_or_unknown = np.isin(
+        cols.upgrade_strategy, _codes(UPGRADE_STRATEGIES, ("unknown", "in_place"))
+    )
+    blue_green = cols.upgrade_strategy == UPGRADE_STRATEGIES.index("blue_green")
+
+    reliability_risk = np.full(len(cols), 15.0)
+    reliability_risk += sev1 * 12 + sev2 * 6
+    reliability_risk += (mttr_avg / 60.0) * 10
+    reliability_risk += np.where(cols.ha_enabled, 0, 8)
+    reliability_risk += np.where(cols.db_clustered, 0, 5)
+    reliability_risk += np.where(cols.message_bus_clustered, 0, 4)
+    reliability_risk += (cols.change_failure_rate_percent / 100.0) * 12
+    reliability_risk += (100.0 - cols.backup_success_rate_percent) * 0.08
+
+    operational_maturity = np.full(len(cols), 55.0)
+    operational_maturity -= sev1 * 5
+    operational_maturity -= (cols.config_drift_rate_percent / 100.0) * 18
+    operational_maturity -= np.where(in_place_or_unknown, 8, 0)
+    operational_maturity += np.where(cols.ha_enabled, 7, -5)
+    operational_maturity += np.where(cols.replication_enabled, 5, -6)
+    operational_maturity += np.where(
+        np.isin(cols.east_west_visibility, _codes(VISIBILITIES, ("medium", "high"))), 6, -5
+    )
+
+    automation_maturity = np.full(len(cols), 40.0)
+    automation_maturity -= np.minimum(18.0, prov_manual * 1.5)
+    automation_maturity -= np.minimum(12.0, prov_error * 0.6)
+    automation_maturity += np.minimum(12.0, cols.infra_changes_per_week * 1.2)
+    automation_maturity += np.where(cols.self_service_portal, 10, -8)
+
+    standardization = np.full(len(cols), 45.0)
+    standardization += np.where(cols.hypervisor != HYPERVISORS.index("mixed"), 8, -6)
+    standardization += np.where(cols.segmentation != SEGMENTATIONS.index("mixed"), 6, -4)
+    standardization += np.where(
+        np.isin(cols.rbac_maturity, _codes(RBAC_MATURITIES, ("role_based", "policy_as_code"))),
+        8,
+        -6,
+    )
+    standardization += np.where(blue_green, 6, -4)
+
+    return BatchScores(
+        reliability_risk=round1(_clamp(reliability_risk)),
+        operational_maturity=round1(_clamp(operational_maturity)),
+        automation_maturity=round1(_clamp(automation_maturity)),
+        standardization=round1(_clamp(standardization)),
+    )
+
+
+def _clamp(x: FloatArray, lo: float = 0, hi: float = 100) -> FloatArray:
+    return np.maximum(lo, np.minimum(hi, x))
+
+
+def round1(x: FloatArray) -> FloatArray:
+    """Round to one decimal exactly like the builtin ``round(v, 1)``.
+
+    ``np.round`` scales by 10 and rounds half-to-even, which disagrees with the
+    builtin whenever ``v * 10`` lands on (or within an ulp of) a ``.5`` tie, e.g.
+    ``round(0.15, 1) == 0.1`` but ``np.round(0.15, 1) == 0.2``. Those few
+    elements are re-rounded with the builtin; everything else is vectorized.
+    """
+    scaled = x * 10.0
+    out: FloatArray = np.rint(scaled) / 10.0
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        out[i] = round(float(x[i]), 1)
+    return out
@@ -1,23 +1,38 @@
 from __future__ import annotations
 
 import random
+from typing import TYPE_CHECKING, Any
 
 from okml.domain.models import AssessmentScores, RoadmapItem
 
+if TYPE_CHECKING:
+    import numpy.typing as npt
 
-def generate_kpis(
-    *, scores: AssessmentScores, recommendations: list[RoadmapItem], seed: int
-) -> dict[str, dict[str, float]]:
-    rng = random.Random(seed)
+PERCENTILES = (5, 50, 95)
 
+
+def _baselines(scores: AssessmentScores) -> tuple[float, float]:
     baseline_uptime = 99.2 - (scores.reliability_risk / 100.0) * 0.8
     baseline_uptime = max(97.5, min(99.4, baseline_uptime))
 
     baseline_prov_p50 = 120.0 + (100.0 - scores.automation_maturity) * 1.2
     baseline_prov_p50 = max(60.0, min(240.0, baseline_prov_p50))
+    return baseline_uptime, baseline_prov_p50
+
 
+def _drivers(recommendations: list[RoadmapItem]) -> tuple[float, float]:
     risk_reduction = sum(1.0 for r in recommendations if r.risk_reduction == "H")
     automation_focus = sum(1.0 for r in recommendations if "automation" in r.tags)
+    return risk_reduction, automation_focus
+
+
+def generate_kpis(
+    *, scores: AssessmentScores, recommendations: list[RoadmapItem], seed: int
+) -> dict[str, dict[str, float]]:
+    rng = random.Random(seed)
+
+    baseline_uptime, baseline_prov_p50 = _baselines(scores)
+    risk_reduction, automation_focus = _drivers(recommendations)
 
     uptime_boost = 0.55 + 0.12 * risk_reduction + rng.uniform(-0.05, 0.05)
     # Portfolio outcome constraint: ensure the simulated target-state reaches 99.9% monthly uptime.
@@ -39,3 +54,45 @@ def generate_kpis(
             "provisioning_time_minutes_p50": round(after_prov_p50, 1),
         },
     }
+
+
+def simulate_kpis(
+    *, scores: AssessmentScores, recommendations: list[RoadmapItem], seed: int, runs: int
+) -> dict[str, Any]:
+    """Monte Carlo version of ``generate_kpis``: ``runs`` seeded scenarios in one batch.
+
+    Each scenario redraws the uptime boost and provisioning improvement noise of
+    the point model; the result holds p5/p50/p95 bands of the target-state KPIs.
+    """
+    import numpy as np  # deferred: point-estimate KPI runs never need it
+
+    if runs < 1:
+        raise ValueError(f"runs must be >= 1, got {runs}")
+    rng = np.random.default_rng(seed)
+
+    baseline_uptime, baseline_prov_p50 = _baselines(scores)
+    risk_reduction, automation_focus = _drivers(recommendations)
+
+    uptime_boost = 0.55 + 0.12 * risk_reduction + rng.uniform(-0.05, 0.05, runs)
+    after_uptime = np.clip(baseline_uptime + uptime_boost, 99.9, 99.95)
+
+    achieved = 0.40 - 0.03 + 0.02 * automation_focus + rng.uniform(-0.02, 0.02, runs)
+    achieved = np.clip(achieved, 0.32, 0.48)
+    after_prov_p50 = baseline_prov_p50 * (1.0 - achieved)
+
+    return {
+        "runs": runs,
+        "seed": seed,
+        "after": {
+            "uptime_monthly_percent": _bands(after_uptime, 3),
+            "provisioning_time_minutes_p50": _bands(after_prov_p50, 1),
+        },
+        "provisioning_improvement_percent": _bands(achieved * 100.0, 1),
+    }
+
+
+def _bands(samples: npt.NDArray[Any], ndigits: int) -> dict[str, float]:
+    import numpy as np
+
+    values = np.percentile(samples, PERCENTILES)
+    return {f"p{p}": round(float(v), ndigits) for p, v in zip(PERCENTILES, values, strict=True)}
@@ -3,35 +3,16 @@ from __future__ import annotations
 from okml.domain.models import AssessmentScores, LegacyEnvironment, RoadmapItem
 
 
-def recommend(env: LegacyEnvironment, scores: AssessmentScores) -> list[RoadmapItem]:
-    items: list[RoadmapItem] = []
+def _item(**fields: object) -> RoadmapItem:
+    return RoadmapItem.model_validate(fields)
 
-    def add(
-        *,
-        id: str,
-        title: str,
-        rationale: str,
-        effort: str,
-        impact: str,
-        risk_reduction: str,
-        priority: int,
-        tags: list[str],
-    ) -> None:
-        items.append(
-            RoadmapItem(
-                id=id,
-                title=title,
-                rationale=rationale,
-                effort=effort,  # type: ignore[arg-type]
-                impact=impact,  # type: ignore[arg-type]
-                risk_reduction=risk_reduction,  # type: ignore[arg-type]
-                priority=priority,
-                tags=tags,
-            )
-        )
 
-    if scores.reliability_risk >= 60 or not env.control_plane.ha_enabled:
-        add(
+# Every recommendation the rules can emit, by id. Fleet indexes record only the ids, so
+# fleet-wide reports (e.g. the consolidated risk register) look the details up here.
+CATALOG: dict[str, RoadmapItem] = {
+    item.id: item
+    for item in (
+        _item(
             id="R-001",
             title="Harden OpenStack control plane (HA, clustered DB and message bus)",
             rationale=(
@@ -43,10 +24,8 @@ def recommend(env: LegacyEnvironment, scores: AssessmentScores) -> list[RoadmapI
             risk_reduction="H",
             priority=1,
             tags=["openstack", "reliability", "control-plane"],
-        )
-
-    if env.config_drift_rate_percent >= 10 or scores.automation_maturity <= 45:
-        add(
+        ),
+        _item(
             id="A-010",
             title=(
                 "Shift to automation-first provisioning (Terraform patterns + Ansible enforcement)"
@@ -60,38 +39,36 @@ def recommend(env: LegacyEnvironment, scores: AssessmentScores) -> list[RoadmapI
             risk_reduction="H",
             priority=2,
             tags=["terraform", "ansible", "devops", "automation"],
-        )
-
-    add(
-        id="K-020",
-        title="Standardize Kubernetes baseline (namespaces, RBAC, policies, and release cadence)",
-        rationale=(
-            "Reduce operational variance and improve day-2 reliability with consistent "
-            "cluster standards and upgrade practices."
         ),
-        effort="M",
-        impact="H",
-        risk_reduction="M",
-        priority=3,
-        tags=["kubernetes", "standardization"],
-    )
-
-    add(
-        id="O-030",
-        title="Operationalize SLOs, runbooks, and change management gates",
-        rationale=(
-            "Sustain reliability gains by turning standards into daily practice "
-            "(incident response, upgrades, backups, and capacity reviews)."
+        _item(
+            id="K-020",
+            title=(
+                "Standardize Kubernetes baseline (namespaces, RBAC, policies, and release cadence)"
+            ),
+            rationale=(
+                "Reduce operational variance and improve day-2 reliability with consistent "
+                "cluster standards and upgrade practices."
+            ),
+            effort="M",
+            impact="H",
+            risk_reduction="M",
+            priority=3,
+            tags=["kubernetes", "standardization"],
         ),
-        effort="S",
-        impact="H",
-        risk_reduction="H",
-        priority=4,
-        tags=["operations", "sre", "governance"],
-    )
-
-    if env.network.east_west_visibility == "low":
-        add(
+        _item(
+            id="O-030",
+            title="Operationalize SLOs, runbooks, and change management gates",
+            rationale=(
+                "Sustain reliability gains by turning standards into daily practice "
+                "(incident response, upgrades, backups, and capacity reviews)."
+            ),
+            effort="S",
+            impact="H",
+            risk_reduction="H",
+            priority=4,
+            tags=["operations", "sre", "governance"],
+        ),
+        _item(
             id="N-040",
             title=(
                 "Improve east-west visibility and change safety "
@@ -106,6 +83,21 @@ def recommend(env: LegacyEnvironment, scores: AssessmentScores) -> list[RoadmapI
             risk_reduction="M",
             priority=5,
             tags=["network", "observability"],
-        )
+        ),
+    )
+}
+
+
+def recommend(env: LegacyEnvironment, scores: AssessmentScores) -> list[RoadmapItem]:
+    ids: list[str] = []
+    if scores.reliability_risk >= 60 or not env.control_plane.ha_enabled:
+        ids.append("R-001")
+    if env.config_drift_rate_percent >= 10 or scores.automation_maturity <= 45:
+        ids.append("A-010")
+    ids += ["K-020", "O-030"]
+    if env.network.east_west_visibility == "low":
+        ids.append("N-040")
 
+    # Copies, so a report can edit its items without touching the catalog.
+    items = [CATALOG[i].model_copy(update={"tags": list(CATALOG[i].tags)}) for i in ids]
     return sorted(items, key=lambda x: x.priority)
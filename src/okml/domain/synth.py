@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import math
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+# Every record is a plain JSON-ready dict that validates as a LegacyEnvironment. Each one is
+# drawn from its own RNG seeded by (seed, index), so record i is the same whether the fleet
+# is written to one file or split across shards, and nothing is held between records.
+
+RELEASES = ("Queens", "Rocky", "Stein", "Train", "Ussuri", "Victoria", "Wallaby", "Xena")
+INCIDENT_CAUSES = (
+    "controller failover instability during maintenance",
+    "DB saturation and manual recovery steps",
+    "network change introduced cross-tenant latency",
+    "message bus partition after node reboot",
+    "storage backend latency spike",
+    "expired certificate on API endpoint",
+    "hypervisor kernel panic on compute node",
+    "config drift between controllers",
+)
+PROVISIONING_STEPS = (
+    "Request intake + manual approvals",
+    "Capacity check",
+    "Network + security group setup",
+    "Instance build + image selection",
+    "Storage volume attach",
+    "DNS + load balancer registration",
+    "Post-provision configuration",
+    "Monitoring + backup enrolment",
+)
+SEVERITIES = ("sev1", "sev2", "sev3")
+SEVERITY_WEIGHTS = (0.1, 0.35, 0.55)
+MAX_RESTORE_MINUTES = 60 * 24 * 14
+
+
+@dataclass(frozen=True)
+class SynthConfig:
+    """Shape of a synthetic fleet.
+
+    ``region_skew`` is the Zipf exponent of region sizes (0 spreads environments evenly).
+    The first ``hot_regions`` regions are incident hot spots: each of their environments
+    carries ``hot_incidents`` incidents instead of the usual handful.
+    """
+
+    count: int
+    seed: int = 2026
+    regions: int = 8
+    region_skew: float = 1.0
+    hot_regions: int = 0
+    hot_incidents: int = 10_000
+    as_of: date = date(2026, 1, 31)
+
+    def __post_init__(self) -> None:
+        if self.count < 0 or self.regions < 1:
+            raise ValueError("SynthConfig needs count >= 0 and regions >= 1.")
+        if not 0 <= self.hot_regions <= self.regions:
+            raise ValueError("hot_regions must be between 0 and regions.")
+
+
+def region_names(regions: int) -> list[str]:
+    return [f"region-{r:02d}" for r in range(regions)]
+
+
+def synth_environments(config: SynthConfig) -> Iterator[dict[str, Any]]:
+    """Yield ``config.count`` environment records lazily."""
+    return synth_range(config, 0, config.count)
+
+
+def synth_range(config: SynthConfig, start: int, stop: int) -> Iterator[dict[str, Any]]:
+    """Yield records ``start`` to ``stop - 1``; equal to the same slice of the full fleet."""
+    names = region_names(config.regions)
+    cumulative = _cumulative_weights(config.regions, config.region_skew)
+    for i in range(start, min(stop, config.count)):
+        rng = random.Random(f"{config.seed}:{i}")
+        r = rng.choices(range(config.regions), cum_weights=cumulative)[0]
+        yield _environment(rng, i, names[r], hot=r < config.hot_regions, config=config)
+
+
+def _cumulative_weights(regions: int, skew: float) -> list[float]:
+    total, out = 0.0, []
+    for rank in range(1, regions + 1):
+        total += 1 / rank**skew
+        out.append(total)
+    return out
+
+
+def _lognormal_int(rng: random.Random, median: float, sigma: float, lo: int, hi: int) -> int:
+    return max(lo, min(hi, round(rng.lognormvariate(math.log(median), sigma))))
+
+
+def _environment(
+    rng: random.Random, i: int, region: str, *, hot: bool, config: SynthConfig
+) -> dict[str, Any]:
+    # One latent "maturity" per environment drives the correlated knobs, so mature
+    # platforms have fewer incidents, less drift and fewer manual touchpoints together.
+    maturity = rng.betavariate(2, 3)
+    n_incidents = (
+        config.hot_incidents
+        if hot
+        else min(int(rng.expovariate(1 / (1 + 6 * (1 - maturity)))), 200)
+    )
+    n_steps = rng.randint(2, 7)
+    return {
+        "name": f"synth-{region}-{i:07d}",
+        "region": region,
+        "compute": {
+            "hypervisor": rng.choices(("kvm", "vmware", "mixed"), weights=(5, 2, 3))[0],
+            "compute_nodes": _lognormal_int(rng, 40, 0.9, 1, 5000),
+            "overcommit_ratio": round(rng.uniform(1.2, 8.0), 1),
+            "patch_cadence_days": _lognormal_int(rng, 45 + 90 * (1 - maturity), 0.4, 1, 365),
+        },
+        "storage": {
+            "primary_backend": rng.choices(
+                ("ceph", "nfs", "vendor_san", "mixed"), weights=(4, 2, 2, 2)
+            )[0],
+            "replication_enabled": rng.random() < 0.3 + 0.6 * maturity,
+            "backup_success_rate_percent": round(min(100.0, 85 + 15 * rng.betavariate(5, 1)), 1),
+        },
+        "network": {
+            "segmentation": rng.choices(("vlan", "vxlan", "mixed"), weights=(3, 3, 4))[0],
+            "east_west_visibility": rng.choices(
+                ("low", "medium", "high"), weights=(1 - maturity, 0.5, maturity)
+            )[0],
+            "change_failure_rate_percent": round(40 * rng.betavariate(2, 2 + 6 * maturity), 1),
+        },
+        "control_plane": {
+            "openstack_release": rng.choice(RELEASES),
+            "ha_enabled": rng.random() < maturity,
+            "db_clustered": rng.random() < maturity,
+            "message_bus_clustered": rng.random() < 0.2 + 0.7 * maturity,
+            "upgrade_strategy": rng.choices(
+                ("in_place", "blue_green", "unknown"), weights=(1 - maturity, maturity, 0.2)
+            )[0],
+        },
+        "tenancy": {
+            "tenants": _lognormal_int(rng, 25, 1.2, 1, 20_000),
+            "self_service_portal": rng.random() < maturity,
+            "rbac_maturity": rng.choices(
+                ("ad_hoc", "role_based", "policy_as_code"),
+                weights=(1 - maturity, 0.6, maturity**2),
+            )[0],
+        },
+        "deployments_per_week": _lognormal_int(rng, 8, 0.8, 0, 500),
+        "infra_changes_per_week": _lognormal_int(rng, 15, 0.7, 0, 500),
+        "config_drift_rate_percent": round(60 * rng.betavariate(2, 2 + 8 * maturity), 1),
+        "incidents_last_90d": [_incident(rng, config.as_of) for _ in range(n_incidents)],
+        "provisioning_workflow": [
+            _provisioning_step(rng, name, maturity)
+            for name in sorted(
+                rng.sample(PROVISIONING_STEPS, n_steps), key=PROVISIONING_STEPS.index
+            )
+        ],
+    }
+
+
+def _incident(rng: random.Random, as_of: date) -> dict[str, Any]:
+    severity = rng.choices(SEVERITIES, weights=SEVERITY_WEIGHTS)[0]
+    median = {"sev1": 240, "sev2": 120, "sev3": 45}[severity]
+    return {
+        "occurred_on": (as_of - timedelta(days=rng.randrange(90))).isoformat(),
+        "severity": severity,
+        "minutes_to_restore": _lognormal_int(rng, median, 0.8, 1, MAX_RESTORE_MINUTES),
+        "primary_cause": rng.choice(INCIDENT_CAUSES),
+    }
+
+
+def _provisioning_step(rng: random.Random, name: str, maturity: float) -> dict[str, Any]:
+    return {
+        "name": name,
+        "minutes_p50": float(_lognormal_int(rng, 25, 0.6, 1, 24 * 60)),
+        "manual_touchpoints": min(8, int(rng.expovariate(1 / (0.3 + 3 * (1 - maturity))))),
+        "error_rate_percent": round(min(100.0, rng.expovariate(1 / (1 + 6 * (1 - maturity)))), 1),
+    }
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import io
+import itertools
+import json
+import os
+import threading
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from types import TracebackType
+from typing import TextIO
+
+from okml.config import Settings
+from okml.storage.bundle import ArtifactSink, active_bundle
+from okml.utils.tracing import span
+
+_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_CLOEXEC", 0)
+_DIR_FLAGS = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0)
+_tmp_seq = itertools.count()
+
+
+class ArtifactWriter:
+    """Writes artifact files atomically and with as few syscalls as it can.
+
+    Every file is written to a temp file next to its target and renamed into place, so
+    readers and crashes only ever see the old file or the new one. Directories are created
+    once per writer. With ``fsync=True`` files are staged and committed ``fsync_batch`` at a
+    time: fsync each file, rename the batch, then fsync each touched directory once. With
+    ``workers > 0`` the writes run on a thread pool.
+
+    Staged and queued files are only guaranteed to be in place after ``flush()``, which the
+    context manager calls on exit; it raises the first write error.
+
+    With a ``sink`` (an open bundle) nothing touches the filesystem: each file is added to
+    the sink under its path relative to ``root``.
+    """
+
+    def __init__(
+        self,
+        *,
+        fsync: bool = False,
+        fsync_batch: int = 64,
+        workers: int = 0,
+        sink: ArtifactSink | None = None,
+        root: Path | None = None,
+    ) -> None:
+        self._sink = sink
+        self._root = root
+        self._fsync = fsync
+        self._fsync_batch = max(1, fsync_batch)
+        self._dirs: set[Path] = set()
+        self._lock = threading.Lock()
+        self._staged: list[tuple[int, Path, Path]] = []  # (fd, temp path, target path)
+        self._pool = (
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="okml-writer")
+            if workers > 0
+            else None
+        )
+        self._max_queued = 8 * workers
+        self._queued: deque[Future[None]] = deque()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> ArtifactWriter:
+        """Writes under ``settings.artifacts_dir``, or into the bundle of ``bundle_output``."""
+        bundle = active_bundle()
+        if bundle is not None:
+            return cls(sink=bundle, root=settings.artifacts_dir)
+        return cls(fsync=settings.artifact_fsync, workers=settings.artifact_write_workers)
+
+    def __enter__(self) -> ArtifactWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def ensure_dir(self, path: Path) -> Path:
+        if self._sink is None and path not in self._dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._dirs.add(path)
+        return path
+
+    def write_text(self, path: Path, text: str) -> None:
+        self.write_bytes(path, text.encode("utf-8"))
+
+    def write_json(self, path: Path, payload: object) -> None:
+        self.write_text(path, json.dumps(payload, indent=2, ensure_ascii=False))
+
+    def write_bytes(self, path: Path, data: bytes) -> None:
+        with span("write", path=str(path), bytes=len(data)):
+            if self._sink is not None:
+                self._sink.add(self._member_name(path), data)
+                return
+            self.ensure_dir(path.parent)
+            if self._pool is None:
+                self._write(path, data)
+                return
+            if len(self._queued) >= self._max_queued:
+                self._queued.popleft().result()
+            self._queued.append(self._pool.submit(self._write, path, data))
+
+    @contextmanager
+    def open_text(self, path: Path) -> Iterator[TextIO]:
+        """Stream a text file that is too big, or too long-lived, to build in memory.
+
+        Lines go to a temp file next to ``path`` that is committed like any other write
+        (renamed into place, with the batched fsync) when the block exits cleanly; if it
+        raises, the temp file is removed and the previous ``path`` is left as it was. With a
+        sink the text is buffered and added whole on exit.
+        """
+        if self._sink is not None:
+            buf = io.StringIO()
+            yield buf
+            self._sink.add(self._member_name(path), buf.getvalue().encode("utf-8"))
+            return
+        self.ensure_dir(path.parent)
+        tmp = _tmp_path(path)
+        f = tmp.open("x", encoding="utf-8", newline="")
+        try:
+            yield f
+            f.flush()
+        except BaseException:
+            f.close()
+            tmp.unlink(missing_ok=True)
+            raise
+        fd = os.dup(f.fileno())
+        f.close()
+        self._commit_or_stage(fd, tmp, path)
+
+    def _member_name(self, path: Path) -> str:
+        """``path`` as a bundle member name: relative to ``root``, with forward slashes."""
+        return (path.relative_to(self._root) if self._root is not None else path).as_posix()
+
+    def flush(self) -> None:
+        """Wait for queued writes and commit staged files; raises the first error seen."""
+        error: BaseException | None = None
+        while self._queued:
+            exc = self._queued.popleft().exception()
+            error = error or exc
+        with self._lock:
+            batch, self._staged = self._staged, []
+        try:
+            _commit(batch)
+        except OSError as e:
+            error = error or e
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+
+    def _write(self, path: Path, data: bytes) -> None:
+        tmp = _tmp_path(path)
+        try:
+            fd = os.open(tmp, _OPEN_FLAGS, 0o666)
+        except FileNotFoundError:
+            # The directory went away after we cached it (e.g. a cleaned artifacts dir).
+            self._dirs.discard(path.parent)
+            self.ensure_dir(path.parent)
+            fd = os.open(tmp, _OPEN_FLAGS, 0o666)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+        except BaseException:
+            os.close(fd)
+            tmp.unlink(missing_ok=True)
+            raise
+        self._commit_or_stage(fd, tmp, path)
+
+    def _commit_or_stage(self, fd: int, tmp: Path, path: Path) -> None:
+        if not self._fsync:
+            os.close(fd)
+            os.replace(tmp, path)
+            return
+        with self._lock:
+            self._staged.append((fd, tmp, path))
+            if len(self._staged) < self._fsync_batch:
+                return
+            batch, self._staged = self._staged, []
+        _commit(batch)
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}-{next(_tmp_seq)}.tmp")
+
+
+def _commit(batch: list[tuple[int, Path, Path]]) -> None:
+    """fsync then rename a batch of staged files, then fsync their directories once each."""
+    if not batch:
+        return
+    try:
+        for fd, _, _ in batch:
+            os.fsync(fd)
+    except BaseException:
+        for _, tmp, _ in batch:
+            tmp.unlink(missing_ok=True)
+        raise
+    finally:
+        for fd, _, _ in batch:
+            os.close(fd)
+    dirs = set()
+    for _, tmp, path in batch:
+        os.replace(tmp, path)
+        dirs.add(path.parent)
+    for d in dirs:
+        fd = os.open(d, _DIR_FLAGS)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
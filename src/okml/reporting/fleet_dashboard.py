@@ -0,0 +1,388 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from contextlib import ExitStack
+from html import escape
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from okml.reporting.artifact_writer import ArtifactWriter
+from okml.utils.tracing import span
+
+# One self-contained page for a whole fleet: a single compact JSON payload plus a small
+# script that sorts, filters, virtualizes the table and draws the charts in the browser.
+# Rows are streamed into the page as they are assessed, so the writer holds nothing but
+# the region names; bytes grow linearly with the fleet and the DOM only ever holds the
+# rows on screen.
+
+SCORE_KEYS = ("reliability_risk", "operational_maturity", "automation_maturity", "standardization")
+COLUMNS = (
+    "env",
+    "region",
+    *SCORE_KEYS,
+    "findings",
+    "uptime_before",
+    "uptime_after",
+    "prov_before",
+    "prov_after",
+)
+
+
+class FleetDashboardWriter:
+    """Streams ``index.ndjson``-shaped entries into a self-contained ``dashboard.html``.
+
+    The payload is ``{"columns": [...], "rows": [[...], ...], "regions": [...]}``; the
+    region column holds indexes into ``regions``. The page is streamed through ``out``
+    and only replaces an existing one when the writer closes cleanly.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        title: str = "OKML Fleet KPI Dashboard",
+        out: ArtifactWriter | None = None,
+    ) -> None:
+        self.path = path
+        self.rows = 0
+        self._regions: dict[str, int] = {}
+        self._stack = ExitStack()
+        self._f = self._stack.enter_context((out or ArtifactWriter()).open_text(path))
+        self._f.write(_HEAD.replace("__TITLE__", escape(title)))
+        self._f.write('{"columns":' + _json(list(COLUMNS)) + ',"rows":[')
+
+    def __enter__(self) -> FleetDashboardWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is not None:
+            self._stack.__exit__(exc_type, exc, tb)
+        else:
+            self.close()
+
+    def add(self, entry: Mapping[str, Any]) -> None:
+        scores, kpis = entry["scores"], entry["kpis"]
+        region = self._regions.setdefault(entry.get("region") or "", len(self._regions))
+        row = [
+            entry["env"],
+            region,
+            *(scores[k] for k in SCORE_KEYS),
+            entry["findings"],
+            kpis["before"]["uptime_monthly_percent"],
+            kpis["after"]["uptime_monthly_percent"],
+            kpis["before"]["provisioning_time_minutes_p50"],
+            kpis["after"]["provisioning_time_minutes_p50"],
+        ]
+        self._f.write(("," if self.rows else "") + _json(row))
+        self.rows += 1
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+        self._f.write('],"regions":' + _json(list(self._regions)) + "}")
+        self._f.write(_TAIL)
+        self._stack.close()
+
+
+def render_fleet_dashboard(index_path: Path, path: Path) -> int:
+    """Build the fleet dashboard from an ``index.ndjson``; returns the number of rows."""
+    with span("write", path=str(path)), FleetDashboardWriter(path) as dashboard:
+        with index_path.open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    dashboard.add(json.loads(line))
+    return dashboard.rows
+
+
+def _json(value: object) -> str:
+    # "</" would end the <script> element early; "<\/" is the same JSON string.
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).replace("</", "<\\/")
+
+
+_TEMPLATE = """<!doctype html>
+<html lang="en">
+  <head>
+    <meta charset="utf-8" />
+    <meta name="viewport" content="width=device-width, initial-scale=1" />
+    <title>__TITLE__</title>
+    <style>
+      body { font-family: system-ui, -apple-system, Segoe UI, Roboto, sans-serif; margin: 2rem; }
+      .wrap { max-width: 1280px; display: grid; gap: 1.25rem; }
+      .card { border: 1px solid #e5e7eb; border-radius: 12px; padding: 1rem 1.25rem; }
+      h1 { margin: 0 0 0.5rem 0; }
+      .kpi { display: flex; gap: 1rem; flex-wrap: wrap; }
+      .kpi div { background: #f9fafb; border: 1px solid #eef2f7; padding: 0.6rem 1rem;
+                 border-radius: 10px; }
+      .charts { display: grid; grid-template-columns: 1fr 1fr; gap: 1.25rem; }
+      .charts svg { width: 100%; height: auto; }
+      .controls { display: flex; gap: 0.75rem; margin-bottom: 0.75rem; }
+      .grid { display: grid; grid-template-columns: 2.4fr 1.2fr repeat(9, 1fr);
+              font-size: 13px; font-variant-numeric: tabular-nums; }
+      .grid > span { padding: 0 0.5rem; white-space: nowrap; overflow: hidden;
+                     text-overflow: ellipsis; line-height: 28px; }
+      .grid > span:nth-child(n + 3) { text-align: right; }
+      #head { border-bottom: 2px solid #e5e7eb; font-weight: 600; }
+      #head span { cursor: pointer; user-select: none; line-height: 1.3; padding: 0.4rem 0.5rem; }
+      #viewport { height: 560px; overflow-y: auto; position: relative; }
+      #rows { position: absolute; top: 0; left: 0; right: 0; }
+      .row { height: 28px; border-bottom: 1px solid #f3f4f6; }
+    </style>
+  </head>
+  <body>
+    <div class="wrap">
+      <div class="card">
+        <h1>__TITLE__</h1>
+        <div class="kpi" id="summary"></div>
+      </div>
+      <div class="charts">
+        <div class="card" id="uptime-chart"></div>
+        <div class="card" id="prov-chart"></div>
+      </div>
+      <div class="card">
+        <div class="controls">
+          <input id="search" type="search" placeholder="Filter environments" />
+          <select id="region"><option value="">All regions</option></select>
+          <span id="count"></span>
+        </div>
+        <div class="grid" id="head"></div>
+        <div id="viewport"><div id="spacer"></div><div id="rows"></div></div>
+      </div>
+    </div>
+    <script type="application/json" id="fleet-data">__DATA__</script>
+    <script>
+      (function () {
+        "use strict";
+        const P = JSON.parse(document.getElementById("fleet-data").textContent);
+        const N = P.rows.length;
+        const D = {};
+        P.columns.forEach((c, j) => {
+          D[c] = P.rows.map((r) => r[j]);
+        });
+        P.rows = null;
+        const ROW_H = 28;
+        const OVERSCAN = 10;
+        const BEFORE = "#C43C35";
+        const AFTER = "#2E8B57";
+        const COLS = [
+          ["env", "Environment"],
+          ["region", "Region"],
+          ["reliability_risk", "Reliability risk"],
+          ["operational_maturity", "Ops maturity"],
+          ["automation_maturity", "Automation maturity"],
+          ["standardization", "Standardization"],
+          ["findings", "Findings"],
+          ["uptime_before", "Uptime before (%)"],
+          ["uptime_after", "Uptime after (%)"],
+          ["prov_before", "Prov. P50 before (min)"],
+          ["prov_after", "Prov. P50 after (min)"],
+        ];
+        const ENTITIES = { "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;" };
+        const $ = (id) => document.getElementById(id);
+        const esc = (s) => String(s).replace(/[&<>"]/g, (c) => ENTITIES[c]);
+        const cell = (key, i) => (key === "region" ? P.regions[D.region[i]] : D[key][i]);
+        // <name a="1" ...>text</name>; attribute values are numbers or trusted strings.
+        const tag = (name, attrs, text) =>
+          "<" + name + Object.entries(attrs).map(([k, v]) => " " + k + '="' + v + '"').join("") +
+          (text === undefined ? "/>" : ">" + text + "</" + name + ">");
+
+        let view = new Int32Array(N).map((_, i) => i);
+        let sortKey = null;
+        let sortDir = 1;
+
+        $("head").innerHTML = COLS.map(([k, label]) => tag("span", { "data-key": k }, label))
+          .join("");
+        P.regions.forEach((r, i) => {
+          $("region").insertAdjacentHTML("beforeend", tag("option", { value: i }, esc(r)));
+        });
+
+        function filter() {
+          const q = $("search").value.trim().toLowerCase();
+          const r = $("region").value === "" ? -1 : Number($("region").value);
+          const out = [];
+          for (let i = 0; i < N; i++) {
+            if (r >= 0 && D.region[i] !== r) continue;
+            if (q && D.env[i].toLowerCase().indexOf(q) < 0) continue;
+            out.push(i);
+          }
+          view = Int32Array.from(out);
+          sort();
+          update();
+        }
+
+        function sort() {
+          if (sortKey === null) return;
+          const col = sortKey === "region" ? D.region.map((r) => P.regions[r]) : D[sortKey];
+          const dir = sortDir;
+          view.sort((a, b) => (col[a] < col[b] ? -dir : col[a] > col[b] ? dir : a - b));
+        }
+
+        // Only the rows in (and just around) the viewport exist in the DOM.
+        function render() {
+          const vp = $("viewport");
+          const first = Math.max(0, Math.floor(vp.scrollTop / ROW_H) - OVERSCAN);
+          const visible = Math.ceil(vp.clientHeight / ROW_H) + 2 * OVERSCAN;
+          const last = Math.min(view.length, first + visible);
+          let html = "";
+          for (let k = first; k < last; k++) {
+            const i = view[k];
+            html += '<div class="grid row">';
+            for (const [key] of COLS) html += "<span>" + esc(cell(key, i)) + "</span>";
+            html += "</div>";
+          }
+          $("rows").style.transform = "translateY(" + first * ROW_H + "px)";
+          $("rows").innerHTML = html;
+        }
+
+        function mean(key) {
+          let s = 0;
+          for (const i of view) s += D[key][i];
+          return view.length ? s / view.length : 0;
+        }
+
+        function median(key) {
+          const vals = Float64Array.from(view, (i) => D[key][i]).sort();
+          return vals.length ? vals[vals.length >> 1] : 0;
+        }
+
+        function bars(title, labels, series, yLabel) {
+          const W = 560, H = 260, L = 56, R = 12, T = 30, B = 44;
+          const plotH = H - B - T;
+          const max = Math.max(1e-9, ...series.flatMap((s) => s.values)) * 1.05;
+          const slot = (W - L - R) / Math.max(1, labels.length);
+          const bw = (slot * 0.8) / series.length;
+          const every = Math.ceil(labels.length / 16);
+          const midY = T + plotH / 2;
+          const heading = { x: W / 2, y: 18, "text-anchor": "middle", "font-weight": 600 };
+          let out = tag("text", heading, esc(title));
+          out += tag("text", { x: 12, y: midY, "text-anchor": "middle",
+                               transform: "rotate(-90 12 " + midY + ")" }, esc(yLabel));
+          for (let t = 0; t <= 4; t++) {
+            const y = H - B - (t / 4) * plotH;
+            out += tag("line", { x1: L, x2: W - R, y1: y, y2: y, stroke: "#e5e7eb" });
+            const tick = ((max * t) / 4).toFixed(0);
+            out += tag("text", { x: L - 4, y: y + 4, "text-anchor": "end" }, tick);
+          }
+          labels.forEach((label, j) => {
+            series.forEach((s, k) => {
+              const v = s.values[j];
+              const h = (v / max) * plotH;
+              const x = L + j * slot + slot * 0.1 + k * bw;
+              const tip = tag("title", {}, esc(label + " " + s.name + ": " + v.toFixed(1)));
+              out += tag("rect", { x: x, y: H - B - h, width: bw, height: h, fill: s.color }, tip);
+            });
+            if (j % every === 0) {
+              const x = L + (j + 0.5) * slot;
+              out += tag("text", { x: x, y: H - B + 14, "text-anchor": "middle" }, esc(label));
+            }
+          });
+          series.forEach((s, k) => {
+            out += tag("rect", { x: L + k * 90, y: H - 16, width: 10, height: 10, fill: s.color });
+            out += tag("text", { x: L + k * 90 + 14, y: H - 7 }, esc(s.name));
+          });
+          const svg = { xmlns: "http://www.w3.org/2000/svg", viewBox: "0 0 " + W + " " + H };
+          return tag("svg", { ...svg, "font-size": 11 }, out);
+        }
+
+        function charts() {
+          const LO = 97, STEP = 0.25, BINS = 12;
+          const hist = (key) => {
+            const h = new Array(BINS).fill(0);
+            for (const i of view) {
+              h[Math.min(BINS - 1, Math.max(0, Math.floor((D[key][i] - LO) / STEP)))]++;
+            }
+            return h;
+          };
+          const binLabels = Array.from({ length: BINS }, (_, b) => (LO + b * STEP).toFixed(2));
+          $("uptime-chart").innerHTML = bars(
+            "Monthly uptime distribution",
+            binLabels,
+            [
+              { name: "Before", color: BEFORE, values: hist("uptime_before") },
+              { name: "After", color: AFTER, values: hist("uptime_after") },
+            ],
+            "Environments",
+          );
+
+          const nr = P.regions.length;
+          const counts = new Float64Array(nr);
+          const before = new Float64Array(nr);
+          const after = new Float64Array(nr);
+          for (const i of view) {
+            const r = D.region[i];
+            counts[r]++;
+            before[r] += D.prov_before[i];
+            after[r] += D.prov_after[i];
+          }
+          const shown = P.regions.map((_, r) => r).filter((r) => counts[r] > 0);
+          $("prov-chart").innerHTML = bars(
+            "Mean provisioning P50 by region",
+            shown.map((r) => P.regions[r]),
+            [
+              { name: "Before", color: BEFORE, values: shown.map((r) => before[r] / counts[r]) },
+              { name: "After", color: AFTER, values: shown.map((r) => after[r] / counts[r]) },
+            ],
+            "Minutes",
+          );
+        }
+
+        function summary() {
+          const card = (label, value) =>
+            tag("div", {}, tag("strong", {}, label) + "<br />" + value);
+          const arrow = (a, b, digits, unit) =>
+            a.toFixed(digits) + unit + " &rarr; " + b.toFixed(digits) + unit;
+          $("summary").innerHTML = [
+            card("Environments", view.length.toLocaleString() + " of " + N.toLocaleString()),
+            card("Mean uptime", arrow(mean("uptime_before"), mean("uptime_after"), 3, "%")),
+            card("Median provisioning P50",
+                 arrow(median("prov_before"), median("prov_after"), 1, " min")),
+            card("Mean reliability risk", mean("reliability_risk").toFixed(1)),
+          ].join("");
+          $("count").textContent = view.length.toLocaleString() + " rows";
+        }
+
+        function update() {
+          $("spacer").style.height = view.length * ROW_H + "px";
+          $("viewport").scrollTop = 0;
+          render();
+          charts();
+          summary();
+        }
+
+        let pending = false;
+        $("viewport").addEventListener("scroll", () => {
+          if (pending) return;
+          pending = true;
+          requestAnimationFrame(() => {
+            pending = false;
+            render();
+          });
+        });
+        $("head").addEventListener("click", (e) => {
+          const key = e.target.dataset && e.target.dataset.key;
+          if (!key) return;
+          const text = key === "env" || key === "region";
+          sortDir = sortKey === key ? -sortDir : text ? 1 : -1;
+          sortKey = key;
+          sort();
+          update();
+        });
+        let timer = 0;
+        $("search").addEventListener("input", () => {
+          clearTimeout(timer);
+          timer = setTimeout(filter, 150);
+        });
+        $("region").addEventListener("change", filter);
+        update();
+      })();
+    </script>
+  </body>
+</html>
+"""
+_HEAD, _TAIL = _TEMPLATE.split("__DATA__")
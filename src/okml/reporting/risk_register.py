@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import csv
+import heapq
+import json
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import Any, TextIO
+
+from okml.domain.models import RoadmapItem
+from okml.domain.recommendations import CATALOG
+from okml.reporting.artifact_writer import ArtifactWriter
+
+# The fleet risk register has one row per (environment, recommendation), built from
+# index.ndjson entries plus the recommendation catalog. Ids are RISK-NNNNNN, numbered in
+# index order across the whole fleet, so an id names the same row in fleet/risk_register.csv
+# and in any `okml risks` query over that index.
+
+RISK_COLUMNS = (
+    "risk_id",
+    "env",
+    "region",
+    "recommendation",
+    "risk",
+    "mitigation",
+    "priority",
+    "effort",
+    "impact",
+    "risk_reduction",
+    "tags",
+    "reliability_risk",
+)
+RANK_BY = ("priority", "impact", "risk_reduction")
+_LEVEL = {"H": 0, "M": 1, "L": 2}  # sorts high before low
+
+
+@dataclass(frozen=True)
+class RiskRow:
+    seq: int
+    env: str
+    region: str
+    reliability_risk: float
+    item: RoadmapItem  # shared catalog entry; rows only add what differs per environment
+
+    @property
+    def risk_id(self) -> str:
+        return f"RISK-{self.seq:06d}"
+
+    def csv_row(self) -> list[object]:
+        item = self.item
+        return [
+            self.risk_id,
+            self.env,
+            self.region,
+            item.id,
+            item.title,
+            item.rationale,
+            item.priority,
+            item.effort,
+            item.impact,
+            item.risk_reduction,
+            ";".join(item.tags),
+            self.reliability_risk,
+        ]
+
+
+def entry_risks(entry: Mapping[str, Any], start: int) -> list[RiskRow]:
+    """The register rows of one index entry, numbered from ``start``."""
+    env, region = entry["env"], entry.get("region") or ""
+    reliability_risk = entry["scores"]["reliability_risk"]
+    try:
+        return [
+            RiskRow(seq, env, region, reliability_risk, CATALOG[rec_id])
+            for seq, rec_id in enumerate(entry["recommendations"], start=start)
+        ]
+    except KeyError as e:
+        raise ValueError(f"{env}: unknown recommendation {e.args[0]!r}.") from None
+
+
+def iter_fleet_risks(entries: Iterable[Mapping[str, Any]]) -> Iterator[RiskRow]:
+    seq = 1
+    for entry in entries:
+        rows = entry_risks(entry, seq)
+        seq += len(rows)
+        yield from rows
+
+
+def iter_index(path: Path) -> Iterator[dict[str, Any]]:
+    """Stream the entries of a fleet ``index.ndjson``."""
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def rank_key(by: str) -> Callable[[RiskRow], tuple[float, ...]]:
+    """Sort key, most urgent first: ``by``, then priority, riskier environments, register order."""
+    if by not in RANK_BY:
+        raise ValueError(f"Cannot rank risks by {by!r}; use one of {', '.join(RANK_BY)}.")
+    if by == "priority":
+        return lambda r: (r.item.priority, -r.reliability_risk, r.seq)
+    if by == "impact":
+        return lambda r: (_LEVEL[r.item.impact], r.item.priority, -r.reliability_risk, r.seq)
+    return lambda r: (_LEVEL[r.item.risk_reduction], r.item.priority, -r.reliability_risk, r.seq)
+
+
+def top_risks(
+    rows: Iterable[RiskRow], k: int, *, by: str = "priority", tag: str | None = None
+) -> list[RiskRow]:
+    """The ``k`` most urgent rows, ranked by ``by``; memory is O(k), not O(rows).
+
+    ``heapq.nsmallest`` keeps a bounded heap of ``k`` rows while the stream goes past.
+    """
+    if tag is not None:
+        rows = (r for r in rows if tag in r.item.tags)
+    return heapq.nsmallest(k, rows, key=rank_key(by))
+
+
+def write_risk_rows(f: TextIO, rows: Iterable[RiskRow]) -> int:
+    w = csv.writer(f, lineterminator="\n")
+    w.writerow(RISK_COLUMNS)
+    n = 0
+    for row in rows:
+        w.writerow(row.csv_row())
+        n += 1
+    return n
+
+
+class FleetRiskRegisterWriter:
+    """Streams ``index.ndjson``-shaped entries into ``risk_register.csv`` through ``out``."""
+
+    def __init__(self, path: Path, *, out: ArtifactWriter | None = None) -> None:
+        self.path = path
+        self.rows = 0
+        self._stack = ExitStack()
+        self._f = self._stack.enter_context((out or ArtifactWriter()).open_text(path))
+        self._csv = csv.writer(self._f, lineterminator="\n")
+        self._csv.writerow(RISK_COLUMNS)
+
+    def __enter__(self) -> FleetRiskRegisterWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._stack.__exit__(exc_type, exc, tb)
+
+    def add(self, entry: Mapping[str, Any]) -> None:
+        rows = entry_risks(entry, self.rows + 1)
+        self._csv.writerows(r.csv_row() for r in rows)
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        self._stack.close()
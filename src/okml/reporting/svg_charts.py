@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from html import escape
+
+# Hand-written SVG for the two KPI charts. Plain string building: no matplotlib import, no
+# figure state, microseconds per chart, and the markup embeds directly in dashboard.html.
+
+FONT = "system-ui, -apple-system, Segoe UI, Roboto, sans-serif"
+LINE_COLOR = "#1F77B4"
+GRID_COLOR = "#E5E7EB"
+AXIS_COLOR = "#6B7280"
+BEFORE_COLOR = "#C43C35"
+AFTER_COLOR = "#2E8B57"
+
+_MARGIN_LEFT, _MARGIN_RIGHT, _MARGIN_TOP, _MARGIN_BOTTOM = 64, 16, 36, 32
+
+
+def uptime_trend_series(before_uptime: float, after_uptime: float) -> tuple[list[str], list[float]]:
+    """Month labels and simulated monthly uptime, shared by the SVG and PNG renderers."""
+    months = ["M-2", "M-1", "M0", "M+1", "M+2", "M+3"]
+    series = [
+        before_uptime - 0.25,
+        before_uptime - 0.12,
+        before_uptime,
+        min(after_uptime, before_uptime + 0.35),
+        min(after_uptime, before_uptime + 0.5),
+        after_uptime,
+    ]
+    return months, series
+
+
+def uptime_trend_svg(*, before_uptime: float, after_uptime: float) -> str:
+    months, series = uptime_trend_series(before_uptime, after_uptime)
+    return line_chart_svg(
+        months,
+        series,
+        title="Monthly Uptime Trend (Simulated)",
+        y_label="Uptime (%)",
+        y_range=(97.0, 100.0),
+    )
+
+
+def provisioning_time_svg(*, before_p50: float, after_p50: float) -> str:
+    return bar_chart_svg(
+        ["Before", "After"],
+        [before_p50, after_p50],
+        colors=[BEFORE_COLOR, AFTER_COLOR],
+        title="Provisioning Time P50 (Simulated)",
+        y_label="Minutes",
+        width=500,
+    )
+
+
+def line_chart_svg(
+    labels: Sequence[str],
+    values: Sequence[float],
+    *,
+    title: str,
+    y_label: str,
+    y_range: tuple[float, float],
+    width: int = 800,
+    height: int = 300,
+) -> str:
+    lo, hi = y_range
+    plot = _Plot(width, height, lo, hi)
+    step = plot.w / max(1, len(values) - 1)
+    xs = [plot.x0 + i * step for i in range(len(values))]
+    ys = [plot.y(v) for v in values]
+    points = " ".join(f"{x:.1f},{y:.1f}" for x, y in zip(xs, ys, strict=True))
+    body = [
+        *plot.grid(_ticks(lo, hi), vertical=xs),
+        f'<polyline points="{points}" fill="none" stroke="{LINE_COLOR}" stroke-width="2"/>',
+        *(
+            f'<circle cx="{x:.1f}" cy="{y:.1f}" r="4" fill="{LINE_COLOR}">'
+            f"<title>{escape(label)}: {v:g}</title></circle>"
+            for x, y, label, v in zip(xs, ys, labels, values, strict=True)
+        ),
+        *plot.x_labels(xs, labels),
+    ]
+    return _svg(width, height, title, y_label, body)
+
+
+def bar_chart_svg(
+    labels: Sequence[str],
+    values: Sequence[float],
+    *,
+    colors: Sequence[str],
+    title: str,
+    y_label: str,
+    width: int = 800,
+    height: int = 300,
+) -> str:
+    hi = max(values, default=0.0) * 1.05 or 1.0
+    plot = _Plot(width, height, 0.0, hi)
+    slot = plot.w / max(1, len(values))
+    bar_w = slot * 0.8
+    xs = [plot.x0 + slot * (i + 0.5) for i in range(len(values))]
+    body = [
+        *plot.grid(_ticks(0.0, hi)),
+        *(
+            f'<rect x="{x - bar_w / 2:.1f}" y="{plot.y(v):.1f}" width="{bar_w:.1f}" '
+            f'height="{plot.y0 - plot.y(v):.1f}" fill="{color}">'
+            f"<title>{escape(label)}: {v:g}</title></rect>"
+            for x, v, label, color in zip(xs, values, labels, colors, strict=True)
+        ),
+        *plot.x_labels(xs, labels),
+    ]
+    return _svg(width, height, title, y_label, body)
+
+
+class _Plot:
+    """Maps data values onto the plot area inside the margins."""
+
+    def __init__(self, width: int, height: int, lo: float, hi: float) -> None:
+        self.x0, self.x1 = _MARGIN_LEFT, width - _MARGIN_RIGHT
+        self.y1, self.y0 = _MARGIN_TOP, height - _MARGIN_BOTTOM
+        self.w, self.h = self.x1 - self.x0, self.y0 - self.y1
+        self.lo, self.span = lo, (hi - lo) or 1.0
+
+    def y(self, value: float) -> float:
+        clamped = min(max(value, self.lo), self.lo + self.span)
+        return self.y0 - (clamped - self.lo) / self.span * self.h
+
+    def grid(self, ticks: Sequence[float], vertical: Sequence[float] = ()) -> list[str]:
+        out = []
+        for t in ticks:
+            y = self.y(t)
+            out.append(
+                f'<line x1="{self.x0}" y1="{y:.1f}" x2="{self.x1}" y2="{y:.1f}" '
+                f'stroke="{GRID_COLOR}"/>'
+            )
+            out.append(f'<text x="{self.x0 - 6}" y="{y + 4:.1f}" text-anchor="end">{t:g}</text>')
+        out += [
+            f'<line x1="{x:.1f}" y1="{self.y1}" x2="{x:.1f}" y2="{self.y0}" stroke="{GRID_COLOR}"/>'
+            for x in vertical
+        ]
+        out.append(
+            f'<polyline points="{self.x0},{self.y1} {self.x0},{self.y0} {self.x1},{self.y0}" '
+            f'fill="none" stroke="{AXIS_COLOR}"/>'
+        )
+        return out
+
+    def x_labels(self, xs: Sequence[float], labels: Sequence[str]) -> list[str]:
+        return [
+            f'<text x="{x:.1f}" y="{self.y0 + 18}" text-anchor="middle">{escape(label)}</text>'
+            for x, label in zip(xs, labels, strict=True)
+        ]
+
+
+def _ticks(lo: float, hi: float, target: int = 6) -> list[float]:
+    """Round tick values (1/2/5 x 10^k steps) covering ``[lo, hi]``."""
+    raw = (hi - lo) / target or 1.0
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw)
+    first = -(-lo // step) * step
+    n = int((hi - first) / step + 1e-9) + 1
+    return [round(first + i * step, 10) for i in range(n)]
+
+
+def _svg(width: int, height: int, title: str, y_label: str, body: list[str]) -> str:
+    mid_y = (_MARGIN_TOP + height - _MARGIN_BOTTOM) / 2
+    lines = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" '
+        f'width="{width}" height="{height}" role="img" aria-label="{escape(title)}" '
+        f'font-family="{FONT}" font-size="12" fill="#111827">',
+        f"<title>{escape(title)}</title>",
+        f'<text x="{width / 2:.1f}" y="22" text-anchor="middle" font-size="14" '
+        f'font-weight="600">{escape(title)}</text>',
+        f'<text x="14" y="{mid_y:.1f}" text-anchor="middle" '
+        f'transform="rotate(-90 14 {mid_y:.1f})">{escape(y_label)}</text>',
+        *body,
+        "</svg>",
+    ]
+    return "\n".join(lines) + "\n"
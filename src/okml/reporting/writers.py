@@ -2,36 +2,33 @@ from __future__ import annotations
 
 import base64
 import csv
-import json
+import io
 import os
 import tempfile
 from pathlib import Path
-
-os.environ.setdefault("MPLCONFIGDIR", str(Path(tempfile.gettempdir()) / "okml-mplconfig"))
-
-import matplotlib.pyplot as plt
+from typing import Any
 
 from okml.domain.models import AssessmentReport, RoadmapItem
-from okml.utils.fs import ensure_dir
+from okml.reporting.artifact_writer import ArtifactWriter
+from okml.reporting.svg_charts import uptime_trend_series
 
 
 def write_json(path: Path, payload: object) -> None:
-    ensure_dir(path.parent)
-    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+    """One-off atomic write; services batch theirs through an ``ArtifactWriter``."""
+    ArtifactWriter().write_json(path, payload)
 
 
 def write_text(path: Path, text: str) -> None:
-    ensure_dir(path.parent)
-    path.write_text(text, encoding="utf-8")
+    ArtifactWriter().write_text(path, text)
 
 
-def write_risk_register_csv(path: Path, recommendations: list[RoadmapItem]) -> None:
-    ensure_dir(path.parent)
-    with path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(["risk_id", "risk", "mitigation", "priority"])
-        for i, rec in enumerate(recommendations, start=1):
-            w.writerow([f"RISK-{i:03d}", rec.title, rec.rationale, rec.priority])
+def render_risk_register_csv(recommendations: list[RoadmapItem]) -> str:
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(["risk_id", "risk", "mitigation", "priority"])
+    for i, rec in enumerate(recommendations, start=1):
+        w.writerow([f"RISK-{i:03d}", rec.title, rec.rationale, rec.priority])
+    return buf.getvalue()
 
 
 def render_assessment_md(report: AssessmentReport) -> str:
@@ -66,17 +63,17 @@ def render_assessment_md(report: AssessmentReport) -> str:
     return "\n".join(lines).rstrip() + "\n"
 
 
-def plot_uptime_trend_png(path: Path, *, before_uptime: float, after_uptime: float) -> None:
-    ensure_dir(path.parent)
-    months = ["M-2", "M-1", "M0", "M+1", "M+2", "M+3"]
-    series = [
-        before_uptime - 0.25,
-        before_uptime - 0.12,
-        before_uptime,
-        min(after_uptime, before_uptime + 0.35),
-        min(after_uptime, before_uptime + 0.5),
-        after_uptime,
-    ]
+def _use_private_mplconfig() -> None:
+    # matplotlib is imported inside the plot functions: it dominates import time and only
+    # the KPI stage draws charts.
+    os.environ.setdefault("MPLCONFIGDIR", str(Path(tempfile.gettempdir()) / "okml-mplconfig"))
+
+
+def plot_uptime_trend_png(*, before_uptime: float, after_uptime: float) -> bytes:
+    _use_private_mplconfig()
+    import matplotlib.pyplot as plt
+
+    months, series = uptime_trend_series(before_uptime, after_uptime)
     plt.figure(figsize=(8, 3))
     plt.plot(months, series, marker="o")
     plt.ylim(97.0, 100.0)
@@ -84,12 +81,13 @@ def plot_uptime_trend_png(path: Path, *, before_uptime: float, after_uptime: flo
     plt.ylabel("Uptime (%)")
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
-    plt.savefig(path, dpi=160)
-    plt.close()
+    return _savefig_png(plt)
+
 
+def plot_provisioning_time_png(*, before_p50: float, after_p50: float) -> bytes:
+    _use_private_mplconfig()
+    import matplotlib.pyplot as plt
 
-def plot_provisioning_time_png(path: Path, *, before_p50: float, after_p50: float) -> None:
-    ensure_dir(path.parent)
     labels = ["Before", "After"]
     vals = [before_p50, after_p50]
     plt.figure(figsize=(5, 3))
@@ -97,15 +95,23 @@ def plot_provisioning_time_png(path: Path, *, before_p50: float, after_p50: floa
     plt.title("Provisioning Time P50 (Simulated)")
     plt.ylabel("Minutes")
     plt.tight_layout()
-    plt.savefig(path, dpi=160)
+    return _savefig_png(plt)
+
+
+def _savefig_png(plt: Any) -> bytes:
+    buf = io.BytesIO()
+    plt.savefig(buf, format="png", dpi=160)
     plt.close()
+    return buf.getvalue()
 
 
-def render_kpis_md(kpis: dict[str, dict[str, float]]) -> str:
+def render_kpis_md(
+    kpis: dict[str, dict[str, float]], *, simulation: dict[str, Any] | None = None
+) -> str:
     b = kpis["before"]
     a = kpis["after"]
     improvement = 1.0 - (a["provisioning_time_minutes_p50"] / b["provisioning_time_minutes_p50"])
-    return (
+    md = (
         "# KPI Evidence Pack\n\n"
         "## Reliability\n"
         f"- Before: **{b['uptime_monthly_percent']}%** monthly uptime\n"
@@ -115,24 +121,60 @@ def render_kpis_md(kpis: dict[str, dict[str, float]]) -> str:
         f"- After P50: **{a['provisioning_time_minutes_p50']} min**\n"
         f"- Improvement: **{round(improvement * 100, 1)}%**\n"
     )
+    if simulation is None:
+        return md
+    after = simulation["after"]
+    return md + (
+        f"\n## Confidence bands ({simulation['runs']} simulated scenarios)\n"
+        "| KPI (after) | P5 | P50 | P95 |\n"
+        "|---|---|---|---|\n"
+        f"| Monthly uptime (%) | {_band_cells(after['uptime_monthly_percent'])} |\n"
+        f"| Provisioning P50 (min) | {_band_cells(after['provisioning_time_minutes_p50'])} |\n"
+        f"| Provisioning improvement (%) | "
+        f"{_band_cells(simulation['provisioning_improvement_percent'])} |\n"
+    )
+
+
+def _band_cells(band: dict[str, float]) -> str:
+    return " | ".join(str(band[k]) for k in ("p5", "p50", "p95"))
+
+
+def png_img_tag(png: bytes, alt: str) -> str:
+    """An ``<img>`` with the PNG inlined as a data URI, so the dashboard stays one file."""
+    b64 = base64.b64encode(png).decode("ascii")
+    return f'<img src="data:image/png;base64,{b64}" alt="{alt}" />'
 
 
 def render_dashboard_html(
     *,
-    path: Path,
     kpis: dict[str, dict[str, float]],
-    uptime_png: Path,
-    provisioning_png: Path,
-) -> None:
-    def as_data_uri(p: Path) -> str:
-        data = p.read_bytes()
-        b64 = base64.b64encode(data).decode("ascii")
-        return f"data:image/png;base64,{b64}"
-
-    ensure_dir(path.parent)
-    uptime_uri = as_data_uri(uptime_png)
-    prov_uri = as_data_uri(provisioning_png)
-    html = f"""<!doctype html>
+    uptime_chart: str,
+    provisioning_chart: str,
+    simulation: dict[str, Any] | None = None,
+) -> str:
+    """``uptime_chart``/``provisioning_chart`` are HTML: inline ``<svg>`` or ``png_img_tag``."""
+    bands = ""
+    if simulation is not None:
+        after = simulation["after"]
+        rows = [
+            ("Monthly uptime (%)", after["uptime_monthly_percent"]),
+            ("Provisioning P50 (min)", after["provisioning_time_minutes_p50"]),
+            ("Provisioning improvement (%)", simulation["provisioning_improvement_percent"]),
+        ]
+        cells = "\n".join(
+            f"          <tr><td>{label}</td><td>{b['p5']}</td><td>{b['p50']}</td>"
+            f"<td>{b['p95']}</td></tr>"
+            for label, b in rows
+        )
+        bands = f"""
+      <div class="card">
+        <h2>Confidence bands ({simulation["runs"]} simulated scenarios)</h2>
+        <table>
+          <tr><th>KPI (after)</th><th>P5</th><th>P50</th><th>P95</th></tr>
+{cells}
+        </table>
+      </div>"""
+    return f"""<!doctype html>
 <html lang="en">
   <head>
     <meta charset="utf-8" />
@@ -150,8 +192,11 @@ def render_dashboard_html(
         padding: 0.75rem 1rem;
         border-radius: 10px;
       }}
-      img {{ width: 100%; height: auto; border-radius: 8px; border: 1px solid #f0f0f0; }}
+      img, svg {{ width: 100%; height: auto; border-radius: 8px; border: 1px solid #f0f0f0; }}
       code {{ background: #f3f4f6; padding: 0.1rem 0.3rem; border-radius: 6px; }}
+      table {{ border-collapse: collapse; }}
+      th, td {{ text-align: right; padding: 0.3rem 0.9rem; border-bottom: 1px solid #eef2f7; }}
+      th:first-child, td:first-child {{ text-align: left; }}
     </style>
   </head>
   <body>
@@ -173,20 +218,19 @@ def render_dashboard_html(
             {kpis["after"]["provisioning_time_minutes_p50"]} min
           </div>
         </div>
-      </div>
+      </div>{bands}
       <div class="card">
         <h2>Uptime trend</h2>
-        <img src="{uptime_uri}" alt="Uptime trend" />
+        {uptime_chart}
       </div>
       <div class="card">
         <h2>Provisioning time</h2>
-        <img src="{prov_uri}" alt="Provisioning time" />
+        {provisioning_chart}
       </div>
     </div>
   </body>
 </html>
 """
-    path.write_text(html, encoding="utf-8")
 
 
 def render_target_state_md() -> str:
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import threading
+
+# Well-known keys published by the pipeline stages.
+ASSESSMENT_REPORT = "assessment/report"
+KPIS = "kpis/kpis"
+
+
+class ArtifactBus:
+    """In-process handoff of typed stage outputs between services in one run.
+
+    A producing stage publishes the object it just wrote to disk; a downstream
+    stage in the same process takes it from here instead of re-reading and
+    re-validating the file. Services invoked on their own get no bus and fall
+    back to the artifacts on disk.
+    """
+
+    def __init__(self) -> None:
+        self._items: dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, key: str, value: object) -> None:
+        with self._lock:
+            self._items[key] = value
+
+    def get(self, key: str) -> object | None:
+        with self._lock:
+            return self._items.get(key)
@@ -9,74 +9,100 @@ from okml.config import Settings
 from okml.domain.models import AssessmentReport, AssessmentScores, LegacyEnvironment
 from okml.domain.recommendations import recommend
 from okml.domain.scoring import score_environment
-from okml.reporting.writers import (
-    render_assessment_md,
-    write_json,
-    write_risk_register_csv,
-    write_text,
-)
-from okml.utils.fs import ensure_dir
+from okml.reporting.artifact_writer import ArtifactWriter
+from okml.reporting.writers import render_assessment_md, render_risk_register_csv
+from okml.services.artifact_bus import ASSESSMENT_REPORT, ArtifactBus
 from okml.utils.logging import get_logger
+from okml.utils.profiling import profile_step
+from okml.utils.tracing import span
 
 
 class AssessmentService:
-    def __init__(self, *, settings: Settings, run_id: str) -> None:
+    def __init__(self, *, settings: Settings, run_id: str, bus: ArtifactBus | None = None) -> None:
         self._settings = settings
         self._run_id = run_id
+        self._bus = bus
         self._log = get_logger(__name__)
 
     def run(self, *, input_path: Path) -> AssessmentReport:
-        env = self._load_env(input_path)
-        scores = score_environment(env)
-        recs = recommend(env, scores)
+        with span("assessment", input=str(input_path)) as sp:
+            report = assess_environment(load_environment(input_path))
+            if sp is not None:
+                sp.set_attribute("env", report.env.name)
 
-        findings = self._derive_findings(env, scores)
-        report = AssessmentReport(env=env, scores=scores, findings=findings, recommendations=recs)
+            out_dir = self._settings.artifacts_dir / "assessment"
+            with ArtifactWriter.from_settings(self._settings) as out:
+                write_assessment_artifacts(out_dir, report, out)
+            if self._bus is not None:
+                self._bus.publish(ASSESSMENT_REPORT, report)
 
-        out_dir = ensure_dir(self._settings.artifacts_dir / "assessment")
-        write_text(out_dir / "assessment_report.md", render_assessment_md(report))
-        write_json(out_dir / "assessment_report.json", json.loads(report.model_dump_json()))
-        write_risk_register_csv(out_dir / "risk_register.csv", recs)
+            self._log.info(
+                "assessment_complete",
+                extra={"run_id": self._run_id, "out_dir": str(out_dir), "env": report.env.name},
+            )
+            return report
 
-        self._log.info(
-            "assessment_complete",
-            extra={"run_id": self._run_id, "out_dir": str(out_dir), "env": env.name},
-        )
-        return report
 
-    def _load_env(self, input_path: Path) -> LegacyEnvironment:
+def load_environment(input_path: Path) -> LegacyEnvironment:
+    with profile_step("parse"):
         raw = input_path.read_text(encoding="utf-8")
         if input_path.suffix.lower() in {".yaml", ".yml"}:
             data = yaml.safe_load(raw)
         else:
             data = json.loads(raw)
+    with profile_step("validate"):
         return LegacyEnvironment.model_validate(data)
 
-    def _derive_findings(self, env: LegacyEnvironment, scores: AssessmentScores) -> list[str]:
-        findings: list[str] = []
-        total_prov = sum(s.minutes_p50 for s in env.provisioning_workflow)
-        manual = sum(s.manual_touchpoints for s in env.provisioning_workflow)
+
+def assess_environment(
+    env: LegacyEnvironment, scores: AssessmentScores | None = None
+) -> AssessmentReport:
+    """Build the assessment report; pass ``scores`` when they were computed in batch."""
+    if scores is None:
+        with profile_step("score"):
+            scores = score_environment(env)
+    with profile_step("recommend"):
+        recs = recommend(env, scores)
+        findings = derive_findings(env, scores)
+    return AssessmentReport(env=env, scores=scores, findings=findings, recommendations=recs)
+
+
+def write_assessment_artifacts(
+    out_dir: Path, report: AssessmentReport, out: ArtifactWriter
+) -> None:
+    with profile_step("write_artifacts"):
+        out.write_text(out_dir / "assessment_report.md", render_assessment_md(report))
+        out.write_json(out_dir / "assessment_report.json", report.model_dump(mode="json"))
+        out.write_text(
+            out_dir / "risk_register.csv", render_risk_register_csv(report.recommendations)
+        )
+
+
+def derive_findings(env: LegacyEnvironment, scores: AssessmentScores) -> list[str]:
+    findings: list[str] = []
+    total_prov = sum(s.minutes_p50 for s in env.provisioning_workflow)
+    manual = sum(s.manual_touchpoints for s in env.provisioning_workflow)
+    findings.append(
+        f"Provisioning workflow P50 is ~{round(total_prov, 1)} minutes "
+        f"with {manual} manual touchpoints."
+    )
+    if not env.control_plane.ha_enabled:
         findings.append(
-            f"Provisioning workflow P50 is ~{round(total_prov, 1)} minutes "
-            f"with {manual} manual touchpoints."
+            "Control plane HA is not enabled; reliability risk increases during "
+            "upgrades and failures."
         )
-        if not env.control_plane.ha_enabled:
-            findings.append(
-                "Control plane HA is not enabled; reliability risk increases during "
-                "upgrades and failures."
-            )
-        if env.config_drift_rate_percent >= 10:
-            findings.append(
-                f"Config drift rate is {env.config_drift_rate_percent}%, "
-                "indicating inconsistent operations."
-            )
-        if scores.automation_maturity <= 45:
-            findings.append(
-                "Automation maturity is low; inconsistent provisioning and "
-                "manual changes drive variance."
-            )
-        if env.network.east_west_visibility == "low":
-            findings.append(
-                "East-west visibility is low; change impact is harder to predict and validate."
-            )
-        return findings
+    if env.config_drift_rate_percent >= 10:
+        findings.append(
+            f"Config drift rate is {env.config_drift_rate_percent}%, "
+            "indicating inconsistent operations."
+        )
+    if scores.automation_maturity <= 45:
+        findings.append(
+            "Automation maturity is low; inconsistent provisioning and "
+            "manual changes drive variance."
+        )
+    if env.network.east_west_visibility == "low":
+        findings.append(
+            "East-west visibility is low; change impact is harder to predict and validate."
+        )
+    return findings
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
-import json
+import contextvars
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Any
 
 from okml.adapters.ansible_runner import AnsibleRunner
 from okml.adapters.terraform_runner import TerraformRunner
 from okml.config import Settings
-from okml.reporting.writers import write_json, write_text
-from okml.utils.fs import ensure_dir
+from okml.reporting.artifact_writer import ArtifactWriter
 from okml.utils.logging import get_logger
+from okml.utils.tracing import span
 
 
 class AutomationService:
@@ -18,35 +21,64 @@ class AutomationService:
         self._log = get_logger(__name__)
 
     def run(self) -> None:
-        repo_root = Path.cwd()
-        tf = TerraformRunner(repo_root=repo_root).run()
-        ans = AnsibleRunner(repo_root=repo_root).run()
+        with span("automation") as sp:
+            repo_root = Path.cwd()
+            tf_runner = TerraformRunner(
+                repo_root=repo_root, cache_dir=self._settings.terraform_cache_dir
+            )
+            ans_runner = AnsibleRunner(repo_root=repo_root)
+            # The runners work on separate copies of iac/terraform and iac/ansible and spend
+            # their time waiting on subprocesses, so they run side by side; each keeps its own
+            # timeouts and mock fallback.
+            t0 = time.perf_counter()
+            elapsed: dict[str, float] = {}
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="okml-automation") as pool:
+                tf_future = pool.submit(contextvars.copy_context().run, tf_runner.run)
+                ans_future = pool.submit(contextvars.copy_context().run, ans_runner.run)
+                names: dict[Future[Any], str] = {tf_future: "terraform_s", ans_future: "ansible_s"}
+                for fut in as_completed(names):
+                    elapsed[names[fut]] = time.perf_counter() - t0
+                tf, ans = tf_future.result(), ans_future.result()
+            wall_s = time.perf_counter() - t0
+            timings = {k: round(v, 4) for k, v in sorted(elapsed.items())}
+            timings["wall_s"] = round(wall_s, 4)
+            # What running them one after the other would have cost on top.
+            timings["saved_s"] = round(max(0.0, sum(elapsed.values()) - wall_s), 4)
+            if sp is not None:
+                sp.set_attribute("terraform_mode", tf.mode)
+                sp.set_attribute("ansible_mode", ans.mode)
+                sp.set_attribute("saved_s", timings["saved_s"])
 
-        out_dir = ensure_dir(self._settings.artifacts_dir / "automation")
-        write_text(out_dir / "terraform_plan.txt", tf.plan_text + f"\nMode: {tf.mode}\n")
-        write_json(out_dir / "terraform_outputs.json", tf.outputs)
-        write_text(out_dir / "ansible_run.log", ans.run_log + f"\nMode: {ans.mode}\n")
-
-        gen_dir = ensure_dir(out_dir / "generated_configs")
-        (gen_dir / "k8s_baseline.yaml").write_text(_k8s_baseline_manifest(), encoding="utf-8")
-        (gen_dir / "openstack_controller_standard.md").write_text(
-            _openstack_controller_standard(), encoding="utf-8"
-        )
-
-        meta = {"terraform_mode": tf.mode, "ansible_mode": ans.mode, "run_id": self._run_id}
-        (out_dir / "automation_metadata.json").write_text(
-            json.dumps(meta, indent=2), encoding="utf-8"
-        )
-
-        self._log.info(
-            "automation_complete",
-            extra={
-                "run_id": self._run_id,
-                "out_dir": str(out_dir),
+            out_dir = self._settings.artifacts_dir / "automation"
+            gen_dir = out_dir / "generated_configs"
+            meta = {
                 "terraform_mode": tf.mode,
                 "ansible_mode": ans.mode,
-            },
-        )
+                "run_id": self._run_id,
+                "timings": timings,
+            }
+            with ArtifactWriter.from_settings(self._settings) as out:
+                out.write_text(
+                    out_dir / "terraform_plan.txt", tf.plan_text + f"\nMode: {tf.mode}\n"
+                )
+                out.write_json(out_dir / "terraform_outputs.json", tf.outputs)
+                out.write_text(out_dir / "ansible_run.log", ans.run_log + f"\nMode: {ans.mode}\n")
+                out.write_text(gen_dir / "k8s_baseline.yaml", _k8s_baseline_manifest())
+                out.write_text(
+                    gen_dir / "openstack_controller_standard.md", _openstack_controller_standard()
+                )
+                out.write_json(out_dir / "automation_metadata.json", meta)
+
+            self._log.info(
+                "automation_complete",
+                extra={
+                    "run_id": self._run_id,
+                    "out_dir": str(out_dir),
+                    "terraform_mode": tf.mode,
+                    "ansible_mode": ans.mode,
+                    **timings,
+                },
+            )
 
 
 def _k8s_baseline_manifest() -> str:
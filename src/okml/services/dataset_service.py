@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from okml.config import Settings
+from okml.domain.models import LegacyEnvironment
+from okml.services.assessment_service import load_environment
+from okml.services.fleet_service import discover_inputs, iter_ndjson_records
+from okml.storage.fleet_dataset import FleetDatasetWriter
+from okml.utils.fs import ensure_dir
+from okml.utils.logging import get_logger
+
+
+@dataclass(frozen=True)
+class DatasetSummary:
+    rows: int
+    rejected: int
+    path: Path
+
+
+class DatasetService:
+    """Validate an inventory once and store it as a columnar fleet dataset."""
+
+    def __init__(self, *, settings: Settings, run_id: str) -> None:
+        self._settings = settings
+        self._run_id = run_id
+        self._log = get_logger(__name__)
+
+    def build(
+        self,
+        *,
+        output: Path,
+        input_path: Path | None = None,
+        input_dir: Path | None = None,
+        pattern: str = "*",
+    ) -> DatasetSummary:
+        if input_dir is not None:
+            records = self._from_dir(input_dir, pattern)
+        elif input_path is not None:
+            records = self._from_ndjson(input_path)
+        else:
+            raise ValueError("DatasetService.build needs input_path or input_dir.")
+
+        ensure_dir(output)
+        rows = rejected = 0
+        with (
+            FleetDatasetWriter(output) as writer,
+            (output / "rejects.ndjson").open("w", encoding="utf-8") as rejects,
+        ):
+            for source, env, error in records:
+                if env is None:
+                    rejected += 1
+                    rejects.write(json.dumps({"source": source, "error": error}) + "\n")
+                    continue
+                writer.append(env)
+                rows += 1
+
+        self._log.info(
+            "dataset_build_complete",
+            extra={"run_id": self._run_id, "out_dir": str(output), "rows": rows},
+        )
+        return DatasetSummary(rows=rows, rejected=rejected, path=output)
+
+    def _from_dir(
+        self, input_dir: Path, pattern: str
+    ) -> Iterator[tuple[str, LegacyEnvironment | None, str | None]]:
+        for p in discover_inputs(input_dir, pattern):
+            try:
+                yield str(p), load_environment(p), None
+            except Exception as e:
+                yield str(p), None, f"{type(e).__name__}: {e}"
+
+    def _from_ndjson(
+        self, input_path: Path
+    ) -> Iterator[tuple[str, LegacyEnvironment | None, str | None]]:
+        for lineno, line in iter_ndjson_records(input_path):
+            source = f"{input_path}:{lineno}"
+            try:
+                yield source, LegacyEnvironment.model_validate_json(line), None
+            except Exception as e:
+                yield source, None, f"{type(e).__name__}: {e}"
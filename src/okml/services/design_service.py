@@ -3,9 +3,10 @@ from __future__ import annotations
 from pathlib import Path
 
 from okml.config import Settings
-from okml.reporting.writers import render_architecture_mermaid, render_target_state_md, write_text
-from okml.utils.fs import ensure_dir
+from okml.reporting.artifact_writer import ArtifactWriter
+from okml.reporting.writers import render_architecture_mermaid, render_target_state_md
 from okml.utils.logging import get_logger
+from okml.utils.tracing import span
 
 
 class DesignService:
@@ -15,16 +16,17 @@ class DesignService:
         self._log = get_logger(__name__)
 
     def run(self) -> None:
-        out_dir = ensure_dir(self._settings.artifacts_dir / "design")
-        write_text(out_dir / "target_state.md", render_target_state_md())
-        write_text(out_dir / "architecture.mmd", render_architecture_mermaid())
+        with span("design"), ArtifactWriter.from_settings(self._settings) as out:
+            out_dir = self._settings.artifacts_dir / "design"
+            out.write_text(out_dir / "target_state.md", render_target_state_md())
+            out.write_text(out_dir / "architecture.mmd", render_architecture_mermaid())
+            self._write_adrs(out_dir / "adr", out)
 
-        adr_dir = ensure_dir(out_dir / "adr")
-        self._write_adrs(adr_dir)
+            self._log.info(
+                "design_complete", extra={"run_id": self._run_id, "out_dir": str(out_dir)}
+            )
 
-        self._log.info("design_complete", extra={"run_id": self._run_id, "out_dir": str(out_dir)})
-
-    def _write_adrs(self, adr_dir: Path) -> None:
+    def _write_adrs(self, adr_dir: Path, out: ArtifactWriter) -> None:
         adrs = {
             "ADR-0001-control-plane-ha.md": (
                 "# ADR-0001: Standardize OpenStack Control Plane HA\n\n"
@@ -65,4 +67,4 @@ class DesignService:
             ),
         }
         for name, body in adrs.items():
-            write_text(adr_dir / name, body)
+            out.write_text(adr_dir / name, body)
@@ -1,32 +1,48 @@
 from __future__ import annotations
 
+import json
+
 from okml.config import Settings
-from okml.utils.fs import ensure_dir
+from okml.reporting.artifact_writer import ArtifactWriter
+from okml.services.artifact_bus import KPIS, ArtifactBus
 from okml.utils.logging import get_logger
+from okml.utils.tracing import span
 
 
 class ExecutiveService:
-    def __init__(self, *, settings: Settings, run_id: str) -> None:
+    def __init__(self, *, settings: Settings, run_id: str, bus: ArtifactBus | None = None) -> None:
         self._settings = settings
         self._run_id = run_id
+        self._bus = bus
         self._log = get_logger(__name__)
 
     def run(self) -> None:
+        with span("executive"):
+            kpis = self._load_kpis_json()
+
+            out_dir = self._settings.artifacts_dir / "executive"
+            with ArtifactWriter.from_settings(self._settings) as out:
+                out.write_text(
+                    out_dir / "executive_summary.md", self._render_exec_md(kpis_json=kpis)
+                )
+
+            self._log.info(
+                "executive_summary_complete",
+                extra={"run_id": self._run_id, "out_dir": str(out_dir)},
+            )
+
+    def _load_kpis_json(self) -> str:
+        kpis = self._bus.get(KPIS) if self._bus is not None else None
+        if kpis is not None:
+            # Same encoding as write_json, so the embedded evidence matches kpis.json.
+            return json.dumps(kpis, indent=2, ensure_ascii=False)
+
         kpi_path = self._settings.artifacts_dir / "kpis" / "kpis.json"
         if not kpi_path.exists():
             raise FileNotFoundError(
                 f"Missing KPI JSON at {kpi_path}. Run: okml kpis (or okml demo)."
             )
-        kpis = kpi_path.read_text(encoding="utf-8")
-
-        out_dir = ensure_dir(self._settings.artifacts_dir / "executive")
-        (out_dir / "executive_summary.md").write_text(
-            self._render_exec_md(kpis_json=kpis), encoding="utf-8"
-        )
-
-        self._log.info(
-            "executive_summary_complete", extra={"run_id": self._run_id, "out_dir": str(out_dir)}
-        )
+        return kpi_path.read_text(encoding="utf-8")
 
     def _render_exec_md(self, *, kpis_json: str) -> str:
         return (
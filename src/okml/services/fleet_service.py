@@ -0,0 +1,577 @@
+from __future__ import annotations
+
+import heapq
+import json
+import os
+import re
+import tempfile
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import lru_cache, partial
+from itertools import chain, count, islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from okml.config import Settings
+from okml.domain.kpis import generate_kpis
+from okml.domain.models import AssessmentScores, LegacyEnvironment
+from okml.reporting.artifact_writer import ArtifactWriter
+from okml.reporting.fleet_dashboard import FleetDashboardWriter
+from okml.reporting.risk_register import FleetRiskRegisterWriter
+from okml.reporting.writers import write_json
+from okml.services.assessment_service import (
+    assess_environment,
+    load_environment,
+    write_assessment_artifacts,
+)
+from okml.storage.bundle import BundleWriter, MemorySink, active_bundle
+from okml.storage.manifest import AssessmentManifest, file_digest, rules_version
+from okml.utils.fs import ensure_dir
+from okml.utils.logging import get_logger
+from okml.utils.tracing import Tracer, active_tracer, current_span, span, tracing
+
+if TYPE_CHECKING:
+    from okml.storage.fleet_dataset import FleetDataset
+
+SUPPORTED_SUFFIXES = frozenset({".yaml", ".yml", ".json"})
+NDJSON_SUFFIXES = frozenset({".ndjson", ".jsonl"})
+
+# Jobs are shipped to workers in batches; this many batches per worker stay in flight.
+BATCH_SIZE = 64
+DATASET_SLICE = 1024
+WINDOW_PER_WORKER = 4
+
+
+@dataclass(frozen=True)
+class FleetJob:
+    source: str
+    path: str
+    record: str | None = None  # one NDJSON line; None means "load the file at path"
+
+
+@dataclass(frozen=True)
+class FleetResult:
+    source: str
+    env: str | None = None
+    region: str | None = None
+    out_dir: str | None = None
+    scores: dict[str, float] = field(default_factory=dict)
+    recommendations: list[str] = field(default_factory=list)
+    findings: int = 0
+    kpis: dict[str, dict[str, float]] = field(default_factory=dict)
+    error: str | None = None
+    record: str | None = None
+    spans: list[dict[str, Any]] = field(default_factory=list)  # worker spans, when traced
+    artifacts: list[tuple[str, bytes]] = field(default_factory=list)  # (name, data), bundling
+
+    def index_entry(self) -> dict[str, object]:
+        return {
+            "source": self.source,
+            "env": self.env,
+            "region": self.region,
+            "out_dir": self.out_dir,
+            "scores": self.scores,
+            "recommendations": self.recommendations,
+            "findings": self.findings,
+            "kpis": self.kpis,
+        }
+
+    def reject_entry(self) -> dict[str, object]:
+        entry: dict[str, object] = {"source": self.source, "error": self.error}
+        if self.record is not None:
+            entry["record"] = self.record
+        return entry
+
+
+@dataclass(frozen=True)
+class FleetSummary:
+    total: int
+    succeeded: int
+    failed: int
+    index_path: Path
+    rejects_path: Path
+    skipped: int = 0  # unchanged inputs whose previous results were reused
+    dashboard_path: Path | None = None
+    risk_register_path: Path | None = None
+
+
+class FleetAssessmentService:
+    """Assess many legacy environments in one process, fanned out over a worker pool.
+
+    Jobs are streamed through a bounded window of worker batches and results are
+    appended to ``fleet/index.ndjson`` as they complete, so memory stays flat
+    regardless of fleet size. Inputs that fail to load or validate are written to
+    ``fleet/rejects.ndjson`` and do not abort the run.
+    """
+
+    def __init__(self, *, settings: Settings, run_id: str) -> None:
+        self._settings = settings
+        self._run_id = run_id
+        self._log = get_logger(__name__)
+
+    def run(
+        self,
+        *,
+        input_dir: Path,
+        pattern: str = "*",
+        workers: int | None = None,
+        incremental: bool = True,
+    ) -> FleetSummary:
+        """Assess every matching file, re-scoring only inputs that changed since the last run.
+
+        ``fleet/manifest.json`` records each input's content hash and the rules
+        version; unchanged inputs reuse their previous index entry and artifacts.
+        ``incremental=False`` rescores everything (and refreshes the manifest).
+        """
+        sources = discover_inputs(input_dir, pattern)
+        if not sources:
+            raise FileNotFoundError(f"No YAML/JSON inputs matching {pattern!r} under {input_dir}.")
+
+        # A bundle starts empty, so there is nothing from a previous run to reuse.
+        bundled = active_bundle() is not None
+        manifest_path = self._settings.artifacts_dir / "fleet" / "manifest.json"
+        rules = rules_version(seed=self._settings.seed)
+        previous = (
+            AssessmentManifest.load(manifest_path, rules=rules)
+            if incremental and not bundled
+            else AssessmentManifest(rules=rules)
+        )
+        manifest = AssessmentManifest(rules=rules)
+        digests: dict[str, str] = {}
+        unchanged: list[FleetResult] = []
+        changed: list[Path] = []
+        for p in sources:
+            digest = digests[str(p)] = file_digest(p)
+            entry = previous.lookup(str(p), digest)
+            if entry is not None and _artifacts_present(entry):
+                manifest.record(str(p), digest, entry)
+                unchanged.append(FleetResult(**entry))
+            else:
+                changed.append(p)
+
+        def record(results: Iterable[FleetResult]) -> Iterator[FleetResult]:
+            for res in results:
+                if res.error is None:
+                    manifest.record(res.source, digests[res.source], res.index_entry())
+                yield res
+
+        jobs = (FleetJob(source=str(p), path=str(p)) for p in changed)
+        n_workers = max(1, min(workers or os.cpu_count() or 1, len(changed)))
+        meta: dict[str, object] = {"input_dir": str(input_dir), "pattern": pattern}
+        position = {str(p): i for i, p in enumerate(sources)}
+        summary = self._run_jobs(
+            jobs,
+            workers=n_workers,
+            meta=meta,
+            unchanged=unchanged,
+            on_results=record,
+            order=lambda res: position[res.source],
+        )
+        if not bundled:
+            ensure_dir(manifest_path.parent)
+            manifest.save(manifest_path)
+        return summary
+
+    def run_ndjson(self, *, input_path: Path, workers: int | None = None) -> FleetSummary:
+        jobs = (
+            FleetJob(source=f"{input_path}:{lineno}", path=str(input_path), record=line)
+            for lineno, line in iter_ndjson_records(input_path)
+        )
+        n_workers = max(1, workers or os.cpu_count() or 1)
+        return self._run_jobs(jobs, workers=n_workers, meta={"input": str(input_path)})
+
+    def run_dataset(self, *, dataset_path: Path, workers: int | None = None) -> FleetSummary:
+        """Assess a columnar dataset: batch scoring, no re-parsing or re-validation."""
+        with span("fleet", dataset=str(dataset_path)):
+            from okml.storage.fleet_dataset import FleetDataset  # NumPy: dataset runs only
+
+            rows = len(FleetDataset(dataset_path))
+            n_slices = -(-rows // DATASET_SLICE)
+            n_workers = max(1, min(workers or os.cpu_count() or 1, n_slices or 1))
+            with tempfile.TemporaryDirectory(prefix="okml-claims-") as claims:
+                ctx = self._worker_context(Path(claims))
+                slices = (
+                    (str(dataset_path), start, min(start + DATASET_SLICE, rows), ctx)
+                    for start in range(0, rows, DATASET_SLICE)
+                )
+                results = _map_batches(_assess_dataset_slice, slices, workers=n_workers)
+                meta: dict[str, object] = {"dataset": str(dataset_path)}
+                return self._collect(results, workers=n_workers, meta=meta)
+
+    def _run_jobs(
+        self,
+        jobs: Iterable[FleetJob],
+        *,
+        workers: int,
+        meta: dict[str, object],
+        unchanged: list[FleetResult] | None = None,
+        on_results: Callable[[Iterable[FleetResult]], Iterator[FleetResult]] | None = None,
+        order: Callable[[FleetResult], int] | None = None,
+    ) -> FleetSummary:
+        """Assess ``jobs`` and index their results along with the ``unchanged`` ones.
+
+        Both arrive in input order; ``order`` gives a result's input position so the two
+        are interleaved back into it, and an incremental run indexes (and numbers risks)
+        exactly like a full one.
+        """
+        skipped = unchanged or []
+        with (
+            span("fleet", workers=workers, **meta),
+            tempfile.TemporaryDirectory(prefix="okml-claims-") as claims,
+        ):
+            # Reused results keep their directories: claim them before any worker runs.
+            for res in skipped:
+                if res.out_dir is not None:
+                    (Path(claims) / Path(res.out_dir).name).touch()
+            ctx = self._worker_context(Path(claims))
+            batches = ((batch, ctx) for batch in _batched(jobs, BATCH_SIZE))
+            results: Iterable[FleetResult] = _map_batches(_assess_batch, batches, workers=workers)
+            if on_results is not None:
+                results = on_results(results)
+            if skipped:
+                results = (
+                    heapq.merge(skipped, results, key=order)
+                    if order is not None
+                    else chain(skipped, results)
+                )
+            return self._collect(results, workers=workers, meta=meta, skipped=len(skipped))
+
+    def _worker_context(self, claims_dir: Path) -> _WorkerContext:
+        fleet_dir = self._settings.artifacts_dir / "fleet"
+        bundled = active_bundle() is not None
+        if not bundled:
+            ensure_dir(fleet_dir)
+        parent = current_span() if active_tracer() is not None else None
+        trace = (parent.trace_id, parent.span_id) if parent is not None else None
+        return _WorkerContext(
+            fleet_dir=str(fleet_dir),
+            claims_dir=str(claims_dir),
+            seed=self._settings.seed,
+            trace=trace,
+            fsync=self._settings.artifact_fsync,
+            write_workers=self._settings.artifact_write_workers,
+            bundle_root=str(self._settings.artifacts_dir) if bundled else None,
+        )
+
+    def _collect(
+        self,
+        results: Iterable[FleetResult],
+        *,
+        workers: int,
+        meta: dict[str, object],
+        skipped: int = 0,
+    ) -> FleetSummary:
+        fleet_dir = self._settings.artifacts_dir / "fleet"
+        bundle = active_bundle()
+        if bundle is None:
+            summary = self._write_fleet_files(
+                ensure_dir(fleet_dir), results, workers=workers, meta=meta, skipped=skipped
+            )
+        else:
+            # The streamed fleet files are staged outside the artifacts dir and added whole.
+            with tempfile.TemporaryDirectory(prefix="okml-fleet-") as tmp:
+                staged = self._write_fleet_files(
+                    Path(tmp), results, workers=workers, meta=meta, skipped=skipped, bundle=bundle
+                )
+                for p in sorted(Path(tmp).iterdir()):
+                    bundle.add_file(f"fleet/{p.name}", p)
+            summary = replace(
+                staged,
+                index_path=fleet_dir / staged.index_path.name,
+                rejects_path=fleet_dir / staged.rejects_path.name,
+                dashboard_path=fleet_dir / "dashboard.html",
+                risk_register_path=fleet_dir / "risk_register.csv",
+            )
+        self._log.info(
+            "fleet_assessment_complete",
+            extra={
+                "run_id": self._run_id,
+                "out_dir": str(fleet_dir),
+                "bundle": str(bundle.path) if bundle is not None else None,
+                "total": summary.total,
+                "failed": summary.failed,
+                "skipped": summary.skipped,
+                "workers": workers,
+            },
+        )
+        return summary
+
+    def _write_fleet_files(
+        self,
+        fleet_dir: Path,
+        results: Iterable[FleetResult],
+        *,
+        workers: int,
+        meta: dict[str, object],
+        skipped: int,
+        bundle: BundleWriter | None = None,
+    ) -> FleetSummary:
+        index_path = fleet_dir / "index.ndjson"
+        rejects_path = fleet_dir / "rejects.ndjson"
+        dashboard_path = fleet_dir / "dashboard.html"
+        register_path = fleet_dir / "risk_register.csv"
+
+        total = failed = 0
+        # Staged files are only bundled once complete, so they need no fsync.
+        fsync = self._settings.artifact_fsync and bundle is None
+        with (
+            ArtifactWriter(fsync=fsync) as out,
+            out.open_text(index_path) as index,
+            out.open_text(rejects_path) as rejects,
+            FleetDashboardWriter(dashboard_path, out=out) as dashboard,
+            FleetRiskRegisterWriter(register_path, out=out) as register,
+        ):
+            tracer = active_tracer()
+            for res in results:
+                total += 1
+                if res.spans and tracer is not None:
+                    tracer.extend(res.spans)
+                if bundle is not None:
+                    for name, data in res.artifacts:
+                        bundle.add(name, data)
+                if res.error is None:
+                    if res.out_dir is not None and Path(res.out_dir).name != env_slug(
+                        res.env or ""
+                    ):
+                        self._log.warning(
+                            "fleet_env_duplicate_name",
+                            extra={
+                                "run_id": self._run_id,
+                                "source": res.source,
+                                "env": res.env,
+                                "out_dir": res.out_dir,
+                            },
+                        )
+                    entry = res.index_entry()
+                    index.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                    dashboard.add(entry)
+                    register.add(entry)
+                    continue
+                failed += 1
+                rejects.write(json.dumps(res.reject_entry(), ensure_ascii=False) + "\n")
+                self._log.info(
+                    "fleet_env_rejected",
+                    extra={"run_id": self._run_id, "source": res.source, "error": res.error},
+                )
+
+        summary = FleetSummary(
+            total=total,
+            succeeded=total - failed,
+            failed=failed,
+            skipped=skipped,
+            index_path=index_path,
+            rejects_path=rejects_path,
+            dashboard_path=dashboard_path,
+            risk_register_path=register_path,
+        )
+        write_json(
+            fleet_dir / "summary.json",
+            {
+                "run_id": self._run_id,
+                **meta,
+                "workers": workers,
+                "total": summary.total,
+                "succeeded": summary.succeeded,
+                "failed": summary.failed,
+                "skipped_unchanged": summary.skipped,
+                "index": index_path.name,
+                "rejects": rejects_path.name,
+                "dashboard": dashboard_path.name,
+                "risk_register": register_path.name,
+            },
+        )
+        return summary
+
+
+def _artifacts_present(entry: dict[str, Any]) -> bool:
+    out_dir = entry.get("out_dir")
+    return (
+        out_dir is not None and (Path(out_dir) / "assessment" / "assessment_report.json").exists()
+    )
+
+
+def discover_inputs(input_dir: Path, pattern: str = "*") -> list[Path]:
+    return sorted(
+        p for p in input_dir.glob(pattern) if p.is_file() and p.suffix.lower() in SUPPORTED_SUFFIXES
+    )
+
+
+def iter_ndjson_records(path: Path) -> Iterator[tuple[int, str]]:
+    """Yield ``(line_number, line)`` for every non-blank line, reading lazily."""
+    with path.open(encoding="utf-8") as f:
+        for lineno, line in enumerate(f, start=1):
+            line = line.strip()
+            if line:
+                yield lineno, line
+
+
+def env_slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "-", name).strip("-.") or "env"
+
+
+def bounded_map(
+    fn: Callable[[Any], list[FleetResult]],
+    items: Iterable[Any],
+    *,
+    pool: ProcessPoolExecutor,
+    window: int,
+) -> Iterator[list[FleetResult]]:
+    """Like ``pool.map`` but consumes ``items`` lazily, keeping at most ``window`` tasks queued."""
+    pending: deque[Future[list[FleetResult]]] = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+@dataclass(frozen=True)
+class _WorkerContext:
+    fleet_dir: str
+    claims_dir: str  # one empty file per artifact directory taken this run, across workers
+    seed: int
+    trace: tuple[str, str] | None = None  # (trace_id, parent span_id) to hang worker spans off
+    fsync: bool = False
+    write_workers: int = 0
+    # Set when the run writes a bundle: workers capture their artifacts into the result
+    # (named relative to this root) and the parent adds them to the bundle.
+    bundle_root: str | None = None
+
+    def artifact_writer(self) -> ArtifactWriter:
+        # One writer per batch: its directory cache and fsync batches span the batch, and
+        # everything it wrote is in place before the batch's results reach the index.
+        return ArtifactWriter(fsync=self.fsync, workers=self.write_workers)
+
+
+def _batched(items: Iterable[FleetJob], size: int) -> Iterator[list[FleetJob]]:
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _map_batches(
+    fn: Callable[[Any], list[FleetResult]], args: Iterable[Any], *, workers: int
+) -> Iterator[FleetResult]:
+    if workers == 1:
+        for arg in args:
+            yield from fn(arg)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        window = workers * WINDOW_PER_WORKER
+        for results in bounded_map(fn, args, pool=pool, window=window):
+            yield from results
+
+
+def _assess_batch(arg: tuple[list[FleetJob], _WorkerContext]) -> list[FleetResult]:
+    jobs, ctx = arg
+    with ctx.artifact_writer() as out:
+        return _traced(ctx, ((job.source, partial(_assess_job, job, ctx, out)) for job in jobs))
+
+
+def _assess_job(job: FleetJob, ctx: _WorkerContext, out: ArtifactWriter) -> FleetResult:
+    try:
+        if job.record is None:
+            env = load_environment(Path(job.path))
+        else:
+            env = LegacyEnvironment.model_validate_json(job.record)
+    except Exception as e:
+        return FleetResult(source=job.source, error=f"{type(e).__name__}: {e}", record=job.record)
+    return _assess_env(job.source, env, ctx, out)
+
+
+def _assess_dataset_slice(arg: tuple[str, int, int, _WorkerContext]) -> list[FleetResult]:
+    from okml.domain.batch_scoring import score_batch
+
+    path, start, stop, ctx = arg
+    ds = _open_dataset(path)
+    scores = score_batch(ds.scoring_columns(start, stop))
+    with ctx.artifact_writer() as out:
+        calls = (
+            (source, partial(_assess_env, source, env, ctx, out, scores.at(k)))
+            for k, env in enumerate(ds.iter_environments(start, stop))
+            for source in [f"{path}#{start + k}"]
+        )
+        return _traced(ctx, calls)
+
+
+def _traced(
+    ctx: _WorkerContext, calls: Iterable[tuple[str, Callable[[], FleetResult]]]
+) -> list[FleetResult]:
+    """Run per-environment calls; when the run is traced, attach each one's spans to its result.
+
+    Workers are separate processes, so they collect into a local tracer that shares the
+    parent's trace id and ship the finished spans back inside ``FleetResult.spans``.
+    """
+    if ctx.trace is None:
+        return [call() for _, call in calls]
+    trace_id, parent_id = ctx.trace
+    tracer = Tracer(trace_id=trace_id, parent_id=parent_id)
+    results = []
+    with tracing(tracer):
+        for source, call in calls:
+            with span("fleet.env", source=source) as sp:
+                res = call()
+                if sp is not None:
+                    sp.set_attribute("env", res.env or "")
+                    sp.error = res.error
+            results.append(replace(res, spans=tracer.drain()))
+    return results
+
+
+def _claim_out_dir(ctx: _WorkerContext, name: str) -> Path:
+    """``fleet/<slug>``, or ``<slug>-2``, ``-3``... when another input already has that name.
+
+    Claims are exclusive file creations, so they hold across worker processes.
+    """
+    slug = env_slug(name)
+    for n in count(1):
+        candidate = slug if n == 1 else f"{slug}-{n}"
+        try:
+            (Path(ctx.claims_dir) / candidate).touch(exist_ok=False)
+        except FileExistsError:
+            continue
+        return Path(ctx.fleet_dir) / candidate
+    raise AssertionError("unreachable")
+
+
+@lru_cache(maxsize=4)
+def _open_dataset(path: str) -> FleetDataset:
+    from okml.storage.fleet_dataset import FleetDataset
+
+    return FleetDataset(Path(path))
+
+
+def _assess_env(
+    source: str,
+    env: LegacyEnvironment,
+    ctx: _WorkerContext,
+    out: ArtifactWriter,
+    scores: AssessmentScores | None = None,
+) -> FleetResult:
+    try:
+        report = assess_environment(env, scores)
+        kpis = generate_kpis(
+            scores=report.scores, recommendations=report.recommendations, seed=ctx.seed
+        )
+        out_dir = _claim_out_dir(ctx, env.name)
+        captured = None
+        if ctx.bundle_root is not None:
+            captured = MemorySink()
+            out = ArtifactWriter(sink=captured, root=Path(ctx.bundle_root))
+        write_assessment_artifacts(out_dir / "assessment", report, out)
+    except Exception as e:
+        return FleetResult(source=source, error=f"{type(e).__name__}: {e}")
+    return FleetResult(
+        source=source,
+        env=env.name,
+        region=env.region,
+        out_dir=str(out_dir),
+        scores=report.scores.model_dump(),
+        recommendations=[r.id for r in report.recommendations],
+        findings=len(report.findings),
+        kpis=kpis,
+        artifacts=captured.items if captured is not None else [],
+    )
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import contextvars
+import heapq
+import itertools
+import random
+import re
+import subprocess
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any
+
+from okml.utils.logging import get_logger
+from okml.utils.tracing import span
+
+# Failures worth another attempt: provider registries, state backends and APIs that were
+# briefly unreachable, throttled or locked. Anything else (a bad config, a failed
+# validation) fails the same way again and is reported at once.
+TRANSIENT_ERRORS = re.compile(
+    r"timed? ?out|connection (?:reset|refused)|temporar|too many requests|rate.?limit"
+    r"|\b(?:429|502|503|504)\b|error acquiring the state lock|tls handshake",
+    re.IGNORECASE,
+)
+
+
+def is_transient(exc: BaseException) -> bool:
+    if isinstance(exc, subprocess.TimeoutExpired | TimeoutError | ConnectionError):
+        return True
+    return isinstance(exc, RuntimeError) and TRANSIENT_ERRORS.search(str(exc)) is not None
+
+
+@dataclass(frozen=True)
+class Attempt:
+    """What a job is told when it runs: its worker slot, attempt number and time budget."""
+
+    slot: int  # 0 .. concurrency-1; no two running jobs share one
+    number: int  # 1 for the first attempt
+    timeout_s: float | None
+
+
+@dataclass(frozen=True)
+class Job:
+    name: str
+    run: Callable[[Attempt], Any]
+    priority: tuple[Any, ...] = ()  # lower runs first; ties run in submission order
+
+
+@dataclass(frozen=True)
+class JobOutcome:
+    name: str
+    ok: bool
+    attempts: int
+    elapsed_s: float  # first start to final result, backoff included
+    result: Any = None
+    error: str | None = None
+
+
+class JobScheduler:
+    """Runs jobs on at most ``concurrency`` threads, most urgent first, retrying transient errors.
+
+    Jobs are expected to spend their time waiting on subprocesses (terraform, ansible), so
+    threads are enough. Every attempt gets ``timeout_s`` to enforce itself, as the runners do
+    by killing their subprocess. A failed attempt that ``transient`` accepts is retried up to
+    ``retries`` times after an exponential, jittered backoff (``backoff_s`` doubling up to
+    ``max_backoff_s``); a job waiting out its backoff does not hold a slot.
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int,
+        timeout_s: float | None = None,
+        retries: int = 2,
+        backoff_s: float = 1.0,
+        max_backoff_s: float = 30.0,
+        transient: Callable[[BaseException], bool] = is_transient,
+        seed: int = 0,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+        self._concurrency = concurrency
+        self._timeout_s = timeout_s
+        self._retries = retries
+        self._backoff_s = backoff_s
+        self._max_backoff_s = max_backoff_s
+        self._transient = transient
+        self._rng = random.Random(seed)
+        self._log = get_logger(__name__)
+
+    def backoff(self, failures: int) -> float:
+        """Seconds to wait after the ``failures``-th failed attempt (half fixed, half jitter)."""
+        delay = min(self._max_backoff_s, self._backoff_s * 2.0 ** (failures - 1))
+        return delay / 2 + self._rng.uniform(0, delay / 2)
+
+    def run(self, jobs: Iterable[Job]) -> Iterator[JobOutcome]:
+        """Yield one outcome per job, in completion order."""
+        seq = itertools.count()
+        # (priority, seq, job, attempt number, first start) ready to run, and the same
+        # behind their ready-at time while backing off.
+        ready: list[tuple[tuple[Any, ...], int, Job, int, float | None]] = [
+            (job.priority, next(seq), job, 1, None) for job in jobs
+        ]
+        heapq.heapify(ready)
+        delayed: list[tuple[float, tuple[Any, ...], int, Job, int, float | None]] = []
+        running: dict[Future[Any], tuple[Job, int, int, float]] = {}  # job, attempt, slot, t0
+        free_slots = list(range(self._concurrency))
+        with ThreadPoolExecutor(self._concurrency, thread_name_prefix="okml-job") as pool:
+            while ready or delayed or running:
+                now = time.monotonic()
+                while delayed and delayed[0][0] <= now:
+                    _, priority, n, job, number, started = heapq.heappop(delayed)
+                    heapq.heappush(ready, (priority, n, job, number, started))
+                while ready and free_slots:
+                    _, _, job, number, started = heapq.heappop(ready)
+                    slot = free_slots.pop()
+                    attempt = Attempt(slot=slot, number=number, timeout_s=self._timeout_s)
+                    ctx = contextvars.copy_context()
+                    fut = pool.submit(ctx.run, _run_attempt, job, attempt)
+                    running[fut] = (job, number, slot, now if started is None else started)
+                if not running:
+                    time.sleep(max(0.0, delayed[0][0] - time.monotonic()))
+                    continue
+                wake = delayed[0][0] - time.monotonic() if delayed else None
+                done, _ = wait(running, timeout=wake, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    job, number, slot, started = running.pop(fut)
+                    free_slots.append(slot)
+                    elapsed = round(time.monotonic() - started, 4)
+                    exc = fut.exception()
+                    if exc is None:
+                        yield JobOutcome(job.name, True, number, elapsed, result=fut.result())
+                    elif number <= self._retries and self._transient(exc):
+                        delay = self.backoff(number)
+                        self._log.info(
+                            "job_retry",
+                            extra={
+                                "job": job.name,
+                                "attempt": number,
+                                "delay_s": round(delay, 3),
+                                "error": str(exc)[-500:],
+                            },
+                        )
+                        ready_at = time.monotonic() + delay
+                        heapq.heappush(
+                            delayed, (ready_at, job.priority, next(seq), job, number + 1, started)
+                        )
+                    else:
+                        error = f"{type(exc).__name__}: {exc}"
+                        yield JobOutcome(job.name, False, number, elapsed, error=error)
+
+
+def _run_attempt(job: Job, attempt: Attempt) -> Any:
+    with span("job.attempt", job=job.name, attempt=attempt.number, slot=attempt.slot):
+        return job.run(attempt)
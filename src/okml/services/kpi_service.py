@@ -1,61 +1,119 @@
 from __future__ import annotations
 
+from pathlib import Path
+from typing import Any
+
 from okml.config import Settings
-from okml.domain.kpis import generate_kpis
+from okml.domain.kpis import generate_kpis, simulate_kpis
 from okml.domain.models import AssessmentReport
+from okml.reporting.artifact_writer import ArtifactWriter
+from okml.reporting.svg_charts import provisioning_time_svg, uptime_trend_svg
 from okml.reporting.writers import (
     plot_provisioning_time_png,
     plot_uptime_trend_png,
+    png_img_tag,
     render_dashboard_html,
     render_kpis_md,
-    write_json,
-    write_text,
 )
-from okml.utils.fs import ensure_dir
+from okml.services.artifact_bus import ASSESSMENT_REPORT, KPIS, ArtifactBus
 from okml.utils.logging import get_logger
+from okml.utils.profiling import profile_step
+from okml.utils.tracing import span
 
 
 class KPIService:
-    def __init__(self, *, settings: Settings, run_id: str) -> None:
+    def __init__(self, *, settings: Settings, run_id: str, bus: ArtifactBus | None = None) -> None:
         self._settings = settings
         self._run_id = run_id
+        self._bus = bus
         self._log = get_logger(__name__)
 
-    def run(self) -> dict[str, dict[str, float]]:
-        assessment_path = self._settings.artifacts_dir / "assessment" / "assessment_report.json"
-        if not assessment_path.exists():
-            raise FileNotFoundError(
-                f"Missing assessment report JSON at {assessment_path}. "
-                "Run: okml assess (or okml demo)."
-            )
+    def run(self) -> dict[str, Any]:
+        with span("kpis", simulations=self._settings.simulations):
+            report = self._load_report()
+            with profile_step("generate_kpis"):
+                kpis: dict[str, Any] = generate_kpis(
+                    scores=report.scores,
+                    recommendations=report.recommendations,
+                    seed=self._settings.seed,
+                )
+            simulation = None
+            if self._settings.simulations > 0:
+                with profile_step("simulate_kpis"):
+                    simulation = simulate_kpis(
+                        scores=report.scores,
+                        recommendations=report.recommendations,
+                        seed=self._settings.seed,
+                        runs=self._settings.simulations,
+                    )
+                kpis["simulation"] = simulation
 
-        report = AssessmentReport.model_validate_json(assessment_path.read_text(encoding="utf-8"))
-        kpis = generate_kpis(
-            scores=report.scores, recommendations=report.recommendations, seed=self._settings.seed
-        )
+            out_dir = self._settings.artifacts_dir / "kpis"
+            with ArtifactWriter.from_settings(self._settings) as out:
+                out.write_json(out_dir / "kpis.json", kpis)
+                out.write_text(out_dir / "kpis.md", render_kpis_md(kpis, simulation=simulation))
+                if self._bus is not None:
+                    self._bus.publish(KPIS, kpis)
 
-        out_dir = ensure_dir(self._settings.artifacts_dir / "kpis")
-        write_json(out_dir / "kpis.json", kpis)
-        write_text(out_dir / "kpis.md", render_kpis_md(kpis))
+                with profile_step("render_charts", format=self._settings.chart_format):
+                    uptime_chart, provisioning_chart = self._render_charts(kpis, out_dir, out)
+                with profile_step("render_dashboard"):
+                    html = render_dashboard_html(
+                        kpis=kpis,
+                        uptime_chart=uptime_chart,
+                        provisioning_chart=provisioning_chart,
+                        simulation=simulation,
+                    )
+                    out.write_text(out_dir / "dashboard.html", html)
 
-        uptime_png = out_dir / "uptime_trend.png"
-        prov_png = out_dir / "provisioning_time.png"
-        plot_uptime_trend_png(
-            uptime_png,
-            before_uptime=kpis["before"]["uptime_monthly_percent"],
-            after_uptime=kpis["after"]["uptime_monthly_percent"],
-        )
-        plot_provisioning_time_png(
-            prov_png,
-            before_p50=kpis["before"]["provisioning_time_minutes_p50"],
-            after_p50=kpis["after"]["provisioning_time_minutes_p50"],
+            self._log.info("kpis_complete", extra={"run_id": self._run_id, "out_dir": str(out_dir)})
+            return kpis
+
+    def _render_charts(
+        self, kpis: dict[str, Any], out_dir: Path, out: ArtifactWriter
+    ) -> tuple[str, str]:
+        """Write both charts next to the dashboard and return their dashboard markup."""
+        before, after = kpis["before"], kpis["after"]
+        if self._settings.chart_format == "png":
+            uptime_png = plot_uptime_trend_png(
+                before_uptime=before["uptime_monthly_percent"],
+                after_uptime=after["uptime_monthly_percent"],
+            )
+            prov_png = plot_provisioning_time_png(
+                before_p50=before["provisioning_time_minutes_p50"],
+                after_p50=after["provisioning_time_minutes_p50"],
+            )
+            out.write_bytes(out_dir / "uptime_trend.png", uptime_png)
+            out.write_bytes(out_dir / "provisioning_time.png", prov_png)
+            return (
+                png_img_tag(uptime_png, "Uptime trend"),
+                png_img_tag(prov_png, "Provisioning time"),
+            )
+        if self._settings.chart_format != "svg":
+            raise ValueError(
+                f"Unknown chart format {self._settings.chart_format!r}; expected svg or png."
+            )
+        uptime_svg = uptime_trend_svg(
+            before_uptime=before["uptime_monthly_percent"],
+            after_uptime=after["uptime_monthly_percent"],
         )
-        render_dashboard_html(
-            path=out_dir / "dashboard.html",
-            kpis=kpis,
-            uptime_png=uptime_png,
-            provisioning_png=prov_png,
+        prov_svg = provisioning_time_svg(
+            before_p50=before["provisioning_time_minutes_p50"],
+            after_p50=after["provisioning_time_minutes_p50"],
         )
+        out.write_text(out_dir / "uptime_trend.svg", uptime_svg)
+        out.write_text(out_dir / "provisioning_time.svg", prov_svg)
+        return uptime_svg, prov_svg
 
-        self._log.info("kpis_complete", extra={"run_id": self._run_id, "out_dir": str(out_dir)})
-        return kpis
+    def _load_report(self) -> AssessmentReport:
+        report = self._bus.get(ASSESSMENT_REPORT) if self._bus is not None else None
+        if isinstance(report, AssessmentReport):
+            return report
+
+        assessment_path = self._settings.artifacts_dir / "assessment" / "assessment_report.json"
+        if not assessment_path.exists():
+            raise FileNotFoundError(
+                f"Missing assessment report JSON at {assessment_path}. "
+                "Run: okml assess (or okml demo)."
+            )
+        return AssessmentReport.model_validate_json(assessment_path.read_text(encoding="utf-8"))
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import contextvars
+import shutil
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from okml.config import Settings
+from okml.services.artifact_bus import ArtifactBus
+from okml.services.assessment_service import AssessmentService
+from okml.services.automation_service import AutomationService
+from okml.services.design_service import DesignService
+from okml.services.executive_service import ExecutiveService
+from okml.services.kpi_service import KPIService
+from okml.storage.build_cache import BuildCache, code_version, fingerprint
+from okml.utils.logging import get_logger
+from okml.utils.profiling import Profiler
+from okml.utils.tracing import span
+
+
+@dataclass(frozen=True)
+class Stage:
+    """A unit of pipeline work.
+
+    ``key`` (evaluated when the stage is due, after its upstream stages) fingerprints
+    everything the stage reads; with a ``BuildCache`` the stage is skipped when the
+    key and its ``outputs`` on disk match the previous run.
+    """
+
+    name: str
+    run: Callable[[], object]
+    after: tuple[str, ...] = ()
+    key: Callable[[], str] | None = None
+    outputs: tuple[Path, ...] = ()
+
+
+@dataclass(frozen=True)
+class StageTiming:
+    name: str
+    start_s: float  # offset from the start of the pipeline run
+    wall_s: float
+    cached: bool = False
+
+    @property
+    def end_s(self) -> float:
+        return self.start_s + self.wall_s
+
+
+@dataclass(frozen=True)
+class PipelineResult:
+    timings: dict[str, StageTiming]
+    critical_path: list[str]
+    wall_s: float
+
+    @property
+    def critical_path_s(self) -> float:
+        return sum(self.timings[name].wall_s for name in self.critical_path)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "wall_s": round(self.wall_s, 4),
+            "stages": {
+                t.name: {
+                    "start_s": round(t.start_s, 4),
+                    "wall_s": round(t.wall_s, 4),
+                    "cached": t.cached,
+                }
+                for t in self.timings.values()
+            },
+            "critical_path": self.critical_path,
+            "critical_path_s": round(self.critical_path_s, 4),
+        }
+
+
+class StagePipeline:
+    """Run stages on a thread pool as soon as the stages they declare ``after`` finish.
+
+    Stages are I/O- and subprocess-bound, so threads are enough to overlap them.
+    The first stage failure stops new stages from being scheduled; stages already
+    running are allowed to finish and the error is re-raised.
+    """
+
+    def __init__(
+        self,
+        stages: list[Stage],
+        *,
+        run_id: str,
+        max_workers: int | None = None,
+        cache: BuildCache | None = None,
+        profiler: Profiler | None = None,
+    ) -> None:
+        self._run_id = run_id
+        self._cache = cache
+        self._profiler = profiler
+        self._stages = {s.name: s for s in stages}
+        if len(self._stages) != len(stages):
+            raise ValueError("Pipeline stage names must be unique.")
+        for s in stages:
+            missing = [d for d in s.after if d not in self._stages]
+            if missing:
+                raise ValueError(f"Stage {s.name!r} depends on unknown stage(s): {missing}")
+        self._order = _topological_order(self._stages)
+        self._max_workers = max_workers or len(stages) or 1
+        if profiler is not None and profiler.exclusive:
+            self._max_workers = 1
+        self._log = get_logger(__name__)
+
+    def run(self) -> PipelineResult:
+        t0 = time.perf_counter()
+        timings: dict[str, StageTiming] = {}
+        remaining = dict(self._stages)
+        running: dict[Future[tuple[float, float, bool]], str] = {}
+        error: BaseException | None = None
+
+        def timed(stage: Stage) -> tuple[float, float, bool]:
+            start = time.perf_counter()
+            with span(f"stage:{stage.name}", stage=stage.name) as sp:
+                if self._profiler is None:
+                    cached = self._run_stage(stage)
+                else:
+                    with self._profiler.stage(stage.name):
+                        cached = self._run_stage(stage)
+                if sp is not None:
+                    sp.set_attribute("cached", cached)
+            return start - t0, time.perf_counter() - start, cached
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            while remaining or running:
+                if error is None:
+                    for name in [n for n, s in remaining.items() if set(s.after) <= timings.keys()]:
+                        # Copy the caller's context so stage spans nest under the current one.
+                        ctx = contextvars.copy_context()
+                        running[pool.submit(ctx.run, timed, remaining.pop(name))] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = running.pop(fut)
+                    exc = fut.exception()
+                    if exc is not None:
+                        error = error or exc
+                        continue
+                    start, wall, cached = fut.result()
+                    timings[name] = StageTiming(
+                        name=name, start_s=start, wall_s=wall, cached=cached
+                    )
+                    self._log.info(
+                        "stage_complete",
+                        extra={
+                            "run_id": self._run_id,
+                            "stage": name,
+                            "wall_s": round(wall, 4),
+                            "cached": cached,
+                        },
+                    )
+        if self._cache is not None:
+            self._cache.save()
+        if error is not None:
+            raise error
+
+        return PipelineResult(
+            timings={n: timings[n] for n in self._order},
+            critical_path=self._critical_path(timings),
+            wall_s=time.perf_counter() - t0,
+        )
+
+    def _run_stage(self, stage: Stage) -> bool:
+        """Run ``stage`` unless the build cache says it is fresh; return True if skipped."""
+        if self._cache is None or stage.key is None:
+            stage.run()
+            return False
+        key = stage.key()
+        if self._cache.is_fresh(stage.name, key, stage.outputs):
+            return True
+        stage.run()
+        self._cache.record(stage.name, key, stage.outputs)
+        return False
+
+    def _critical_path(self, timings: dict[str, StageTiming]) -> list[str]:
+        """Longest chain of dependent stages, by wall time."""
+        finish: dict[str, float] = {}
+        via: dict[str, str | None] = {}
+        for name in self._order:
+            deps = self._stages[name].after
+            prev = max(deps, key=lambda d: finish[d]) if deps else None
+            finish[name] = timings[name].wall_s + (finish[prev] if prev else 0.0)
+            via[name] = prev
+        path: list[str] = []
+        cur: str | None = max(self._order, key=lambda n: finish[n]) if self._order else None
+        while cur is not None:
+            path.append(cur)
+            cur = via[cur]
+        return path[::-1]
+
+
+def _topological_order(stages: dict[str, Stage]) -> list[str]:
+    order: list[str] = []
+    state: dict[str, int] = {}  # 1 = visiting, 2 = done
+
+    def visit(name: str) -> None:
+        if state.get(name) == 2:
+            return
+        if state.get(name) == 1:
+            raise ValueError(f"Pipeline has a dependency cycle through stage {name!r}.")
+        state[name] = 1
+        for dep in stages[name].after:
+            visit(dep)
+        state[name] = 2
+        order.append(name)
+
+    for name in stages:
+        visit(name)
+    return order
+
+
+def demo_pipeline(
+    *,
+    settings: Settings,
+    run_id: str,
+    input_path: Path,
+    cache: BuildCache | None = None,
+    profiler: Profiler | None = None,
+) -> StagePipeline:
+    """The ``okml demo`` stage graph: design and automation do not need the assessment.
+
+    Chained stages hand their outputs over through an ``ArtifactBus`` rather than disk.
+    Each stage's cache key covers the code version plus what it reads.
+    """
+    bus = ArtifactBus()
+    out = settings.artifacts_dir
+    code = code_version()
+    iac_dir = Path.cwd() / "iac"
+    tools = ",".join(str(shutil.which(t)) for t in ("terraform", "ansible-playbook"))
+    return StagePipeline(
+        [
+            Stage(
+                "assessment",
+                lambda: AssessmentService(settings=settings, run_id=run_id, bus=bus).run(
+                    input_path=input_path
+                ),
+                key=lambda: fingerprint(code, input_path),
+                outputs=(out / "assessment",),
+            ),
+            Stage(
+                "design",
+                DesignService(settings=settings, run_id=run_id).run,
+                key=lambda: fingerprint(code),
+                outputs=(out / "design",),
+            ),
+            Stage(
+                "automation",
+                AutomationService(settings=settings, run_id=run_id).run,
+                key=lambda: fingerprint(code, tools, iac_dir),
+                outputs=(out / "automation",),
+            ),
+            Stage(
+                "kpis",
+                KPIService(settings=settings, run_id=run_id, bus=bus).run,
+                after=("assessment",),
+                key=lambda: fingerprint(
+                    code,
+                    f"seed={settings.seed};simulations={settings.simulations}"
+                    f";charts={settings.chart_format}",
+                    out / "assessment" / "assessment_report.json",
+                ),
+                outputs=(out / "kpis",),
+            ),
+            Stage(
+                "executive",
+                ExecutiveService(settings=settings, run_id=run_id, bus=bus).run,
+                after=("kpis",),
+                key=lambda: fingerprint(code, out / "kpis" / "kpis.json"),
+                outputs=(out / "executive",),
+            ),
+        ],
+        run_id=run_id,
+        cache=cache,
+        profiler=profiler,
+    )
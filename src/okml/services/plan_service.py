@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from okml.adapters.terraform_runner import TerraformResult, TerraformRunner
+from okml.config import Settings
+from okml.domain.models import LegacyEnvironment
+from okml.domain.recommendations import recommend
+from okml.domain.scoring import score_environment
+from okml.reporting.artifact_writer import ArtifactWriter
+from okml.services.assessment_service import load_environment
+from okml.services.fleet_service import (
+    NDJSON_SUFFIXES,
+    discover_inputs,
+    env_slug,
+    iter_ndjson_records,
+)
+from okml.services.job_scheduler import Attempt, Job, JobScheduler
+from okml.utils.fs import ensure_dir
+from okml.utils.logging import get_logger
+from okml.utils.tracing import span
+
+NO_RECOMMENDATIONS = 1_000  # sorts environments that need nothing after every real priority
+
+
+@dataclass(frozen=True)
+class PlanTarget:
+    """One environment's provisioning plan: the terraform variables and its urgency."""
+
+    name: str  # unique job name, also the artifact directory under plans/
+    env: str
+    region: str
+    priority: int  # the most urgent recommendation's priority
+    reliability_risk: float
+    recommendations: list[str]
+    variables: dict[str, object]
+
+    @property
+    def rank(self) -> tuple[int, float, str]:
+        return (self.priority, -self.reliability_risk, self.name)
+
+
+def plan_target(env: LegacyEnvironment, name: str | None = None) -> PlanTarget:
+    scores = score_environment(env)
+    recs = recommend(env, scores)
+    return PlanTarget(
+        name=name or env_slug(env.name),
+        env=env.name,
+        region=env.region,
+        priority=min((r.priority for r in recs), default=NO_RECOMMENDATIONS),
+        reliability_risk=scores.reliability_risk,
+        recommendations=[r.id for r in recs],
+        variables={
+            "environment": env.name,
+            "region": env.region,
+            "provisioning_units": provisioning_units(env),
+        },
+    )
+
+
+def provisioning_units(env: LegacyEnvironment) -> int:
+    """A tenant baseline each, plus one per provisioning workflow pattern."""
+    return env.tenancy.tenants + len(env.provisioning_workflow)
+
+
+@dataclass(frozen=True)
+class PlanSummary:
+    total: int
+    succeeded: int
+    failed: int
+    retried: int  # plans that needed more than one attempt
+    rejected: int  # inputs that failed to load or validate
+    index_path: Path
+    wall_s: float
+
+
+class FleetPlanService:
+    """Terraform-plans every environment of a fleet, one workspace per concurrent job.
+
+    Plans run through a ``JobScheduler``: at most ``concurrency`` at a time, the
+    environments with the most urgent recommendations first, each bounded by ``timeout_s``
+    and retried on transient terraform failures. Each plan streams to
+    ``plans/<env>/terraform_plan.log``; ``plans/index.ndjson`` gets one line per plan as it
+    finishes and ``plans/rejects.ndjson`` the inputs that did not validate.
+    """
+
+    def __init__(self, *, settings: Settings, run_id: str) -> None:
+        self._settings = settings
+        self._run_id = run_id
+        self._log = get_logger(__name__)
+
+    def run(
+        self,
+        *,
+        input_path: Path,
+        pattern: str = "*",
+        concurrency: int = 4,
+        timeout_s: float | None = 600.0,
+        retries: int = 2,
+        backoff_s: float = 1.0,
+    ) -> PlanSummary:
+        out_dir = ensure_dir(self._settings.artifacts_dir / "plans")
+        index_path = out_dir / "index.ndjson"
+        targets: dict[str, PlanTarget] = {}
+        rejected = 0
+        with (
+            ArtifactWriter.from_settings(self._settings) as out,
+            out.open_text(out_dir / "rejects.ndjson") as rejects,
+        ):
+            for source, loaded in _iter_inputs(input_path, pattern):
+                if isinstance(loaded, Exception):
+                    rejects.write(json.dumps({"source": source, "error": str(loaded)}) + "\n")
+                    rejected += 1
+                    continue
+                target = plan_target(loaded, _unique(env_slug(loaded.name), targets))
+                targets[target.name] = target
+
+        scheduler = JobScheduler(
+            concurrency=concurrency,
+            timeout_s=timeout_s,
+            retries=retries,
+            backoff_s=backoff_s,
+            seed=self._settings.seed,
+        )
+        jobs = [
+            Job(name=t.name, run=self._plan_job(t, out_dir / t.name), priority=t.rank)
+            for t in targets.values()
+        ]
+        succeeded = retried = 0
+        t0 = time.perf_counter()
+        with (
+            span("plans", environments=len(jobs), concurrency=concurrency) as sp,
+            ArtifactWriter.from_settings(self._settings) as out,
+            out.open_text(index_path) as index,
+        ):
+            for outcome in scheduler.run(jobs):
+                target = targets[outcome.name]
+                result: TerraformResult | None = outcome.result
+                succeeded += outcome.ok
+                retried += outcome.attempts > 1
+                entry = {
+                    "env": target.env,
+                    "region": target.region,
+                    "priority": target.priority,
+                    "recommendations": target.recommendations,
+                    "variables": target.variables,
+                    "ok": outcome.ok,
+                    "attempts": outcome.attempts,
+                    "elapsed_s": outcome.elapsed_s,
+                    "mode": result.mode if result is not None else None,
+                    "plan_log": f"{target.name}/terraform_plan.log" if outcome.ok else None,
+                    "error": outcome.error,
+                }
+                index.write(json.dumps(entry) + "\n")
+            wall_s = time.perf_counter() - t0
+            if sp is not None:
+                sp.set_attribute("failed", len(jobs) - succeeded)
+
+        summary = PlanSummary(
+            total=len(jobs),
+            succeeded=succeeded,
+            failed=len(jobs) - succeeded,
+            retried=retried,
+            rejected=rejected,
+            index_path=index_path,
+            wall_s=round(wall_s, 4),
+        )
+        meta = {
+            "run_id": self._run_id,
+            "input": str(input_path),
+            "concurrency": concurrency,
+            "timeout_s": timeout_s,
+            "retries": retries,
+            "total": summary.total,
+            "succeeded": summary.succeeded,
+            "failed": summary.failed,
+            "retried": summary.retried,
+            "rejected": summary.rejected,
+            "wall_s": summary.wall_s,
+            "plans_per_s": round(summary.total / wall_s, 3) if wall_s > 0 else None,
+        }
+        with ArtifactWriter.from_settings(self._settings) as out:
+            out.write_json(out_dir / "summary.json", meta)
+        self._log.info("fleet_plans_complete", extra=meta)
+        return summary
+
+    def _plan_job(self, target: PlanTarget, log_dir: Path) -> Callable[[Attempt], TerraformResult]:
+        def plan(attempt: Attempt) -> TerraformResult:
+            runner = TerraformRunner(
+                Path.cwd(),
+                cache_dir=self._settings.terraform_cache_dir,
+                log_dir=log_dir,
+                slot=attempt.slot,
+                timeout_s=attempt.timeout_s,
+                fallback=False,
+            )
+            result = runner.run(variables=target.variables, apply=False)
+            if result.mode == "mock":  # no terraform on PATH: nothing was streamed
+                with ArtifactWriter.from_settings(self._settings) as out:
+                    out.write_text(log_dir / "terraform_plan.log", result.plan_text)
+            return result
+
+        return plan
+
+
+def _iter_inputs(
+    input_path: Path, pattern: str
+) -> Iterator[tuple[str, LegacyEnvironment | Exception]]:
+    """``(source, environment or the error loading it)`` for a directory, NDJSON or file."""
+    if input_path.is_dir():
+        sources = discover_inputs(input_path, pattern)
+        if not sources:
+            raise FileNotFoundError(f"No YAML/JSON inputs matching {pattern!r} under {input_path}.")
+        for p in sources:
+            try:
+                yield str(p), load_environment(p)
+            except Exception as e:
+                yield str(p), e
+    elif input_path.suffix.lower() in NDJSON_SUFFIXES:
+        for lineno, line in iter_ndjson_records(input_path):
+            try:
+                yield f"{input_path}:{lineno}", LegacyEnvironment.model_validate_json(line)
+            except Exception as e:
+                yield f"{input_path}:{lineno}", e
+    else:
+        yield str(input_path), load_environment(input_path)
+
+
+def _unique(name: str, taken: dict[str, PlanTarget]) -> str:
+    if name not in taken:
+        return name
+    n = 2
+    while f"{name}-{n}" in taken:
+        n += 1
+    return f"{name}-{n}"
@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import BrokenExecutor, Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from pydantic import ValidationError
+
+from okml.config import Settings
+from okml.domain.models import LegacyEnvironment
+from okml.services.assessment_service import assess_environment
+from okml.utils.logging import get_logger
+
+# (HTTP status, JSON body) for one assessed payload.
+Reply = tuple[int, str]
+
+MAX_BODY_BYTES = 1 << 20
+
+
+@dataclass(frozen=True)
+class ServeStats:
+    accepted: int
+    rejected: int
+    batches: int
+    assessed: int
+    queue_depth: int
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "accepted": self.accepted,
+            "rejected_overloaded": self.rejected,
+            "batches": self.batches,
+            "assessed": self.assessed,
+            "mean_batch_size": round(self.assessed / self.batches, 2) if self.batches else 0.0,
+            "queue_depth": self.queue_depth,
+        }
+
+
+@dataclass
+class _Pending:
+    payload: str
+    reply: Future[Reply]
+
+
+class _Batcher:
+    """Bounded request queue drained in batches onto the worker pool.
+
+    ``submit`` raises ``queue.Full`` when the queue is at capacity; callers turn that
+    into a 503. The queue only fills when every in-flight batch slot is taken, so it
+    is the pool, not the HTTP layer, that sets the admission rate.
+    """
+
+    def __init__(
+        self,
+        pool: Executor,
+        *,
+        queue_size: int,
+        batch_size: int,
+        batch_wait_s: float,
+        max_in_flight: int,
+        replace_pool: Callable[[Executor], Executor] | None = None,
+    ) -> None:
+        self._pool = pool
+        self._replace_pool = replace_pool
+        self._log = get_logger(__name__)
+        self._queue: queue.Queue[_Pending | None] = queue.Queue(maxsize=queue_size)
+        self._batch_size = batch_size
+        self._batch_wait_s = batch_wait_s
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._accepted = self._rejected = self._batches = self._assessed = 0
+        self._thread = threading.Thread(target=self._loop, name="okml-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, payload: str) -> Future[Reply]:
+        pending = _Pending(payload=payload, reply=Future())
+        try:
+            self._queue.put_nowait(pending)
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            raise
+        with self._lock:
+            self._accepted += 1
+        return pending.reply
+
+    def stats(self) -> ServeStats:
+        with self._lock:
+            return ServeStats(
+                accepted=self._accepted,
+                rejected=self._rejected,
+                batches=self._batches,
+                assessed=self._assessed,
+                queue_depth=self._queue.qsize(),
+            )
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self._batch_wait_s
+            stop = False
+            while len(batch) < self._batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._slots.acquire()
+            try:
+                future = self._submit([p.payload for p in batch])
+            except Exception as e:  # the pool is gone: fail this batch, keep serving
+                self._slots.release()
+                self._reply(batch, _error_replies(e, len(batch)))
+            else:
+                future.add_done_callback(partial(self._deliver, batch))
+            if stop:
+                return
+
+    def _submit(self, payloads: list[str]) -> Future[list[Reply]]:
+        try:
+            return self._pool.submit(assess_payloads, payloads)
+        except BrokenExecutor as e:
+            # A worker died; the pool refuses new work until replaced.
+            if self._replace_pool is None:
+                raise
+            self._log.warning("serve_pool_replaced", extra={"error": f"{type(e).__name__}: {e}"})
+            self._pool = self._replace_pool(self._pool)
+            return self._pool.submit(assess_payloads, payloads)
+
+    def _deliver(self, batch: list[_Pending], future: Future[list[Reply]]) -> None:
+        self._slots.release()
+        exc = future.exception()
+        self._reply(batch, _error_replies(exc, len(batch)) if exc is not None else future.result())
+
+    def _reply(self, batch: list[_Pending], replies: list[Reply]) -> None:
+        with self._lock:
+            self._batches += 1
+            self._assessed += len(batch)
+        for pending, reply in zip(batch, replies, strict=True):
+            pending.reply.set_result(reply)
+
+
+def _error_replies(exc: BaseException, n: int) -> list[Reply]:
+    return [(500, json.dumps({"error": f"{type(exc).__name__}: {exc}"}))] * n
+
+
+def assess_payloads(payloads: list[str]) -> list[Reply]:
+    """Worker-side: validate and assess each ``LegacyEnvironment`` JSON document."""
+    replies: list[Reply] = []
+    for payload in payloads:
+        try:
+            env = LegacyEnvironment.model_validate_json(payload)
+        except ValidationError as e:
+            body = {"error": "invalid LegacyEnvironment", "detail": json.loads(e.json())}
+            replies.append((422, json.dumps(body)))
+            continue
+        replies.append((200, assess_environment(env).model_dump_json()))
+    return replies
+
+
+def _warm_worker() -> int:
+    return os.getpid()
+
+
+class AssessmentServer:
+    """Long-lived ``POST /assess`` endpoint over HTTP or a Unix socket.
+
+    Models and rules stay imported in a warm process pool; requests are batched
+    to amortize the round trip to a worker. ``GET /healthz`` returns counters.
+    """
+
+    def __init__(
+        self,
+        *,
+        settings: Settings,
+        run_id: str,
+        workers: int | None = None,
+        queue_size: int = 256,
+        batch_size: int = 16,
+        batch_wait_ms: float = 2.0,
+        request_timeout_s: float = 30.0,
+    ) -> None:
+        self._settings = settings
+        self._run_id = run_id
+        self._workers = max(1, workers or os.cpu_count() or 1)
+        self._queue_size = queue_size
+        self._batch_size = batch_size
+        self._batch_wait_s = batch_wait_ms / 1000
+        self._request_timeout_s = request_timeout_s
+        self._log = get_logger(__name__)
+        self._pool: ProcessPoolExecutor | None = None
+        self._batcher: _Batcher | None = None
+        self._httpd: socketserver.BaseServer | None = None
+        self._thread: threading.Thread | None = None
+        self.address = ""
+
+    def start(
+        self, *, host: str = "127.0.0.1", port: int = 8787, socket_path: Path | None = None
+    ) -> str:
+        """Warm the pool and start serving on a background thread; return the address."""
+        self._pool = ProcessPoolExecutor(max_workers=self._workers)
+        for f in [self._pool.submit(_warm_worker) for _ in range(self._workers)]:
+            f.result()
+        self._batcher = _Batcher(
+            self._pool,
+            queue_size=self._queue_size,
+            batch_size=self._batch_size,
+            batch_wait_s=self._batch_wait_s,
+            max_in_flight=self._workers * 2,
+            replace_pool=self._replace_pool,
+        )
+        if socket_path is not None:
+            socket_path.unlink(missing_ok=True)
+            handler = _make_handler(self._batcher, self._request_timeout_s, tcp=False)
+            self._httpd = _ThreadingUnixHTTPServer(str(socket_path), handler)
+            self.address = f"unix:{socket_path}"
+        else:
+            handler = _make_handler(self._batcher, self._request_timeout_s, tcp=True)
+            httpd = _ThreadingTCPHTTPServer((host, port), handler)
+            self._httpd = httpd
+            self.address = f"http://{host}:{httpd.server_address[1]}"
+
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="okml-serve", daemon=True
+        )
+        self._thread.start()
+        self._log.info(
+            "serve_started",
+            extra={"run_id": self._run_id, "address": self.address, "workers": self._workers},
+        )
+        return self.address
+
+    def _replace_pool(self, broken: Executor) -> Executor:
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._pool = ProcessPoolExecutor(max_workers=self._workers)
+        return self._pool
+
+    def stats(self) -> ServeStats:
+        if self._batcher is None:
+            raise RuntimeError("AssessmentServer is not started.")
+        return self._batcher.stats()
+
+    def wait(self) -> None:
+        if self._thread is not None:
+            self._thread.join()
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+        if self._batcher is not None:
+            self._batcher.close()
+        if self._pool is not None:
+            self._pool.shutdown()
+        stats = self._batcher.stats().as_dict() if self._batcher is not None else {}
+        self._log.info("serve_stopped", extra={"run_id": self._run_id, **stats})
+
+
+# The default listen backlog of 5 resets connections as soon as a burst of clients arrives.
+class _ThreadingTCPHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def _make_handler(
+    batcher: _Batcher, timeout_s: float, *, tcp: bool
+) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so load generators can reuse connections
+        # Headers and body go out in separate writes; with Nagle on, each response waits
+        # for the client's delayed ACK (~40 ms).
+        disable_nagle_algorithm = tcp
+
+        def do_GET(self) -> None:
+            if self.path != "/healthz":
+                self._send(HTTPStatus.NOT_FOUND, json.dumps({"error": "not found"}))
+                return
+            body = {"status": "ok", **batcher.stats().as_dict()}
+            self._send(HTTPStatus.OK, json.dumps(body))
+
+        def do_POST(self) -> None:
+            if self.path != "/assess":
+                self._send(HTTPStatus.NOT_FOUND, json.dumps({"error": "not found"}))
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                length = -1
+            if length < 0 or length > MAX_BODY_BYTES:
+                # The body is left unread, so the connection cannot be reused.
+                self.close_connection = True
+                if length < 0:
+                    self._send(HTTPStatus.BAD_REQUEST, json.dumps({"error": "bad Content-Length"}))
+                else:
+                    error = json.dumps({"error": "too large"})
+                    self._send(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, error)
+                return
+            try:
+                payload = self.rfile.read(length).decode("utf-8")
+            except UnicodeDecodeError:
+                self._send(HTTPStatus.BAD_REQUEST, json.dumps({"error": "body is not UTF-8"}))
+                return
+            try:
+                reply = batcher.submit(payload)
+            except queue.Full:
+                self._send(
+                    HTTPStatus.SERVICE_UNAVAILABLE,
+                    json.dumps({"error": "overloaded, retry later"}),
+                    headers={"Retry-After": "1"},
+                )
+                return
+            try:
+                status, body = reply.result(timeout=timeout_s)
+            except TimeoutError:
+                self._send(HTTPStatus.GATEWAY_TIMEOUT, json.dumps({"error": "timed out"}))
+                return
+            self._send(HTTPStatus(status), body)
+
+        def _send(
+            self, status: HTTPStatus, body: str, headers: dict[str, str] | None = None
+        ) -> None:
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            # Per-request access logs would dominate the cost of a cached-model request.
+            pass
+
+    return Handler
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+import yaml
+
+from okml.config import Settings
+from okml.domain.synth import SynthConfig, synth_range
+from okml.reporting.artifact_writer import ArtifactWriter
+from okml.utils.fs import ensure_dir
+from okml.utils.logging import get_logger
+
+SynthFormat = Literal["yaml", "json", "ndjson"]
+FORMATS: tuple[SynthFormat, ...] = ("yaml", "json", "ndjson")
+
+# libyaml's emitter is several times faster than the pure-Python one when it is available.
+_Dumper: Any = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+@dataclass(frozen=True)
+class SynthSummary:
+    environments: int
+    files: int
+    path: Path
+
+
+class SynthService:
+    """Write a synthetic fleet as YAML/JSON files, an NDJSON stream, or shards of either.
+
+    Records are generated and written one at a time, so memory stays flat however many
+    environments are requested.
+    """
+
+    def __init__(self, *, settings: Settings, run_id: str) -> None:
+        self._settings = settings
+        self._run_id = run_id
+        self._log = get_logger(__name__)
+
+    def run(
+        self, *, config: SynthConfig, output: Path, fmt: SynthFormat = "ndjson", shards: int = 0
+    ) -> SynthSummary:
+        """``ndjson`` writes one file (or ``shards`` files in a directory); ``yaml`` and
+        ``json`` write one file per environment (in ``shards`` subdirectories)."""
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}.")
+        if fmt == "ndjson" and shards == 0:
+            files = self._write_ndjson(output, synth_range(config, 0, config.count))
+        else:
+            files = 0
+            for k, (start, stop) in enumerate(shard_bounds(config.count, max(shards, 1))):
+                records = synth_range(config, start, stop)
+                if fmt == "ndjson":
+                    files += self._write_ndjson(output / f"shard-{k:05d}.ndjson", records)
+                else:
+                    target = output / f"shard-{k:05d}" if shards else output
+                    files += self._write_documents(target, records, fmt)
+
+        self._log.info(
+            "synth_complete",
+            extra={
+                "run_id": self._run_id,
+                "out": str(output),
+                "environments": config.count,
+                "files": files,
+                "format": fmt,
+            },
+        )
+        return SynthSummary(environments=config.count, files=files, path=output)
+
+    def _write_ndjson(self, path: Path, records: Iterator[dict[str, Any]]) -> int:
+        ensure_dir(path.parent)
+        with path.open("w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return 1
+
+    def _write_documents(
+        self, out_dir: Path, records: Iterator[dict[str, Any]], fmt: SynthFormat
+    ) -> int:
+        files = 0
+        with ArtifactWriter.from_settings(self._settings) as out:
+            out.ensure_dir(out_dir)
+            for record in records:
+                path = out_dir / f"{record['name']}.{fmt}"
+                if fmt == "yaml":
+                    text = yaml.dump(record, Dumper=_Dumper, sort_keys=False, allow_unicode=True)
+                else:
+                    text = json.dumps(record, indent=2, ensure_ascii=False) + "\n"
+                out.write_text(path, text)
+                files += 1
+        return files
+
+
+def shard_bounds(count: int, shards: int) -> list[tuple[int, int]]:
+    """Split ``range(count)`` into ``shards`` contiguous, near-equal ``(start, stop)`` ranges."""
+    size, extra = divmod(count, shards)
+    bounds, start = [], 0
+    for k in range(shards):
+        stop = start + size + (k < extra)
+        bounds.append((start, stop))
+        start = stop
+    return bounds
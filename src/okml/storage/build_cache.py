@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+import okml
+from okml import __version__
+
+CACHE_VERSION = 1
+CACHE_FILE = ".okml-cache.json"
+
+
+def fingerprint(*parts: str | bytes | Path) -> str:
+    """sha256 over ``parts``; paths contribute their file contents (or their tree's)."""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, Path):
+            data = json.dumps(tree_digest(part), sort_keys=True).encode()
+        elif isinstance(part, str):
+            data = part.encode()
+        else:
+            data = part
+        h.update(len(data).to_bytes(8, "big"))
+        h.update(data)
+    return h.hexdigest()
+
+
+def tree_digest(path: Path) -> dict[str, str]:
+    """Relative path -> sha256 for ``path`` (a file) or every file under it (a directory)."""
+    if path.is_file():
+        return {path.name: hashlib.sha256(path.read_bytes()).hexdigest()}
+    if not path.is_dir():
+        return {}
+    return {
+        p.relative_to(path).as_posix(): hashlib.sha256(p.read_bytes()).hexdigest()
+        for p in sorted(path.rglob("*"))
+        if p.is_file()
+    }
+
+
+@cache
+def code_version() -> str:
+    """Package version plus a hash of every okml source file."""
+    root = Path(okml.__file__).parent
+    return fingerprint(__version__, *sorted(root.rglob("*.py")))
+
+
+class BuildCache:
+    """Make-like record of stage input keys and the outputs they produced.
+
+    A stage is fresh when its input key matches the last run and its outputs
+    on disk still hash to what that run wrote. Safe to use from concurrent stages.
+    """
+
+    def __init__(self, path: Path, entries: dict[str, dict[str, Any]] | None = None) -> None:
+        self.path = path
+        self._entries: dict[str, dict[str, Any]] = entries or {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path) -> BuildCache:
+        if not path.exists():
+            return cls(path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return cls(path)
+        if data.get("version") != CACHE_VERSION:
+            return cls(path)
+        return cls(path, data.get("stages", {}))
+
+    def is_fresh(self, stage: str, key: str, outputs: tuple[Path, ...]) -> bool:
+        with self._lock:
+            entry = self._entries.get(stage)
+        if entry is None or entry.get("key") != key:
+            return False
+        return entry.get("outputs") == _outputs_digest(outputs)
+
+    def record(self, stage: str, key: str, outputs: tuple[Path, ...]) -> None:
+        digest = _outputs_digest(outputs)
+        with self._lock:
+            self._entries[stage] = {"key": key, "outputs": digest}
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {"version": CACHE_VERSION, "stages": self._entries}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def _outputs_digest(outputs: tuple[Path, ...]) -> dict[str, dict[str, str]]:
+    return {str(p): tree_digest(p) for p in outputs}
@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+import json
+import struct
+import tarfile
+import threading
+import time
+import zipfile
+import zlib
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Protocol
+
+# A bundle is one compressed archive holding every artifact of a run, named by its path
+# relative to the artifacts directory.
+#
+# .zip uses zipfile: its central directory already gives random access to each member.
+#
+# .tar.gz and .tar.zst are "seekable tars": every tar member (header + data) is its own
+# gzip member / zstd frame, which concatenate into an ordinary compressed tar that
+# `tar -xf` unpacks. The last member, INDEX_NAME, maps each artifact to the byte range of
+# its frame, and a fixed-size footer that decompressors skip (a gzip member whose header
+# carries an extra field, or a zstd skippable frame) points at that index. Reading one
+# artifact is a seek and the decompression of a single frame.
+
+BUNDLE_SUFFIXES = (".zip", ".tar.gz", ".tgz", ".tar.zst", ".tzst")
+INDEX_NAME = ".okml-bundle/index.json"
+INDEX_VERSION = 1
+
+_FOOTER_MAGIC = b"OKMLBNDL"
+_FOOTER_PAYLOAD = struct.Struct("<8sQQ")  # magic, byte offset and length of the index frame
+# gzip member: header with FEXTRA, extra field "OK", an empty deflate block, CRC32 and size.
+_GZIP_FOOTER_HEAD = b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff" + struct.pack(
+    "<H2sH", 4 + _FOOTER_PAYLOAD.size, b"OK", _FOOTER_PAYLOAD.size
+)
+_GZIP_FOOTER_TAIL = b"\x03\x00" + b"\x00" * 8
+_ZSTD_SKIPPABLE_MAGIC = 0x184D2A5D
+_CHUNK = 1 << 20
+
+
+class ArtifactSink(Protocol):
+    def add(self, name: str, data: bytes) -> None: ...
+
+
+@dataclass(frozen=True)
+class BundleEntry:
+    name: str
+    size: int
+
+
+class MemorySink:
+    """Collects artifacts in memory, e.g. in a worker process that cannot reach the bundle."""
+
+    def __init__(self) -> None:
+        self.items: list[tuple[str, bytes]] = []
+
+    def add(self, name: str, data: bytes) -> None:
+        self.items.append((name, data))
+
+
+def bundle_kind(path: Path) -> str:
+    """``zip``, ``gz`` or ``zst`` from the file name; ValueError for anything else."""
+    name = path.name.lower()
+    if name.endswith(".zip"):
+        return "zip"
+    if name.endswith((".tar.gz", ".tgz")):
+        return "gz"
+    if name.endswith((".tar.zst", ".tzst")):
+        return "zst"
+    raise ValueError(f"Unsupported bundle {path.name!r}; use one of {', '.join(BUNDLE_SUFFIXES)}.")
+
+
+class BundleWriter:
+    """Streams artifacts into a single archive; ``close()`` writes the index.
+
+    ``add`` is thread-safe, so pipeline stages running side by side can share one writer.
+    """
+
+    def __init__(self, path: Path, *, level: int | None = None) -> None:
+        """``level`` is the gzip/zstd level of a tar bundle (default 6 and 3)."""
+        self.path = path
+        self.kind = bundle_kind(path)
+        self.count = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self._zip: zipfile.ZipFile | None = None
+        self._tar: _SeekableTarWriter | None = None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self.kind == "zip":
+            self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+        else:
+            self._tar = _SeekableTarWriter(path.open("wb"), self.kind, level)
+
+    def __enter__(self) -> BundleWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def add(self, name: str, data: bytes) -> None:
+        with self._lock:
+            if self._zip is not None:
+                self._zip.writestr(_zip_info(name), data)
+            else:
+                assert self._tar is not None
+                self._tar.add(name, len(data), iter((data,)))
+            self.count += 1
+
+    def add_file(self, name: str, path: Path) -> None:
+        """Add a file from disk without reading it into memory at once."""
+        with self._lock, path.open("rb") as f:
+            if self._zip is not None:
+                with self._zip.open(_zip_info(name), "w", force_zip64=True) as dst:
+                    while chunk := f.read(_CHUNK):
+                        dst.write(chunk)
+            else:
+                assert self._tar is not None
+                self._tar.add(name, path.stat().st_size, iter(lambda: f.read(_CHUNK), b""))
+            self.count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._zip is not None:
+                self._zip.close()
+            elif self._tar is not None:
+                self._tar.close()
+
+
+class BundleReader:
+    """Lists and extracts single artifacts from a bundle without unpacking the rest."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.kind = bundle_kind(path)
+        self._zip: zipfile.ZipFile | None = None
+        self._f: BinaryIO | None = None
+        self._index: dict[str, tuple[int, int, int, int]] = {}
+        if self.kind == "zip":
+            self._zip = zipfile.ZipFile(path)
+        else:
+            self._f = path.open("rb")
+            self._index = _read_index(self._f, self.kind)
+
+    def __enter__(self) -> BundleReader:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._zip is not None:
+            self._zip.close()
+        if self._f is not None:
+            self._f.close()
+
+    def entries(self) -> list[BundleEntry]:
+        if self._zip is not None:
+            return [BundleEntry(i.filename, i.file_size) for i in self._zip.infolist()]
+        return [BundleEntry(name, e[3]) for name, e in self._index.items()]
+
+    def read(self, name: str) -> bytes:
+        return b"".join(self.iter_chunks(name))
+
+    def iter_chunks(self, name: str) -> Iterator[bytes]:
+        if self._zip is not None:
+            try:
+                member = self._zip.open(name)
+            except KeyError:
+                raise KeyError(f"No artifact {name!r} in {self.path}.") from None
+            with member:
+                while chunk := member.read(_CHUNK):
+                    yield chunk
+            return
+        if name not in self._index:
+            raise KeyError(f"No artifact {name!r} in {self.path}.")
+        assert self._f is not None
+        offset, length, header, size = self._index[name]
+        skip, remaining = header, size
+        for chunk in _decompress_frame(self._f, offset, length, self.kind):
+            if skip:
+                chunk, skip = chunk[skip:], max(0, skip - len(chunk))
+            chunk = chunk[:remaining]
+            remaining -= len(chunk)
+            if chunk:
+                yield chunk
+            if not remaining:
+                return
+
+
+_active: BundleWriter | None = None
+
+
+@contextmanager
+def bundle_output(path: Path | None) -> Iterator[BundleWriter | None]:
+    """Send every ``ArtifactWriter.from_settings`` write in the block to the bundle at ``path``.
+
+    No-op when ``path`` is None. The index is written even when the block raises, so the
+    artifacts of a failed run can still be read.
+    """
+    global _active
+    if path is None:
+        yield None
+        return
+    writer = BundleWriter(path)
+    previous, _active = _active, writer
+    try:
+        yield writer
+    finally:
+        _active = previous
+        writer.close()
+
+
+def active_bundle() -> BundleWriter | None:
+    return _active
+
+
+class _SeekableTarWriter:
+    def __init__(self, f: BinaryIO, kind: str, level: int | None) -> None:
+        self._f = f
+        self._kind = kind
+        self._level = level
+        self._index: dict[str, list[int]] = {}
+        self._mtime = int(time.time())
+
+    def add(self, name: str, size: int, chunks: Iterator[bytes]) -> None:
+        info = tarfile.TarInfo(name)
+        info.size, info.mtime, info.mode = size, self._mtime, 0o644
+        header = info.tobuf(format=tarfile.PAX_FORMAT, encoding="utf-8")
+        offset = self._f.tell()
+        compress, finish = _compressor(self._kind, self._level)
+        self._f.write(compress(header))
+        written = 0
+        for chunk in chunks:
+            written += len(chunk)
+            self._f.write(compress(chunk))
+        if written != size:
+            raise ValueError(f"{name}: expected {size} bytes, got {written}.")
+        self._f.write(compress(b"\0" * (-size % tarfile.BLOCKSIZE)))
+        self._f.write(finish())
+        self._index[name] = [offset, self._f.tell() - offset, len(header), size]
+
+    def close(self) -> None:
+        index = {"version": INDEX_VERSION, "entries": self._index}
+        payload = json.dumps(index, separators=(",", ":"), ensure_ascii=False).encode()
+        self.add(INDEX_NAME, len(payload), iter((payload,)))
+        index_offset, index_length, _, _ = self._index.pop(INDEX_NAME)
+        compress, finish = _compressor(self._kind, self._level)
+        self._f.write(compress(b"\0" * (2 * tarfile.BLOCKSIZE)) + finish())  # end of archive
+        footer = _FOOTER_PAYLOAD.pack(_FOOTER_MAGIC, index_offset, index_length)
+        if self._kind == "gz":
+            self._f.write(_GZIP_FOOTER_HEAD + footer + _GZIP_FOOTER_TAIL)
+        else:
+            self._f.write(struct.pack("<II", _ZSTD_SKIPPABLE_MAGIC, len(footer)) + footer)
+        self._f.close()
+
+
+def _footer_size(kind: str) -> int:
+    if kind == "gz":
+        return len(_GZIP_FOOTER_HEAD) + _FOOTER_PAYLOAD.size + len(_GZIP_FOOTER_TAIL)
+    return 8 + _FOOTER_PAYLOAD.size
+
+
+def _read_index(f: BinaryIO, kind: str) -> dict[str, tuple[int, int, int, int]]:
+    size = f.seek(0, 2)
+    footer_size = _footer_size(kind)
+    if size < footer_size:
+        raise ValueError(f"{getattr(f, 'name', 'bundle')} is not an okml bundle.")
+    f.seek(size - footer_size)
+    footer = f.read(footer_size)
+    start = len(_GZIP_FOOTER_HEAD) if kind == "gz" else 8
+    magic, index_offset, index_length = _FOOTER_PAYLOAD.unpack_from(footer, start)
+    if magic != _FOOTER_MAGIC:
+        raise ValueError(f"{getattr(f, 'name', 'bundle')} is not an okml bundle (no index).")
+    member = b"".join(_decompress_frame(f, index_offset, index_length, kind))
+    info = tarfile.TarInfo.frombuf(member[: tarfile.BLOCKSIZE], "utf-8", "surrogateescape")
+    index: dict[str, Any] = json.loads(member[tarfile.BLOCKSIZE : tarfile.BLOCKSIZE + info.size])
+    if index.get("version") != INDEX_VERSION:
+        raise ValueError(f"Unsupported bundle index version {index.get('version')!r}.")
+    return {name: (e[0], e[1], e[2], e[3]) for name, e in index["entries"].items()}
+
+
+def _compressor(
+    kind: str, level: int | None
+) -> tuple[Callable[[bytes], bytes], Callable[[], bytes]]:
+    if kind == "gz":
+        c = zlib.compressobj(6 if level is None else level, zlib.DEFLATED, 31)
+        return c.compress, c.flush
+    zc = _zstandard().ZstdCompressor(level=3 if level is None else level).compressobj()
+    return zc.compress, zc.flush
+
+
+def _decompress_frame(f: BinaryIO, offset: int, length: int, kind: str) -> Iterator[bytes]:
+    """Decompress the single gzip member / zstd frame starting at ``offset``."""
+    d: Any = (
+        zlib.decompressobj(31) if kind == "gz" else _zstandard().ZstdDecompressor().decompressobj()
+    )
+    f.seek(offset)
+    remaining = length
+    while remaining > 0 and not d.eof:
+        data = f.read(min(_CHUNK, remaining))
+        if not data:
+            break
+        remaining -= len(data)
+        yield d.decompress(data)
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError(
+            ".tar.zst bundles need the optional 'zstandard' package "
+            "(pip install 'openstack-k8s-modernization-lab[bundle]'); "
+            "use .tar.gz or .zip instead."
+        ) from None
+    return zstandard
+
+
+def _zip_info(name: str) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = 0o644 << 16
+    return info
@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import date
+from itertools import pairwise
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Literal, get_args, get_origin
+
+import numpy as np
+import numpy.typing as npt
+from pydantic import BaseModel
+
+from okml import __version__
+from okml.domain.batch_scoring import ScoringColumns
+from okml.domain.models import IncidentRecord, LegacyEnvironment, ProvisioningStep
+from okml.utils.fs import ensure_dir
+
+FORMAT_NAME = "okml-fleet-columnar"
+FORMAT_VERSION = 2
+
+# Child collections are stored as separate tables; row i of the environment table owns
+# child rows offsets[i]:offsets[i + 1].
+CHILD_TABLES: dict[str, tuple[str, type[BaseModel]]] = {
+    "incidents": ("incidents_last_90d", IncidentRecord),
+    "steps": ("provisioning_workflow", ProvisioningStep),
+}
+
+# Per-environment float sums over a child table, computed with the builtin sum() while
+# building. Since Python 3.12 sum() compensates for rounding (Neumaier) and numpy adds
+# plainly, so re-adding the child column at read time would not match the scalar scorer
+# bit for bit. Stored as aggregates/<name>.bin, one <f8 per environment.
+AGGREGATES: dict[str, Callable[[LegacyEnvironment], float]] = {
+    "step_error_rate_sum": lambda env: sum(s.error_rate_percent for s in env.provisioning_workflow),
+}
+
+_KINDS: dict[object, str] = {int: "int", float: "float", bool: "bool", str: "string", date: "date"}
+_DTYPES = {"int": "<i8", "float": "<f8", "bool": "|b1", "category": "|u1", "date": "<i4"}
+_EPOCH = date(1970, 1, 1).toordinal()
+_FLUSH_ROWS = 4096
+
+
+@dataclass(frozen=True)
+class Column:
+    path: tuple[str, ...]
+    kind: str  # "int" | "float" | "bool" | "category" | "string" | "date"
+    categories: tuple[str, ...] = ()
+
+    @property
+    def name(self) -> str:
+        return ".".join(self.path)
+
+
+def _schema(model: type[BaseModel], prefix: tuple[str, ...] = ()) -> list[Column]:
+    cols: list[Column] = []
+    for field, info in model.model_fields.items():
+        ann = info.annotation
+        path = (*prefix, field)
+        if isinstance(ann, type) and issubclass(ann, BaseModel):
+            cols += _schema(ann, path)
+        elif get_origin(ann) is list:
+            continue
+        elif get_origin(ann) is Literal:
+            cols.append(Column(path, "category", tuple(get_args(ann))))
+        else:
+            cols.append(Column(path, _KINDS[ann]))
+    return cols
+
+
+SCHEMA: dict[str, list[Column]] = {
+    "env": _schema(LegacyEnvironment),
+    **{table: _schema(model) for table, (_, model) in CHILD_TABLES.items()},
+}
+
+
+class FleetDatasetWriter:
+    """Append validated environments to a columnar dataset directory.
+
+    Every column is a raw little-endian array file (``<table>/<column>.bin``) that
+    can be memory-mapped; string columns are a UTF-8 blob plus an ``int64``
+    offsets file. Rows are buffered and flushed in chunks, so building a dataset
+    from a stream needs constant memory.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._rows = 0
+        self._child_rows = dict.fromkeys(CHILD_TABLES, 0)
+        self._buffers: dict[str, dict[str, list[Any]]] = {
+            table: {c.name: [] for c in cols} for table, cols in SCHEMA.items()
+        }
+        self._child_counts: dict[str, list[int]] = {table: [] for table in CHILD_TABLES}
+        self._aggregates: dict[str, list[float]] = {name: [] for name in AGGREGATES}
+        self._string_ends: dict[tuple[str, str], int] = {}
+        for table, cols in SCHEMA.items():
+            table_dir = ensure_dir(path / table)
+            for c in cols:
+                if c.kind == "string":
+                    (table_dir / f"{c.name}.utf8.bin").write_bytes(b"")
+                    _write_offsets(table_dir / f"{c.name}.offsets.bin", [0], mode="wb")
+                    self._string_ends[(table, c.name)] = 0
+                else:
+                    (table_dir / f"{c.name}.bin").write_bytes(b"")
+        for table in CHILD_TABLES:
+            _write_offsets(path / table / "offsets.bin", [0], mode="wb")
+        aggregates_dir = ensure_dir(path / "aggregates")
+        for name in AGGREGATES:
+            (aggregates_dir / f"{name}.bin").write_bytes(b"")
+
+    def __enter__(self) -> FleetDatasetWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def append(self, env: LegacyEnvironment) -> None:
+        _append_row(self._buffers["env"], SCHEMA["env"], env)
+        for table, (attr, _) in CHILD_TABLES.items():
+            children = getattr(env, attr)
+            self._child_counts[table].append(len(children))
+            for child in children:
+                _append_row(self._buffers[table], SCHEMA[table], child)
+        for name, aggregate in AGGREGATES.items():
+            self._aggregates[name].append(aggregate(env))
+        self._rows += 1
+        if len(self._buffers["env"]["name"]) >= _FLUSH_ROWS:
+            self._flush()
+
+    def close(self) -> None:
+        self._flush()
+        meta = {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "okml_version": __version__,
+            "rows": self._rows,
+            "child_rows": self._child_rows,
+            "tables": _schema_meta(),
+            "aggregates": list(AGGREGATES),
+        }
+        (self._path / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+    def _flush(self) -> None:
+        for table, cols in SCHEMA.items():
+            table_dir = self._path / table
+            buf = self._buffers[table]
+            for c in cols:
+                values = buf[c.name]
+                if not values:
+                    continue
+                if c.kind == "string":
+                    encoded = [v.encode("utf-8") for v in values]
+                    ends = np.cumsum([len(b) for b in encoded]) + self._string_ends[(table, c.name)]
+                    with (table_dir / f"{c.name}.utf8.bin").open("ab") as f:
+                        f.write(b"".join(encoded))
+                    _write_offsets(table_dir / f"{c.name}.offsets.bin", ends.tolist(), mode="ab")
+                    self._string_ends[(table, c.name)] = int(ends[-1])
+                else:
+                    with (table_dir / f"{c.name}.bin").open("ab") as f:
+                        f.write(np.asarray(values, dtype=_DTYPES[c.kind]).tobytes())
+                values.clear()
+        for table in CHILD_TABLES:
+            counts = self._child_counts[table]
+            if counts:
+                ends = np.cumsum(counts) + self._child_rows[table]
+                _write_offsets(self._path / table / "offsets.bin", ends.tolist(), mode="ab")
+                self._child_rows[table] = int(ends[-1])
+                counts.clear()
+        for name, values in self._aggregates.items():
+            if values:
+                with (self._path / "aggregates" / f"{name}.bin").open("ab") as f:
+                    f.write(np.asarray(values, dtype="<f8").tobytes())
+                values.clear()
+
+
+def _schema_meta() -> dict[str, list[dict[str, Any]]]:
+    return {
+        table: [{"name": c.name, "kind": c.kind, "categories": list(c.categories)} for c in cols]
+        for table, cols in SCHEMA.items()
+    }
+
+
+def _append_row(buf: dict[str, list[Any]], cols: list[Column], obj: BaseModel) -> None:
+    for c in cols:
+        value: Any = obj
+        for part in c.path:
+            value = getattr(value, part)
+        if c.kind == "category":
+            value = c.categories.index(value)
+        elif c.kind == "date":
+            value = value.toordinal() - _EPOCH
+        buf[c.name].append(value)
+
+
+def _write_offsets(path: Path, values: list[int], *, mode: str) -> None:
+    with path.open(mode) as f:
+        f.write(np.asarray(values, dtype="<i8").tobytes())
+
+
+class FleetDataset:
+    """Read-only, memory-mapped view of a dataset written by ``FleetDatasetWriter``.
+
+    Records were validated when the dataset was built; ``environment`` and
+    ``iter_environments`` rebuild models with ``model_construct`` and skip
+    validation entirely.
+    """
+
+    def __init__(self, path: Path) -> None:
+        meta_path = path / "meta.json"
+        if not meta_path.exists():
+            raise FileNotFoundError(f"Not a fleet dataset (missing {meta_path}).")
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if (
+            meta.get("format") != FORMAT_NAME
+            or meta.get("version") != FORMAT_VERSION
+            or meta.get("tables") != _schema_meta()
+            or meta.get("aggregates") != list(AGGREGATES)
+        ):
+            raise ValueError(
+                f"Dataset at {path} was written with an incompatible format or model schema; "
+                "rebuild it with: okml dataset build"
+            )
+        self.path = path
+        self._rows = int(meta["rows"])
+        self._child_rows: dict[str, int] = meta["child_rows"]
+        self._cache: dict[str, npt.NDArray[Any]] = {}
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def column(self, name: str, table: str = "env") -> npt.NDArray[Any]:
+        kind = _column(table, name).kind
+        if kind == "string":
+            raise TypeError(f"{table}.{name} is a string column; use strings()")
+        return self._map(f"{table}/{name}.bin", _DTYPES[kind], self._table_len(table))
+
+    def offsets(self, table: str) -> npt.NDArray[np.int64]:
+        return self._map(f"{table}/offsets.bin", "<i8", self._rows + 1)
+
+    def strings(self, name: str, start: int, stop: int, table: str = "env") -> list[str]:
+        offsets = self._map(f"{table}/{name}.offsets.bin", "<i8", self._table_len(table) + 1)
+        blob = self._map(f"{table}/{name}.utf8.bin", "|u1", int(offsets[-1]))
+        bounds = offsets[start : stop + 1].tolist()
+        raw = blob[bounds[0] : bounds[-1]].tobytes()
+        base = bounds[0]
+        return [raw[a - base : b - base].decode("utf-8") for a, b in pairwise(bounds)]
+
+    def environment(self, i: int) -> LegacyEnvironment:
+        return next(self.iter_environments(i, i + 1))
+
+    def iter_environments(
+        self, start: int = 0, stop: int | None = None
+    ) -> Iterator[LegacyEnvironment]:
+        stop = self._rows if stop is None else min(stop, self._rows)
+        if start >= stop:
+            return
+        env_rows = self._read_rows("env", start, stop)
+        children: dict[str, tuple[list[dict[str, Any]], list[int]]] = {}
+        for table in CHILD_TABLES:
+            offsets = self.offsets(table)[start : stop + 1].tolist()
+            rows = self._read_rows(table, offsets[0], offsets[-1])
+            children[table] = (rows, [o - offsets[0] for o in offsets])
+        for k, row in enumerate(env_rows):
+            values = dict(row)
+            for table, (attr, model) in CHILD_TABLES.items():
+                rows, rel = children[table]
+                values[attr] = [model.model_construct(**r) for r in rows[rel[k] : rel[k + 1]]]
+            yield _construct(LegacyEnvironment, values)
+
+    def scoring_columns(self, start: int = 0, stop: int | None = None) -> ScoringColumns:
+        """Aggregate the child tables into the per-environment inputs of ``score_batch``."""
+        stop = self._rows if stop is None else min(stop, self._rows)
+        n = stop - start
+        inc_off = self.offsets("incidents")[start : stop + 1]
+        step_off = self.offsets("steps")[start : stop + 1]
+        inc_owner = np.repeat(np.arange(n), np.diff(inc_off))
+        step_owner = np.repeat(np.arange(n), np.diff(step_off))
+
+        def inc(name: str) -> npt.NDArray[Any]:
+            return self.column(name, "incidents")[inc_off[0] : inc_off[-1]]
+
+        def step(name: str) -> npt.NDArray[Any]:
+            return self.column(name, "steps")[step_off[0] : step_off[-1]]
+
+        def env(name: str) -> npt.NDArray[Any]:
+            return np.asarray(self.column(name)[start:stop])
+
+        def per_env(owner: npt.NDArray[np.int64], weights: npt.NDArray[Any]) -> Any:
+            # Only for integer-valued weights, where any summation order is exact; float
+            # sums come precomputed from AGGREGATES.
+            return np.bincount(owner, weights=weights, minlength=n)
+
+        def aggregate(name: str) -> npt.NDArray[np.float64]:
+            return np.asarray(self._map(f"aggregates/{name}.bin", "<f8", self._rows)[start:stop])
+
+        severity = inc("severity")
+        sev_codes = _column("incidents", "severity").categories
+        return ScoringColumns(
+            sev1_incidents=per_env(inc_owner, severity == sev_codes.index("sev1")).astype(np.int64),
+            sev2_incidents=per_env(inc_owner, severity == sev_codes.index("sev2")).astype(np.int64),
+            incident_count=np.diff(inc_off).astype(np.int64),
+            restore_minutes_total=per_env(inc_owner, inc("minutes_to_restore")).astype(np.int64),
+            manual_touchpoints_total=per_env(step_owner, step("manual_touchpoints")).astype(
+                np.int64
+            ),
+            step_error_rate_sum=aggregate("step_error_rate_sum"),
+            step_count=np.diff(step_off).astype(np.int64),
+            infra_changes_per_week=env("infra_changes_per_week"),
+            change_failure_rate_percent=env("network.change_failure_rate_percent"),
+            backup_success_rate_percent=env("storage.backup_success_rate_percent"),
+            config_drift_rate_percent=env("config_drift_rate_percent"),
+            ha_enabled=env("control_plane.ha_enabled"),
+            db_clustered=env("control_plane.db_clustered"),
+            message_bus_clustered=env("control_plane.message_bus_clustered"),
+            replication_enabled=env("storage.replication_enabled"),
+            self_service_portal=env("tenancy.self_service_portal"),
+            # Both sides derive category codes from the model Literals, so they line up.
+            hypervisor=env("compute.hypervisor"),
+            segmentation=env("network.segmentation"),
+            east_west_visibility=env("network.east_west_visibility"),
+            upgrade_strategy=env("control_plane.upgrade_strategy"),
+            rbac_maturity=env("tenancy.rbac_maturity"),
+        )
+
+    def _table_len(self, table: str) -> int:
+        return self._rows if table == "env" else int(self._child_rows[table])
+
+    def _map(self, rel: str, dtype: str, count: int) -> npt.NDArray[Any]:
+        if rel not in self._cache:
+            if count == 0:
+                self._cache[rel] = np.empty(0, dtype=dtype)
+            else:
+                self._cache[rel] = np.memmap(self.path / rel, dtype=dtype, mode="r", shape=(count,))
+        return self._cache[rel]
+
+    def _read_rows(self, table: str, start: int, stop: int) -> list[dict[str, Any]]:
+        decoded: dict[str, list[Any]] = {}
+        for c in SCHEMA[table]:
+            if c.kind == "string":
+                decoded[c.name] = self.strings(c.name, start, stop, table)
+                continue
+            values = self.column(c.name, table)[start:stop].tolist()
+            if c.kind == "category":
+                values = [c.categories[v] for v in values]
+            elif c.kind == "date":
+                values = [date.fromordinal(_EPOCH + v) for v in values]
+            decoded[c.name] = values
+        names = list(decoded)
+        return [dict(zip(names, row, strict=True)) for row in zip(*decoded.values(), strict=True)]
+
+
+def _column(table: str, name: str) -> Column:
+    for c in SCHEMA[table]:
+        if c.name == name:
+            return c
+    raise KeyError(f"Unknown column {table}.{name}")
+
+
+def _construct(model: type[BaseModel], flat: dict[str, Any], prefix: str = "") -> Any:
+    values: dict[str, Any] = {}
+    for field, info in model.model_fields.items():
+        ann = info.annotation
+        if isinstance(ann, type) and issubclass(ann, BaseModel):
+            values[field] = _construct(ann, flat, f"{prefix}{field}.")
+        else:
+            values[field] = flat[f"{prefix}{field}"]
+    return model.model_construct(**values)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from functools import cache
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from okml import __version__
+from okml.domain import kpis, models, recommendations, scoring
+from okml.reporting import writers
+from okml.services import assessment_service
+
+MANIFEST_VERSION = 1
+
+# Everything that shapes a per-environment assessment: change any of these and every
+# environment is re-scored on the next incremental run.
+_RULE_MODULES: tuple[ModuleType, ...] = (
+    models,
+    scoring,
+    recommendations,
+    kpis,
+    assessment_service,
+    writers,
+)
+
+
+def file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+@cache
+def _rules_source_digest() -> str:
+    h = hashlib.sha256(__version__.encode())
+    for module in _RULE_MODULES:
+        assert module.__file__ is not None
+        h.update(Path(module.__file__).read_bytes())
+    return h.hexdigest()
+
+
+def rules_version(*, seed: int) -> str:
+    """Fingerprint of the scoring/recommendation/KPI code plus the KPI seed."""
+    return hashlib.sha256(f"{_rules_source_digest()}:{seed}".encode()).hexdigest()
+
+
+class AssessmentManifest:
+    """Input content hashes and index entries from the last fleet run.
+
+    An entry is only reusable when both the input digest and the rules version
+    match what produced it.
+    """
+
+    def __init__(self, *, rules: str, entries: dict[str, dict[str, Any]] | None = None) -> None:
+        self.rules = rules
+        self._entries: dict[str, dict[str, Any]] = entries or {}
+
+    @classmethod
+    def load(cls, path: Path, *, rules: str) -> AssessmentManifest:
+        if not path.exists():
+            return cls(rules=rules)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") != MANIFEST_VERSION or data.get("rules_version") != rules:
+            return cls(rules=rules)
+        return cls(rules=rules, entries=data.get("entries", {}))
+
+    def lookup(self, source: str, digest: str) -> dict[str, Any] | None:
+        hit = self._entries.get(source)
+        if hit is None or hit.get("sha256") != digest:
+            return None
+        entry: dict[str, Any] = hit["entry"]
+        return entry
+
+    def record(self, source: str, digest: str, entry: dict[str, Any]) -> None:
+        self._entries[source] = {"sha256": digest, "entry": entry}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def save(self, path: Path) -> None:
+        payload = {
+            "version": MANIFEST_VERSION,
+            "rules_version": self.rules,
+            "entries": self._entries,
+        }
+        path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
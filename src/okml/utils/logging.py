@@ -1,56 +1,63 @@
 from __future__ import annotations
 
+import atexit
+import itertools
 import json
 import logging
+import math
+import os
 import sys
+import time
+from collections.abc import Callable, Mapping
 from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from queue import SimpleQueue
+from typing import TextIO
+
+from okml.utils.tracing import current_span
+
+# Attributes every LogRecord carries (plus the ones formatting and _SpanFilter add); all
+# other attributes came from `extra=` and are logged under "extra".
+_RESERVED = frozenset(logging.LogRecord("", 0, "", 0, "", None, None).__dict__) | {
+    "message",
+    "asctime",
+    "trace_id",
+    "span_id",
+}
+_UNSET = object()
 
 
 class _JsonFormatter(logging.Formatter):
     def __init__(self, run_id: str):
         super().__init__()
         self._run_id = run_id
+        self._ts = _IsoTimestamps()
 
     def format(self, record: logging.LogRecord) -> str:
         payload: dict[str, object] = {
-            "ts": datetime.fromtimestamp(record.created, tz=UTC).isoformat(),
+            "ts": self._ts(record.created),
             "level": record.levelname,
             "logger": record.name,
             "msg": record.getMessage(),
             "run_id": self._run_id,
         }
-        extra = {
-            k: v
-            for k, v in record.__dict__.items()
-            if k
-            not in {
-                "name",
-                "msg",
-                "args",
-                "levelname",
-                "levelno",
-                "pathname",
-                "filename",
-                "module",
-                "exc_info",
-                "exc_text",
-                "stack_info",
-                "lineno",
-                "funcName",
-                "created",
-                "msecs",
-                "relativeCreated",
-                "thread",
-                "threadName",
-                "processName",
-                "process",
-                "message",
-            }
-        }
+        trace_id = getattr(record, "trace_id", _UNSET)
+        if trace_id is _UNSET:  # not captured when the record was made: ask the tracer now
+            sp = current_span()
+            trace_id, span_id = (sp.trace_id, sp.span_id) if sp is not None else (None, None)
+        else:
+            span_id = getattr(record, "span_id", None)
+        if trace_id is not None:
+            payload["trace_id"] = trace_id
+            payload["span_id"] = span_id
+        extra = {k: v for k, v in record.__dict__.items() if k not in _RESERVED}
         if extra:
             payload["extra"] = extra
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:  # already formatted on the producer side
+            payload["exc_info"] = record.exc_text
         return json.dumps(payload, ensure_ascii=False)
 
 
@@ -58,25 +65,278 @@ class _PrettyFormatter(logging.Formatter):
     def __init__(self, run_id: str):
         super().__init__()
         self._run_id = run_id
+        self._second = -1
+        self._ts = ""
 
     def format(self, record: logging.LogRecord) -> str:
-        ts = datetime.fromtimestamp(record.created, tz=UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
-        base = f"{ts} {record.levelname:<5} run={self._run_id} {record.name}: {record.getMessage()}"
-        return base
+        second = int(record.created)
+        if second != self._second:
+            self._second = second
+            self._ts = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(second))
+        return (
+            f"{self._ts} {record.levelname:<5} run={self._run_id} {record.name}: "
+            f"{record.getMessage()}"
+        )
+
+
+class _IsoTimestamps:
+    """``datetime.fromtimestamp(t, tz=UTC).isoformat()``, formatting the date part once a second."""
+
+    def __init__(self) -> None:
+        self._second = -1
+        self._prefix = ""
+
+    def __call__(self, created: float) -> str:
+        frac, whole = math.modf(created)
+        second, micros = int(whole), round(frac * 1e6)
+        if micros >= 1_000_000:
+            second, micros = second + 1, micros - 1_000_000
+        if second != self._second:
+            self._second = second
+            self._prefix = datetime.fromtimestamp(second, tz=UTC).strftime("%Y-%m-%dT%H:%M:%S")
+        if micros:
+            return f"{self._prefix}.{micros:06d}+00:00"
+        return f"{self._prefix}+00:00"
+
+
+class _SpanFilter(logging.Filter):
+    """Stamp the current span on a record where it is made; a queue formats it later."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        sp = current_span()
+        record.trace_id, record.span_id = (
+            (sp.trace_id, sp.span_id) if sp is not None else (None, None)
+        )
+        return True
+
+
+class _SampleFilter(logging.Filter):
+    """Keep one in ``rates[event]`` records of each high-volume event; warnings always pass.
+
+    Kept records carry ``sample_rate`` so counts can be scaled back up.
+    """
+
+    def __init__(self, rates: Mapping[str, int]) -> None:
+        super().__init__()
+        self._rates = dict(rates)
+        self._seen = {event: itertools.count() for event in self._rates}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self._rates.get(record.msg) if isinstance(record.msg, str) else None
+        if rate is None or record.levelno >= logging.WARNING:
+            return True
+        if next(self._seen[record.msg]) % rate:
+            return False
+        record.sample_rate = rate
+        return True
+
+
+def parse_sample_rates(spec: str) -> dict[str, int]:
+    """``"fleet_env_rejected=100,write=10"`` -> ``{"fleet_env_rejected": 100, "write": 10}``."""
+    rates: dict[str, int] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        event, sep, rate = item.partition("=")
+        if not sep or not rate.strip().isdigit() or int(rate) < 1:
+            raise ValueError(f"Bad log sample rule {item!r}; expected EVENT=N with N >= 1.")
+        rates[event.strip()] = int(rate)
+    return rates
+
+
+class _BatchingStreamHandler(logging.StreamHandler[TextIO]):
+    """Buffers formatted records and writes them in one call.
+
+    The buffer is written once ``pending()`` reports no more queued records, or every
+    ``batch_size`` records; without ``pending`` every record is written at once.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO | None = None,
+        *,
+        pending: Callable[[], bool] | None = None,
+        batch_size: int = 256,
+    ) -> None:
+        super().__init__(stream)
+        self._init_batching(pending, batch_size)
+
+    def _init_batching(self, pending: Callable[[], bool] | None, batch_size: int) -> None:
+        self._buffer: list[str] = []
+        self._pending = pending
+        self._batch_size = batch_size
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._buffer.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+            return
+        if self._pending is None or len(self._buffer) >= self._batch_size or not self._pending():
+            self.flush()
 
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if (
+                self.stream is None or self.stream.closed
+            ):  # e.g. a sys.stdout swapped out and closed
+                return
+            if self._buffer:
+                lines, self._buffer = self._buffer, []
+                self._write_lines(lines)
+            super().flush()
+        finally:
+            self.release()
 
-def configure_logging(log_format: str, run_id: str) -> None:
+    def _write_lines(self, lines: list[str]) -> None:
+        self.stream.write("".join(lines))
+
+
+class _BatchingRotatingFileHandler(_BatchingStreamHandler, RotatingFileHandler):
+    """Batched writes to a size-rotated file (``path``, ``path.1`` ... ``path.<backups>``)."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_bytes: int,
+        backups: int,
+        pending: Callable[[], bool] | None = None,
+        batch_size: int = 256,
+    ) -> None:
+        RotatingFileHandler.__init__(
+            self, path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8"
+        )
+        self._init_batching(pending, batch_size)
+
+    def _write_lines(self, lines: list[str]) -> None:
+        # One write per file: the batch is split where it would push a file past max_bytes.
+        stream = self._open_stream()
+        size = stream.tell()
+        chunk: list[str] = []
+        for line in lines:
+            if self.maxBytes and size and size + len(line) > self.maxBytes:
+                stream.write("".join(chunk))
+                chunk.clear()
+                self.doRollover()
+                stream, size = self._open_stream(), 0
+            chunk.append(line)
+            size += len(line)
+        stream.write("".join(chunk))
+
+    def _open_stream(self) -> TextIO:
+        if self.stream is None:  # closed, or reopened lazily after a rollover
+            self.stream = self._open()
+        return self.stream
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
+
+
+_listener: QueueListener | None = None
+
+
+def configure_logging(
+    log_format: str,
+    run_id: str,
+    *,
+    queue: bool = False,
+    log_file: Path | None = None,
+    max_bytes: int = 10 << 20,
+    backups: int = 3,
+    sample: Mapping[str, int] | None = None,
+) -> None:
+    """Log to stdout, or to the rotating ``log_file`` instead.
+
+    With ``queue=True`` the calling thread only stamps the record and puts it on a queue; a
+    listener thread formats and writes it, in batches while records keep arriving.
+    ``sample`` maps event names to "keep one in N".
+    """
+    shutdown_logging()
     root = logging.getLogger()
+    for h in root.handlers:
+        h.close()
     root.handlers.clear()
     root.setLevel(logging.INFO)
 
-    handler = logging.StreamHandler(sys.stdout)
+    records: SimpleQueue[logging.LogRecord] = SimpleQueue()
+    pending = (lambda: not records.empty()) if queue else None
+    handler: _BatchingStreamHandler
+    if log_file is not None:
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        handler = _BatchingRotatingFileHandler(
+            log_file, max_bytes=max_bytes, backups=backups, pending=pending
+        )
+    else:
+        handler = _BatchingStreamHandler(sys.stdout, pending=pending)
     if log_format == "json":
         handler.setFormatter(_JsonFormatter(run_id=run_id))
     else:
         handler.setFormatter(_PrettyFormatter(run_id=run_id))
 
-    root.addHandler(handler)
+    front: logging.Handler = handler
+    if queue:
+        global _listener
+        front = _LazyQueueHandler(records)
+        _listener = QueueListener(records, handler)
+        _listener.start()
+    if sample:
+        front.addFilter(_SampleFilter(sample))
+    front.addFilter(_SpanFilter())
+    root.addHandler(front)
+
+
+def shutdown_logging() -> None:
+    """Stop the queue listener (if any) and write out everything it still holds."""
+    global _listener
+    listener, _listener = _listener, None
+    root = logging.getLogger()
+    if listener is not None:
+        for h in root.handlers[:]:
+            if isinstance(h, QueueHandler):
+                root.removeHandler(h)
+        listener.stop()
+        for h in listener.handlers:
+            h.close()
+    for h in root.handlers:
+        h.flush()
+
+
+class _LazyQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stdlib version formats the whole record here, on the caller's thread. Only
+        # resolve what can change before the listener gets to it: the message arguments
+        # and the traceback.
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _after_fork_in_child() -> None:
+    # The listener thread does not survive fork: log synchronously in the child.
+    global _listener
+    listener, _listener = _listener, None
+    if listener is None:
+        return
+    root = logging.getLogger()
+    front = [h for h in root.handlers if isinstance(h, QueueHandler)]
+    for qh in front:
+        root.removeHandler(qh)
+    for h in listener.handlers:
+        if isinstance(h, _BatchingStreamHandler):
+            h._buffer.clear()  # the parent writes these
+            h._pending = None
+        for qh in front:
+            for f in qh.filters:
+                h.addFilter(f)
+        root.addHandler(h)
+
+
+atexit.register(shutdown_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import cProfile
+import marshal
+import resource
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from okml.utils.tracing import Span, span
+
+if TYPE_CHECKING:
+    from okml.config import Settings
+
+_active: Profiler | None = None
+_current_stage: ContextVar[str] = ContextVar("okml_profile_stage", default="(no stage)")
+
+
+@dataclass
+class _StepStats:
+    count: int = 0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"count": self.count, "wall_s": round(self.wall_s, 6), "cpu_s": round(self.cpu_s, 6)}
+
+
+@dataclass
+class _StageStats:
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    max_rss_mb: float = 0.0
+    pstats: str | None = None
+    steps: dict[str, _StepStats] = field(default_factory=dict)
+
+
+class Profiler:
+    """Wall time, CPU time and peak RSS per stage, plus totals for named sub-steps.
+
+    CPU time is the stage's own thread (``time.thread_time``), so stages running
+    side by side do not count each other's work. ``max_rss_mb`` is the process
+    high-water mark when the stage finished. With ``pstats_dir`` each stage also
+    runs under cProfile and its stats are written to ``<pstats_dir>/<stage>.pstats``
+    through ``ArtifactWriter.from_settings(settings)``, so they land in the bundle when
+    one is open; only one cProfile can be active per process (Python 3.12+), so those stages must
+    not overlap (see ``exclusive``).
+    """
+
+    def __init__(self, *, pstats_dir: Path | None = None, settings: Settings | None = None) -> None:
+        self._pstats_dir = pstats_dir
+        self._settings = settings
+        self._stages: dict[str, _StageStats] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def exclusive(self) -> bool:
+        """Whether stages have to run one at a time (they do under cProfile)."""
+        return self._pstats_dir is not None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        token = _current_stage.set(name)
+        prof = cProfile.Profile() if self._pstats_dir is not None else None
+        wall0, cpu0 = time.perf_counter(), time.thread_time()
+        if prof is not None:
+            prof.enable()
+        try:
+            yield
+        finally:
+            if prof is not None:
+                prof.disable()
+            wall, cpu = time.perf_counter() - wall0, time.thread_time() - cpu0
+            _current_stage.reset(token)
+            stats = self._stage_stats(name)
+            stats.wall_s, stats.cpu_s, stats.max_rss_mb = wall, cpu, _max_rss_mb()
+            if prof is not None and self._pstats_dir is not None:
+                path = self._pstats_dir / f"{name}.pstats"
+                self._write_pstats(path, prof)
+                stats.pstats = str(path)
+
+    def add_step(self, name: str, wall_s: float, cpu_s: float) -> None:
+        stats = self._stage_stats(_current_stage.get())
+        with self._lock:
+            step = stats.steps.setdefault(name, _StepStats())
+            step.count += 1
+            step.wall_s += wall_s
+            step.cpu_s += cpu_s
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                name: {
+                    "wall_s": round(s.wall_s, 6),
+                    "cpu_s": round(s.cpu_s, 6),
+                    "max_rss_mb": round(s.max_rss_mb, 1),
+                    **({"pstats": s.pstats} if s.pstats else {}),
+                    "steps": {k: v.as_dict() for k, v in s.steps.items()},
+                }
+                for name, s in self._stages.items()
+            }
+
+    def _write_pstats(self, path: Path, prof: cProfile.Profile) -> None:
+        from okml.reporting.artifact_writer import ArtifactWriter
+
+        prof.create_stats()
+        data = marshal.dumps(prof.stats)  # the bytes Profile.dump_stats writes
+        settings = self._settings
+        with ArtifactWriter.from_settings(settings) if settings else ArtifactWriter() as out:
+            out.write_bytes(path, data)
+
+    def _stage_stats(self, name: str) -> _StageStats:
+        with self._lock:
+            return self._stages.setdefault(name, _StageStats())
+
+
+@contextmanager
+def profiling(profiler: Profiler) -> Iterator[Profiler]:
+    """Make ``profiler`` the target of ``profile_step`` for the duration of the block."""
+    global _active
+    previous, _active = _active, profiler
+    try:
+        yield profiler
+    finally:
+        _active = previous
+
+
+@contextmanager
+def profile_step(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """Time a hot sub-step under the current stage and trace it as a span.
+
+    Free when neither profiling nor tracing is active.
+    """
+    with span(name, **attributes) as sp:
+        prof = _active
+        if prof is None:
+            yield sp
+            return
+        wall0, cpu0 = time.perf_counter(), time.thread_time()
+        try:
+            yield sp
+        finally:
+            prof.add_step(name, time.perf_counter() - wall0, time.thread_time() - cpu0)
+
+
+def _max_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
@@ -1,8 +1,17 @@
 from __future__ import annotations
 
+import os
+import signal
 import subprocess
+import threading
+from collections import deque
+from collections.abc import Callable, Mapping
+from contextlib import nullcontext
 from dataclasses import dataclass
 from pathlib import Path
+from typing import IO
+
+from okml.utils.profiling import profile_step
 
 
 @dataclass(frozen=True)
@@ -17,16 +26,23 @@ def run_cmd(
     cmd: list[str],
     *,
     cwd: Path | None = None,
-    timeout_s: int = 300,
+    timeout_s: float = 300,
     check: bool = False,
+    env: Mapping[str, str] | None = None,
 ) -> CmdResult:
-    proc = subprocess.run(
-        cmd,
-        cwd=str(cwd) if cwd else None,
-        text=True,
-        capture_output=True,
-        timeout=timeout_s,
-    )
+    """Run ``cmd`` and capture its output; ``env`` is added to the inherited environment."""
+    name = f"subprocess:{' '.join([Path(cmd[0]).name, *cmd[1:2]])}"
+    with profile_step(name, cmd=" ".join(cmd), cwd=str(cwd or "")) as sp:
+        proc = subprocess.run(
+            cmd,
+            cwd=str(cwd) if cwd else None,
+            text=True,
+            capture_output=True,
+            timeout=timeout_s,
+            env={**os.environ, **env} if env else None,
+        )
+        if sp is not None:
+            sp.set_attribute("returncode", proc.returncode)
     result = CmdResult(cmd=cmd, returncode=proc.returncode, stdout=proc.stdout, stderr=proc.stderr)
     if check and result.returncode != 0:
         joined = " ".join(cmd)
@@ -36,3 +52,165 @@ def run_cmd(
             f"STDERR:\n{result.stderr}"
         )
     return result
+
+
+# Lines longer than this are cut in the in-memory tail (the tee file keeps them whole).
+_MAX_TAIL_LINE = 4096
+
+
+@dataclass(frozen=True)
+class StreamResult:
+    cmd: list[str]
+    returncode: int
+    stdout_tail: list[str]  # the last ``tail_lines`` lines of each stream
+    stderr_tail: list[str]
+    stdout_lines: int  # lines seen in total
+    stderr_lines: int
+    tee_path: Path | None = None
+
+    @property
+    def stdout(self) -> str:
+        return _tail_text(self.stdout_tail, self.stdout_lines, self.tee_path)
+
+    @property
+    def stderr(self) -> str:
+        return _tail_text(self.stderr_tail, self.stderr_lines, self.tee_path)
+
+
+def stream_cmd(
+    cmd: list[str],
+    *,
+    cwd: Path | None = None,
+    timeout_s: float = 300,
+    check: bool = False,
+    env: Mapping[str, str] | None = None,
+    tee: Path | None = None,
+    on_line: Callable[[str, str], None] | None = None,
+    tail_lines: int = 200,
+    kill_grace_s: float = 5.0,
+) -> StreamResult:
+    """Run ``cmd`` without holding its output: lines are written to ``tee`` as they arrive.
+
+    Only the last ``tail_lines`` lines of stdout and stderr stay in memory.
+    ``on_line(stream, line)`` is called for every line ("stdout" or "stderr") from a reader
+    thread. ``timeout_s`` bounds the whole run: the process group is sent SIGTERM, then
+    SIGKILL after ``kill_grace_s``, and ``subprocess.TimeoutExpired`` is raised.
+    """
+    name = f"subprocess:{' '.join([Path(cmd[0]).name, *cmd[1:2]])}"
+    with (
+        profile_step(name, cmd=" ".join(cmd), cwd=str(cwd or ""), streamed=True) as sp,
+        tee.open("w", encoding="utf-8") if tee is not None else nullcontext() as sink,
+    ):
+        proc = subprocess.Popen(
+            cmd,
+            cwd=str(cwd) if cwd else None,
+            env={**os.environ, **env} if env else None,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors="replace",
+            start_new_session=True,  # so a kill reaches the children it spawned
+        )
+        assert proc.stdout is not None and proc.stderr is not None
+        pumps = [
+            _Pump("stdout", proc.stdout, sink, on_line, tail_lines),
+            _Pump("stderr", proc.stderr, sink, on_line, tail_lines),
+        ]
+        # One lock for both pumps, so lines in the tee file never interleave mid-line.
+        pumps[1].lock = pumps[0].lock
+        for p in pumps:
+            p.start()
+        timed_out = False
+        try:
+            proc.wait(timeout=timeout_s)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            _kill_group(proc, kill_grace_s)
+        except BaseException:
+            _kill_group(proc, kill_grace_s)
+            raise
+        finally:
+            for p in pumps:
+                p.join(timeout=kill_grace_s)
+        if sp is not None:
+            sp.set_attribute("returncode", proc.returncode)
+            sp.set_attribute("lines", pumps[0].count + pumps[1].count)
+
+    out, err = pumps
+    result = StreamResult(
+        cmd=cmd,
+        returncode=proc.returncode,
+        stdout_tail=list(out.tail),
+        stderr_tail=list(err.tail),
+        stdout_lines=out.count,
+        stderr_lines=err.count,
+        tee_path=tee,
+    )
+    if timed_out:
+        raise subprocess.TimeoutExpired(cmd, timeout_s, output=result.stdout, stderr=result.stderr)
+    for p in pumps:
+        if p.error is not None:
+            raise p.error
+    if check and result.returncode != 0:
+        joined = " ".join(cmd)
+        raise RuntimeError(
+            f"Command failed rc={result.returncode}: {joined}\n"
+            f"STDOUT:\n{result.stdout}\n"
+            f"STDERR:\n{result.stderr}"
+        )
+    return result
+
+
+class _Pump(threading.Thread):
+    def __init__(
+        self,
+        name: str,
+        pipe: IO[str],
+        sink: IO[str] | None,
+        on_line: Callable[[str, str], None] | None,
+        tail_lines: int,
+    ) -> None:
+        super().__init__(name=f"okml-{name}-pump", daemon=True)
+        self.stream = name
+        self.pipe = pipe
+        self.sink = sink
+        self.on_line = on_line
+        self.tail: deque[str] = deque(maxlen=tail_lines)
+        self.count = 0
+        self.lock = threading.Lock()
+        self.error: BaseException | None = None
+
+    def run(self) -> None:
+        with self.pipe:
+            for line in self.pipe:
+                self.count += 1
+                self.tail.append(line if len(line) <= _MAX_TAIL_LINE else line[:_MAX_TAIL_LINE])
+                if self.sink is not None:
+                    with self.lock:
+                        self.sink.write(line)
+                if self.on_line is not None and self.error is None:
+                    try:
+                        self.on_line(self.stream, line)
+                    except BaseException as e:  # keep draining, or the child blocks on a full pipe
+                        self.error = e
+
+
+def _kill_group(proc: subprocess.Popen[str], grace_s: float) -> None:
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(proc.pid, sig)
+        except ProcessLookupError:
+            return
+        try:
+            proc.wait(timeout=grace_s)
+            return
+        except subprocess.TimeoutExpired:
+            continue
+
+
+def _tail_text(tail: list[str], total: int, tee: Path | None) -> str:
+    text = "".join(tail)
+    if total > len(tail):
+        where = f" in {tee}" if tee is not None else ""
+        text = f"[... {total - len(tail)} earlier lines{where} ...]\n" + text
+    return text
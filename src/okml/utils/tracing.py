@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TextIO
+
+from okml import __version__
+
+_active: Tracer | None = None
+_current: ContextVar[Span | None] = ContextVar("okml_current_span", default=None)
+
+
+def _new_id(n_bytes: int) -> str:
+    return os.urandom(n_bytes).hex()
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class Tracer:
+    """Collects finished spans for one trace and exports them as OTLP/JSON.
+
+    ``parent_id`` makes every root-level span of this tracer a child of a span
+    owned by another process; worker processes use it to hang their spans off
+    the span that dispatched them.
+
+    With ``stream_to``, spans are not kept: each one is appended to an OTLP/JSON
+    document as it finishes, and ``close()`` completes the document and moves it
+    into place. Memory stays flat however many spans a fleet run produces.
+    """
+
+    def __init__(
+        self,
+        *,
+        trace_id: str | None = None,
+        parent_id: str | None = None,
+        stream_to: Path | None = None,
+    ) -> None:
+        self.trace_id = trace_id or _new_id(16)
+        self.parent_id = parent_id
+        self._spans: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._path = stream_to
+        self._out: TextIO | None = None
+        self._streamed = 0
+        if stream_to is not None:
+            stream_to.parent.mkdir(parents=True, exist_ok=True)
+            self._out = _partial(stream_to).open("w", encoding="utf-8")
+            self._out.write(_OTLP_HEAD)
+
+    def record(self, span: Span) -> None:
+        self._add([span.to_dict()])
+
+    def extend(self, spans: Iterable[dict[str, Any]]) -> None:
+        """Add spans finished elsewhere (e.g. returned by a worker process)."""
+        self._add(spans)
+
+    def _add(self, spans: Iterable[dict[str, Any]]) -> None:
+        with self._lock:
+            if self._out is None:
+                self._spans.extend(spans)
+                return
+            for s in spans:
+                self._out.write(("," if self._streamed else "") + json.dumps(_otlp_span(s)))
+                self._streamed += 1
+
+    def close(self) -> None:
+        """Finish a ``stream_to`` export; a no-op for tracers that keep their spans."""
+        with self._lock:
+            out, self._out = self._out, None
+            if out is None or self._path is None:
+                return
+            out.write(_OTLP_TAIL)
+            out.close()
+            os.replace(_partial(self._path), self._path)
+
+    def drain(self) -> list[dict[str, Any]]:
+        with self._lock:
+            spans, self._spans = self._spans, []
+        return spans
+
+    def export_otlp(self, path: Path) -> None:
+        """Write the spans as an OTLP/JSON ``ExportTraceServiceRequest``."""
+        with self._lock:
+            spans = ",".join(json.dumps(_otlp_span(s)) for s in self._spans)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(_OTLP_HEAD + spans + _OTLP_TAIL, encoding="utf-8")
+
+
+@contextmanager
+def tracing(tracer: Tracer) -> Iterator[Tracer]:
+    """Make ``tracer`` collect every ``span`` opened for the duration of the block."""
+    global _active
+    previous, _active = _active, tracer
+    try:
+        yield tracer
+    finally:
+        _active = previous
+
+
+@contextmanager
+def trace_file(path: Path | None, name: str, **attributes: Any) -> Iterator[Tracer | None]:
+    """Trace the block under a root span ``name`` and export it to ``path`` (no-op if None).
+
+    The file is written even when the block raises, so failed runs can be inspected too.
+    """
+    if path is None:
+        yield None
+        return
+    tracer = Tracer(stream_to=path)
+    try:
+        with tracing(tracer), span(name, **attributes):
+            yield tracer
+    finally:
+        tracer.close()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """Open a child of the current span; yields None (and costs ~nothing) when tracing is off."""
+    tracer = _active
+    if tracer is None:
+        yield None
+        return
+    parent = _current.get()
+    s = Span(
+        name=name,
+        trace_id=tracer.trace_id,
+        span_id=_new_id(8),
+        parent_id=parent.span_id if parent is not None else tracer.parent_id,
+        start_ns=time.time_ns(),
+        attributes=attributes,
+    )
+    token = _current.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        s.end_ns = time.time_ns()
+        _current.reset(token)
+        tracer.record(s)
+
+
+def current_span() -> Span | None:
+    return _current.get()
+
+
+def active_tracer() -> Tracer | None:
+    return _active
+
+
+def _otlp_document_parts() -> tuple[str, str]:
+    """The OTLP/JSON ``ExportTraceServiceRequest`` before and after its span list."""
+    payload = {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": _otlp_attributes({"service.name": "okml"})},
+                "scopeSpans": [
+                    {"scope": {"name": "okml", "version": __version__}, "spans": "@SPANS@"}
+                ],
+            }
+        ]
+    }
+    head, tail = json.dumps(payload).split('"@SPANS@"')
+    return head + "[", "]" + tail
+
+
+def _partial(path: Path) -> Path:
+    return path.with_name(path.name + ".part")
+
+
+def _otlp_span(s: dict[str, Any]) -> dict[str, Any]:
+    out: dict[str, Any] = {
+        "traceId": s["trace_id"],
+        "spanId": s["span_id"],
+        "name": s["name"],
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(s["start_ns"]),
+        "endTimeUnixNano": str(s["end_ns"]),
+        "attributes": _otlp_attributes(s["attributes"]),
+        "status": {"code": 2, "message": s["error"]} if s["error"] else {"code": 1},
+    }
+    if s["parent_id"]:
+        out["parentSpanId"] = s["parent_id"]
+    return out
+
+
+def _otlp_attributes(attrs: dict[str, Any]) -> list[dict[str, Any]]:
+    out = []
+    for key, value in attrs.items():
+        if isinstance(value, bool):
+            v: dict[str, Any] = {"boolValue": value}
+        elif isinstance(value, int):
+            v = {"intValue": str(value)}
+        elif isinstance(value, float):
+            v = {"doubleValue": value}
+        else:
+            v = {"stringValue": str(value)}
+        out.append({"key": key, "value": v})
+    return out
+
+
+_OTLP_HEAD, _OTLP_TAIL = _otlp_document_parts()
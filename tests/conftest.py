@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import random
 from pathlib import Path
 
 import pytest
@@ -12,3 +13,67 @@ from okml.domain.models import LegacyEnvironment
 def sample_env() -> LegacyEnvironment:
     data = yaml.safe_load(Path("sample_data/legacy_env.yaml").read_text(encoding="utf-8"))
     return LegacyEnvironment.model_validate(data)
+
+
+@pytest.fixture()
+def random_envs() -> list[LegacyEnvironment]:
+    rng = random.Random(7)
+    return [_random_env(rng, i) for i in range(300)]
+
+
+def _random_env(rng: random.Random, i: int) -> LegacyEnvironment:
+    return LegacyEnvironment.model_validate(
+        {
+            "name": f"env-{i}",
+            "region": "r",
+            "compute": {
+                "hypervisor": rng.choice(["kvm", "vmware", "mixed"]),
+                "compute_nodes": rng.randint(1, 500),
+                "overcommit_ratio": rng.uniform(1.1, 10.0),
+                "patch_cadence_days": rng.randint(1, 365),
+            },
+            "storage": {
+                "primary_backend": "ceph",
+                "replication_enabled": rng.random() < 0.5,
+                "backup_success_rate_percent": rng.choice([rng.uniform(0, 100), 92.0, 99.5]),
+            },
+            "network": {
+                "segmentation": rng.choice(["vlan", "vxlan", "mixed"]),
+                "east_west_visibility": rng.choice(["low", "medium", "high"]),
+                "change_failure_rate_percent": rng.uniform(0, 100),
+            },
+            "control_plane": {
+                "openstack_release": "Train",
+                "ha_enabled": rng.random() < 0.5,
+                "db_clustered": rng.random() < 0.5,
+                "message_bus_clustered": rng.random() < 0.5,
+                "upgrade_strategy": rng.choice(["in_place", "blue_green", "unknown"]),
+            },
+            "tenancy": {
+                "tenants": rng.randint(1, 200),
+                "self_service_portal": rng.random() < 0.5,
+                "rbac_maturity": rng.choice(["ad_hoc", "role_based", "policy_as_code"]),
+            },
+            "deployments_per_week": rng.randint(0, 50),
+            "infra_changes_per_week": rng.randint(0, 30),
+            "config_drift_rate_percent": round(rng.uniform(0, 40), 1),
+            "incidents_last_90d": [
+                {
+                    "occurred_on": "2026-01-01",
+                    "severity": rng.choice(["sev1", "sev2", "sev3"]),
+                    "minutes_to_restore": rng.randint(1, 600),
+                    "primary_cause": "x",
+                }
+                for _ in range(rng.randint(0, 8))
+            ],
+            "provisioning_workflow": [
+                {
+                    "name": f"step-{j}",
+                    "minutes_p50": rng.uniform(1, 60),
+                    "manual_touchpoints": rng.randint(0, 5),
+                    "error_rate_percent": rng.uniform(0, 20),
+                }
+                for j in range(rng.randint(0, 6))
+            ],
+        }
+    )
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from okml.config import Settings
+from okml.reporting.artifact_writer import ArtifactWriter
+
+
+def test_writes_are_atomic_and_leave_no_temp_files(tmp_path: Path) -> None:
+    target = tmp_path / "a" / "b" / "report.json"
+    with ArtifactWriter() as out:
+        out.write_json(target, {"x": "é"})
+        out.write_text(target.with_name("notes.md"), "old")
+        out.write_text(target.with_name("notes.md"), "new")
+
+    assert json.loads(target.read_text(encoding="utf-8")) == {"x": "é"}
+    assert target.with_name("notes.md").read_text(encoding="utf-8") == "new"
+    assert sorted(p.name for p in target.parent.iterdir()) == ["notes.md", "report.json"]
+
+
+def test_directories_are_created_once_and_recreated_if_removed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    mkdirs: list[Path] = []
+    real_mkdir = Path.mkdir
+
+    def counting_mkdir(self: Path, *args: object, **kwargs: object) -> None:
+        mkdirs.append(self)
+        real_mkdir(self, *args, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(Path, "mkdir", counting_mkdir)
+    out = ArtifactWriter()
+    for i in range(20):
+        out.write_text(tmp_path / "env" / f"{i}.txt", str(i))
+    assert mkdirs == [tmp_path / "env"]
+
+    shutil.rmtree(tmp_path / "env")
+    out.write_text(tmp_path / "env" / "again.txt", "ok")
+    assert (tmp_path / "env" / "again.txt").read_text(encoding="utf-8") == "ok"
+
+
+def test_fsync_is_batched_and_files_land_on_flush(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    synced: list[int] = []
+    real_fsync = os.fsync
+
+    def counting_fsync(fd: int) -> None:
+        synced.append(fd)
+        real_fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", counting_fsync)
+
+    out = ArtifactWriter(fsync=True, fsync_batch=4)
+    for i in range(10):
+        out.write_text(tmp_path / f"d{i % 2}" / f"{i}.txt", str(i))
+
+    # Two full batches are committed: 8 files, plus both directories once per batch.
+    assert len(synced) == 8 + 2 * 2
+    assert not (tmp_path / "d0" / "8.txt").exists()
+    out.close()
+    assert len(synced) == 8 + 2 * 2 + 2 + 2
+    assert sorted(int(p.stem) for p in tmp_path.glob("d*/*.txt")) == list(range(10))
+    assert not list(tmp_path.glob("d*/.*.tmp"))
+
+
+def test_thread_pool_writes_everything_before_flush_returns(tmp_path: Path) -> None:
+    settings = Settings(artifact_write_workers=4)
+    with ArtifactWriter.from_settings(settings) as out:
+        for i in range(200):
+            out.write_bytes(tmp_path / f"shard-{i % 7}" / f"{i}.bin", bytes([i % 256]) * 64)
+
+    files = list(tmp_path.glob("shard-*/*.bin"))
+    assert len(files) == 200
+    assert all(p.stat().st_size == 64 for p in files)
+
+
+def test_background_write_errors_surface_on_flush(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def failing_replace(src: object, dst: object) -> None:
+        raise OSError("disk full")
+
+    out = ArtifactWriter(workers=2)
+    monkeypatch.setattr(os, "replace", failing_replace)
+    out.write_text(tmp_path / "x.txt", "x")
+    with pytest.raises(OSError, match="disk full"):
+        out.close()
+
+
+@pytest.mark.parametrize("fsync", [False, True])
+def test_streamed_files_replace_the_old_one_only_when_complete(tmp_path: Path, fsync: bool) -> None:
+    index = tmp_path / "fleet" / "index.ndjson"
+    index.parent.mkdir()
+    index.write_text('{"env": "old"}\n', encoding="utf-8")
+
+    with pytest.raises(RuntimeError), ArtifactWriter(fsync=fsync) as out:
+        with out.open_text(index) as f:
+            f.write('{"env": "new"}\n')
+            raise RuntimeError("killed mid-run")
+    assert index.read_text(encoding="utf-8") == '{"env": "old"}\n'
+
+    with ArtifactWriter(fsync=fsync) as out:
+        with out.open_text(index) as f:
+            f.write('{"env": "new"}\n')
+            assert index.read_text(encoding="utf-8") == '{"env": "old"}\n'
+    assert index.read_text(encoding="utf-8") == '{"env": "new"}\n'
+    assert [p.name for p in index.parent.iterdir()] == ["index.ndjson"]
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from okml.adapters.ansible_runner import AnsibleResult, AnsibleRunner
+from okml.adapters.terraform_runner import TerraformResult, TerraformRunner
+from okml.config import Settings
+from okml.services.automation_service import AutomationService
+
+
+def test_terraform_and_ansible_run_concurrently(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    both_started = threading.Barrier(2, timeout=5)
+
+    def slow_terraform(self: TerraformRunner) -> TerraformResult:
+        both_started.wait()
+        time.sleep(0.3)
+        return TerraformResult(plan_text="plan", outputs={"x": 1}, mode="mock")
+
+    def slow_ansible(self: AnsibleRunner) -> AnsibleResult:
+        both_started.wait()
+        time.sleep(0.2)
+        return AnsibleResult(run_log="log", mode="mock")
+
+    monkeypatch.setattr(TerraformRunner, "run", slow_terraform)
+    monkeypatch.setattr(AnsibleRunner, "run", slow_ansible)
+    settings = Settings(artifacts_dir=tmp_path / "artifacts")
+    AutomationService(settings=settings, run_id="test").run()
+
+    out_dir = settings.artifacts_dir / "automation"
+    meta = json.loads((out_dir / "automation_metadata.json").read_text(encoding="utf-8"))
+    timings = meta["timings"]
+    assert timings["terraform_s"] >= 0.3 and timings["ansible_s"] >= 0.2
+    assert timings["wall_s"] < timings["terraform_s"] + 0.1
+    assert timings["saved_s"] >= 0.15
+    assert (out_dir / "terraform_outputs.json").read_text(encoding="utf-8").strip().startswith("{")
+
+
+def test_runner_errors_propagate(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def missing(self: TerraformRunner) -> TerraformResult:
+        raise FileNotFoundError("Missing terraform dir")
+
+    monkeypatch.setattr(TerraformRunner, "run", missing)
+    settings = Settings(artifacts_dir=tmp_path / "artifacts")
+    with pytest.raises(FileNotFoundError, match="terraform dir"):
+        AutomationService(settings=settings, run_id="test").run()
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import numpy as np
+
+from okml.domain.batch_scoring import ScoringColumns, round1, score_batch
+from okml.domain.models import LegacyEnvironment
+from okml.domain.scoring import score_environment
+
+
+def test_score_batch_matches_scalar_bit_for_bit(
+    sample_env: LegacyEnvironment, random_envs: list[LegacyEnvironment]
+) -> None:
+    envs = [sample_env, *random_envs]
+    batch = score_batch(ScoringColumns.from_environments(envs))
+    assert len(batch) == len(envs)
+    for i, env in enumerate(envs):
+        assert batch.at(i) == score_environment(env)
+
+
+def test_round1_matches_builtin_round_on_ties() -> None:
+    values = np.array([0.15, 0.25, 0.35, 2.675, 1.05, 99.95, 12.345, 0.0, 100.0])
+    assert round1(values).tolist() == [round(v, 1) for v in values.tolist()]
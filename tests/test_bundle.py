@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import os
+import tarfile
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from okml.cli import app
+from okml.config import Settings
+from okml.reporting.artifact_writer import ArtifactWriter
+from okml.storage.bundle import INDEX_NAME, BundleReader, BundleWriter, bundle_output
+
+LONG_NAME = "fleet/" + "x" * 150 + "/report.json"
+
+
+def _formats() -> list[str]:
+    formats = ["bundle.zip", "bundle.tar.gz"]
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return formats
+    return [*formats, "bundle.tar.zst"]
+
+
+@pytest.mark.parametrize("name", _formats())
+def test_bundle_round_trip_with_random_access(tmp_path: Path, name: str) -> None:
+    big = os.urandom(3 << 20)
+    (tmp_path / "big.bin").write_bytes(big)
+    path = tmp_path / name
+    with BundleWriter(path) as bundle:
+        bundle.add("assessment/assessment_report.md", b"# report\n" * 50)
+        bundle.add(LONG_NAME, "é".encode())
+        bundle.add("empty.txt", b"")
+        bundle.add_file("fleet/index.ndjson", tmp_path / "big.bin")
+
+    with BundleReader(path) as reader:
+        assert [(e.name, e.size) for e in reader.entries()] == [
+            ("assessment/assessment_report.md", 450),
+            (LONG_NAME, 2),
+            ("empty.txt", 0),
+            ("fleet/index.ndjson", len(big)),
+        ]
+        assert reader.read(LONG_NAME) == "é".encode()
+        assert reader.read("empty.txt") == b""
+        assert reader.read("fleet/index.ndjson") == big
+        with pytest.raises(KeyError, match="nope"):
+            reader.read("nope")
+
+
+def test_seekable_tar_is_an_ordinary_tar_gz(tmp_path: Path) -> None:
+    path = tmp_path / "bundle.tgz"
+    with BundleWriter(path) as bundle:
+        bundle.add("kpis/kpis.json", b"{}")
+        bundle.add(LONG_NAME, b"x")
+
+    with tarfile.open(path) as tar:
+        assert tar.getnames() == ["kpis/kpis.json", LONG_NAME, INDEX_NAME]
+        member = tar.extractfile(LONG_NAME)
+        assert member is not None and member.read() == b"x"
+
+
+def test_reader_rejects_foreign_archives(tmp_path: Path) -> None:
+    plain = tmp_path / "plain.tar.gz"
+    with tarfile.open(plain, "w:gz") as tar:
+        tar.add(__file__, arcname="x.py")
+    with pytest.raises(ValueError, match="not an okml bundle"):
+        BundleReader(plain)
+    with pytest.raises(ValueError, match="Unsupported bundle"):
+        BundleWriter(tmp_path / "out.rar")
+
+
+def test_artifact_writers_share_the_active_bundle(tmp_path: Path) -> None:
+    settings = Settings(artifacts_dir=tmp_path / "artifacts")
+    with bundle_output(tmp_path / "run.zip") as bundle:
+        assert bundle is not None
+        with ArtifactWriter.from_settings(settings) as out:
+            out.write_text(settings.artifacts_dir / "design" / "adr" / "a.md", "A")
+        with ArtifactWriter.from_settings(settings) as out:
+            out.write_json(settings.artifacts_dir / "kpis" / "kpis.json", {"k": 1})
+
+    assert not settings.artifacts_dir.exists()
+    with BundleReader(tmp_path / "run.zip") as reader:
+        assert reader.read("design/adr/a.md") == b"A"
+        assert json.loads(reader.read("kpis/kpis.json")) == {"k": 1}
+
+
+def test_cli_demo_and_fleet_bundles(tmp_path: Path) -> None:
+    runner = CliRunner()
+    artifacts_dir = tmp_path / "artifacts"
+    demo_bundle = tmp_path / "demo.tar.gz"
+    result = runner.invoke(
+        app,
+        [
+            "demo",
+            "--artifacts-dir",
+            str(artifacts_dir),
+            "--bundle",
+            str(demo_bundle),
+            "--profile",
+            "--pstats",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert not artifacts_dir.exists()
+
+    result = runner.invoke(app, ["bundle", "ls", str(demo_bundle)])
+    assert result.exit_code == 0, result.output
+    names = {line.split()[-1] for line in result.output.splitlines()}
+    assert {
+        "assessment/assessment_report.json",
+        "design/adr/ADR-0001-control-plane-ha.md",
+        "automation/generated_configs/k8s_baseline.yaml",
+        "kpis/dashboard.html",
+        "executive/executive_summary.md",
+        "run_metadata.json",
+        "profile/assessment.pstats",
+    } <= names
+
+    result = runner.invoke(app, ["bundle", "cat", str(demo_bundle), "kpis/kpis.json"])
+    assert result.exit_code == 0, result.output
+    assert "uptime_monthly_percent" in json.loads(result.output)["before"]
+
+    synth = runner.invoke(
+        app, ["synth", "--output", str(tmp_path / "fleet.ndjson"), "--count", "3", "--seed", "1"]
+    )
+    assert synth.exit_code == 0, synth.output
+    fleet_bundle = tmp_path / "fleet.zip"
+    result = runner.invoke(
+        app,
+        [
+            "assess",
+            "--input",
+            str(tmp_path / "fleet.ndjson"),
+            "--workers",
+            "1",
+            "--artifacts-dir",
+            str(artifacts_dir),
+            "--bundle",
+            str(fleet_bundle),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert f"Index: {fleet_bundle}:fleet/index.ndjson" in result.output
+    assert not artifacts_dir.exists()
+    with BundleReader(fleet_bundle) as reader:
+        index = [json.loads(line) for line in reader.read("fleet/index.ndjson").splitlines()]
+        assert len(index) == 3
+        out_dir = Path(index[0]["out_dir"]).relative_to(artifacts_dir).as_posix()
+        report = json.loads(reader.read(f"{out_dir}/assessment/assessment_report.json"))
+        assert report["env"]["name"] == index[0]["env"]
+
+    result = runner.invoke(app, ["demo", "--bundle", str(tmp_path / "out.rar")])
+    assert result.exit_code != 0
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import json
+import os
+import subprocess
+import sys
 from pathlib import Path
 
 from typer.testing import CliRunner
@@ -20,8 +23,76 @@ def test_demo_generates_expected_artifacts(tmp_path: Path) -> None:
     assert (artifacts_dir / "assessment" / "assessment_report.md").exists()
     assert (artifacts_dir / "design" / "architecture.mmd").exists()
     assert (artifacts_dir / "automation" / "terraform_outputs.json").exists()
-    assert (artifacts_dir / "kpis" / "dashboard.html").exists()
+    assert (artifacts_dir / "kpis" / "uptime_trend.svg").exists()
+    assert "<svg" in (artifacts_dir / "kpis" / "dashboard.html").read_text(encoding="utf-8")
     assert (artifacts_dir / "executive" / "executive_summary.md").exists()
 
     kpis = json.loads((artifacts_dir / "kpis" / "kpis.json").read_text(encoding="utf-8"))
     assert kpis["after"]["uptime_monthly_percent"] >= 99.9
+
+    meta = json.loads((artifacts_dir / "run_metadata.json").read_text(encoding="utf-8"))
+    assert set(meta["pipeline"]["stages"]) == {
+        "assessment",
+        "design",
+        "automation",
+        "kpis",
+        "executive",
+    }
+    assert meta["pipeline"]["critical_path"][-1] == "executive"
+
+
+def test_kpis_with_simulations_reports_bands(tmp_path: Path) -> None:
+    runner = CliRunner()
+    artifacts_dir = tmp_path / "artifacts"
+    common = ["--artifacts-dir", str(artifacts_dir), "--log-format", "json"]
+    assess = ["assess", "--input", "sample_data/legacy_env.yaml", *common]
+    assert runner.invoke(app, assess).exit_code == 0
+    result = runner.invoke(app, ["kpis", "--simulations", "5000", *common])
+    assert result.exit_code == 0, result.stdout
+
+    kpis = json.loads((artifacts_dir / "kpis" / "kpis.json").read_text(encoding="utf-8"))
+    assert kpis["simulation"]["runs"] == 5000
+    assert set(kpis["simulation"]["after"]["uptime_monthly_percent"]) == {"p5", "p50", "p95"}
+    assert "Confidence bands" in (artifacts_dir / "kpis" / "dashboard.html").read_text("utf-8")
+
+
+def test_help_does_not_import_stage_dependencies() -> None:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "okml", "--help"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    imported = {line.split("|")[-1].strip() for line in proc.stderr.splitlines()}
+    for heavy in ("matplotlib", "pydantic", "numpy"):
+        assert heavy not in imported
+
+
+def test_kpi_charts_are_svg_without_matplotlib_and_png_on_request(tmp_path: Path) -> None:
+    artifacts_dir = tmp_path / "artifacts"
+    common = ["--artifacts-dir", str(artifacts_dir), "--log-format", "json"]
+    runner = CliRunner()
+    assert (
+        runner.invoke(app, ["assess", "--input", "sample_data/legacy_env.yaml", *common]).exit_code
+        == 0
+    )
+
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "okml", "kpis", *common],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    imported = {line.split("|")[-1].strip() for line in proc.stderr.splitlines()}
+    assert "matplotlib" not in imported
+    assert not (artifacts_dir / "kpis" / "uptime_trend.png").exists()
+
+    result = runner.invoke(app, ["kpis", "--chart-format", "png", *common])
+    assert result.exit_code == 0, result.stdout
+    assert (artifacts_dir / "kpis" / "uptime_trend.png").exists()
+    html = (artifacts_dir / "kpis" / "dashboard.html").read_text(encoding="utf-8")
+    assert "data:image/png;base64," in html and "<svg" not in html
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+from typer.testing import CliRunner
+
+from okml.cli import app
+from okml.config import Settings
+from okml.domain.models import LegacyEnvironment
+from okml.reporting.artifact_writer import ArtifactWriter
+from okml.services.assessment_service import assess_environment, write_assessment_artifacts
+from okml.services.fleet_service import FleetAssessmentService
+from okml.storage import manifest
+
+
+def _write_fleet(root: Path, names: list[str]) -> Path:
+    data = yaml.safe_load(Path("sample_data/legacy_env.yaml").read_text(encoding="utf-8"))
+    fleet = root / "fleet-in"
+    fleet.mkdir()
+    for name in names:
+        data["name"] = name
+        (fleet / f"{name}.yaml").write_text(yaml.safe_dump(data), encoding="utf-8")
+    return fleet
+
+
+def test_fleet_assessment_writes_per_env_artifacts_and_index(tmp_path: Path) -> None:
+    fleet = _write_fleet(tmp_path, ["east-1", "east-2", "west-1"])
+    (fleet / "broken.json").write_text('{"name": "broken"}', encoding="utf-8")
+    (fleet / "notes.txt").write_text("ignored", encoding="utf-8")
+
+    settings = Settings(artifacts_dir=tmp_path / "artifacts")
+    summary = FleetAssessmentService(settings=settings, run_id="test").run(
+        input_dir=fleet, workers=2
+    )
+
+    assert (summary.total, summary.succeeded, summary.failed) == (4, 3, 1)
+    index = [json.loads(line) for line in summary.index_path.read_text().splitlines()]
+    assert [e["env"] for e in index] == ["east-1", "east-2", "west-1"]
+    rejects = [json.loads(line) for line in summary.rejects_path.read_text().splitlines()]
+    assert rejects[0]["source"].endswith("broken.json")
+    assert summary.dashboard_path is not None
+    assert '["east-1",0,' in summary.dashboard_path.read_text(encoding="utf-8")
+    assert summary.risk_register_path is not None
+    register = summary.risk_register_path.read_text(encoding="utf-8").splitlines()
+    assert register[1].startswith("RISK-000001,east-1,")
+    assert register[-1].split(",")[:2] == [f"RISK-{len(register) - 1:06d}", "west-1"]
+    for name in ["east-1", "east-2", "west-1"]:
+        out = settings.artifacts_dir / "fleet" / name / "assessment"
+        assert (out / "assessment_report.json").exists()
+        assert (out / "risk_register.csv").exists()
+
+
+def test_cli_assess_input_dir(tmp_path: Path) -> None:
+    fleet = _write_fleet(tmp_path, ["a", "b"])
+    artifacts_dir = tmp_path / "artifacts"
+    result = CliRunner().invoke(
+        app,
+        [
+            "assess",
+            "--input-dir",
+            str(fleet),
+            "--workers",
+            "1",
+            "--artifacts-dir",
+            str(artifacts_dir),
+        ],
+    )
+    assert result.exit_code == 0, result.stdout
+    assert "Assessed 2/2 environments" in result.stdout
+    assert (artifacts_dir / "fleet" / "summary.json").exists()
+
+
+def test_ndjson_fleet_streams_records_and_rejects_bad_lines(tmp_path: Path) -> None:
+    data = yaml.safe_load(Path("sample_data/legacy_env.yaml").read_text(encoding="utf-8"))
+    lines = []
+    for i in range(5):
+        data["name"] = f"env-{i}"
+        lines.append(json.dumps(data, default=str))
+    lines.insert(2, '{"name": "half-a-record"')
+    lines.insert(4, "")
+    src = tmp_path / "cmdb.ndjson"
+    src.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    artifacts_dir = tmp_path / "artifacts"
+    result = CliRunner().invoke(
+        app,
+        ["assess", "--input", str(src), "--workers", "2", "--artifacts-dir", str(artifacts_dir)],
+    )
+    assert result.exit_code == 1, result.stdout
+    assert "Assessed 5/6 environments (1 rejected," in result.stdout
+
+    fleet_dir = artifacts_dir / "fleet"
+    index = [json.loads(line) for line in (fleet_dir / "index.ndjson").read_text().splitlines()]
+    assert [e["env"] for e in index] == [f"env-{i}" for i in range(5)]
+    (reject,) = [
+        json.loads(line) for line in (fleet_dir / "rejects.ndjson").read_text().splitlines()
+    ]
+    assert reject["source"] == f"{src}:3"
+    assert reject["record"] == '{"name": "half-a-record"'
+    summary = json.loads((fleet_dir / "summary.json").read_text(encoding="utf-8"))
+    assert (summary["total"], summary["failed"]) == (6, 1)
+
+
+def test_incremental_rerun_only_rescores_changed_inputs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    fleet = _write_fleet(tmp_path, ["a", "b", "c"])
+    settings = Settings(artifacts_dir=tmp_path / "artifacts")
+    service = FleetAssessmentService(settings=settings, run_id="test")
+    report_b = settings.artifacts_dir / "fleet" / "b" / "assessment" / "assessment_report.json"
+
+    first = service.run(input_dir=fleet, workers=1)
+    assert (first.succeeded, first.skipped) == (3, 0)
+    b_mtime = report_b.stat().st_mtime_ns
+
+    second = service.run(input_dir=fleet, workers=1)
+    assert (second.succeeded, second.skipped) == (3, 3)
+    assert report_b.stat().st_mtime_ns == b_mtime
+    index = second.index_path.read_text(encoding="utf-8").splitlines()
+    assert sorted(json.loads(line)["env"] for line in index) == ["a", "b", "c"]
+
+    data = yaml.safe_load((fleet / "a.yaml").read_text(encoding="utf-8"))
+    data["config_drift_rate_percent"] = 1.0
+    (fleet / "a.yaml").write_text(yaml.safe_dump(data), encoding="utf-8")
+    third = service.run(input_dir=fleet, workers=1)
+    assert third.skipped == 2
+    assert third.risk_register_path is not None
+    rerun_index = third.index_path.read_text(encoding="utf-8")
+    register = third.risk_register_path.read_text(encoding="utf-8")
+
+    # The changed input keeps its place, so risk ids match a full run's.
+    full = service.run(input_dir=fleet, workers=1, incremental=False)
+    assert full.skipped == 0
+    assert [json.loads(line)["env"] for line in rerun_index.splitlines()] == ["a", "b", "c"]
+    assert full.index_path.read_text(encoding="utf-8") == rerun_index
+    assert full.risk_register_path is not None
+    assert full.risk_register_path.read_text(encoding="utf-8") == register
+
+    monkeypatch.setattr(manifest, "_rules_source_digest", lambda: "new-rules")
+    assert service.run(input_dir=fleet, workers=1).skipped == 0
+
+
+def test_duplicate_env_names_get_their_own_directories(tmp_path: Path) -> None:
+    data = yaml.safe_load(Path("sample_data/legacy_env.yaml").read_text(encoding="utf-8"))
+    fleet = tmp_path / "fleet-in"
+    fleet.mkdir()
+    for hypervisor in ("kvm", "vmware"):
+        data["compute"]["hypervisor"] = hypervisor
+        (fleet / f"{hypervisor}.yaml").write_text(yaml.safe_dump(data), encoding="utf-8")
+    settings = Settings(artifacts_dir=tmp_path / "artifacts")
+    service = FleetAssessmentService(settings=settings, run_id="test")
+
+    def out_dirs() -> dict[str, str]:
+        summary = service.run(input_dir=fleet, workers=2)
+        index = [json.loads(line) for line in summary.index_path.read_text().splitlines()]
+        return {Path(e["source"]).stem: Path(e["out_dir"]).name for e in index}
+
+    dirs = out_dirs()
+    assert sorted(dirs.values()) == ["legacy-prod-east", "legacy-prod-east-2"]
+    for stem, name in dirs.items():
+        report = settings.artifacts_dir / "fleet" / name / "assessment" / "assessment_report.json"
+        assert json.loads(report.read_text())["env"]["compute"]["hypervisor"] == stem
+
+    # Unchanged inputs keep their directories; a changed one cannot take another's.
+    data["compute"]["hypervisor"] = "mixed"
+    (fleet / "vmware.yaml").write_text(yaml.safe_dump(data), encoding="utf-8")
+    rerun = out_dirs()
+    assert rerun["kvm"] == dirs["kvm"] and rerun["vmware"] != dirs["kvm"]
+
+
+def test_fleet_trace_collects_worker_spans(tmp_path: Path) -> None:
+    fleet = _write_fleet(tmp_path, ["east-1", "east-2"])
+    trace_path = tmp_path / "trace.json"
+    result = CliRunner().invoke(
+        app,
+        [
+            "assess",
+            "--input-dir",
+            str(fleet),
+            "--workers",
+            "2",
+            "--artifacts-dir",
+            str(tmp_path / "artifacts"),
+            "--trace-file",
+            str(trace_path),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+
+    payload = json.loads(trace_path.read_text(encoding="utf-8"))
+    spans = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    by_id = {s["spanId"]: s for s in spans}
+    envs = [s for s in spans if s["name"] == "fleet.env"]
+    assert len(envs) == 2
+    assert {by_id[s["parentSpanId"]]["name"] for s in envs} == {"fleet"}
+    assert {s["traceId"] for s in spans} == {envs[0]["traceId"]}
+    assert any(
+        by_id[s["parentSpanId"]]["name"] == "fleet.env" for s in spans if s["name"] == "score"
+    )
+    index = (tmp_path / "artifacts" / "fleet" / "index.ndjson").read_text(encoding="utf-8")
+    assert "spans" not in index
+
+
+def test_assessment_report_json_keeps_json_dumps_formatting(
+    tmp_path: Path, sample_env: LegacyEnvironment
+) -> None:
+    step = sample_env.provisioning_workflow[0].model_copy(update={"error_rate_percent": 1e-7})
+    env = sample_env.model_copy(update={"provisioning_workflow": [step]})
+    report = assess_environment(env)
+    with ArtifactWriter() as out:
+        write_assessment_artifacts(tmp_path, report, out)
+
+    text = (tmp_path / "assessment_report.json").read_text(encoding="utf-8")
+    assert text == json.dumps(report.model_dump(mode="json"), indent=2, ensure_ascii=False)
+    assert '"error_rate_percent": 1e-07' in text
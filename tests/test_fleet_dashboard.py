@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any
+
+from okml.reporting.fleet_dashboard import (
+    COLUMNS,
+    FleetDashboardWriter,
+    render_fleet_dashboard,
+)
+
+
+def _entry(i: int, *, region: str = "region-00", env: str | None = None) -> dict[str, Any]:
+    return {
+        "env": env or f"env-{i:05d}",
+        "region": region,
+        "scores": {
+            "reliability_risk": 40.0 + i % 7,
+            "operational_maturity": 55.5,
+            "automation_maturity": 30.0,
+            "standardization": 61.2,
+        },
+        "findings": i % 5,
+        "kpis": {
+            "before": {"uptime_monthly_percent": 99.1, "provisioning_time_minutes_p50": 120.0},
+            "after": {"uptime_monthly_percent": 99.8, "provisioning_time_minutes_p50": 25.0},
+        },
+    }
+
+
+def _payload(path: Path) -> dict[str, Any]:
+    html = path.read_text(encoding="utf-8")
+    match = re.search(r'<script type="application/json" id="fleet-data">(.*?)</script>', html, re.S)
+    assert match is not None
+    payload: dict[str, Any] = json.loads(match.group(1))
+    return payload
+
+
+def test_payload_is_row_major_with_dictionary_encoded_regions(tmp_path: Path) -> None:
+    path = tmp_path / "dashboard.html"
+    with FleetDashboardWriter(path) as dashboard:
+        dashboard.add(_entry(0, region="west"))
+        dashboard.add(_entry(1, region="east"))
+        dashboard.add(_entry(2, region="west"))
+
+    payload = _payload(path)
+    assert payload["columns"] == list(COLUMNS)
+    assert payload["regions"] == ["west", "east"]
+    assert [row[:2] for row in payload["rows"]] == [
+        ["env-00000", 0],
+        ["env-00001", 1],
+        ["env-00002", 0],
+    ]
+    assert payload["rows"][1][2:] == [41.0, 55.5, 30.0, 61.2, 1, 99.1, 99.8, 120.0, 25.0]
+
+
+def test_env_names_cannot_break_out_of_the_script_element(tmp_path: Path) -> None:
+    path = tmp_path / "dashboard.html"
+    name = "</script><script>alert(1)</script>"
+    with FleetDashboardWriter(path, title="<b>fleet</b>") as dashboard:
+        dashboard.add(_entry(0, env=name))
+
+    html = path.read_text(encoding="utf-8")
+    assert "alert(1)</script>" not in html
+    assert "<title>&lt;b&gt;fleet&lt;/b&gt;</title>" in html
+    assert _payload(path)["rows"][0][0] == name
+
+
+def test_page_size_grows_linearly_with_the_fleet(tmp_path: Path) -> None:
+    sizes = {}
+    for n in (1000, 4000):
+        path = tmp_path / f"{n}.html"
+        with FleetDashboardWriter(path) as dashboard:
+            for i in range(n):
+                dashboard.add(_entry(i, region=f"region-{i % 8:02d}"))
+        sizes[n] = path.stat().st_size
+
+    per_row = (sizes[4000] - sizes[1000]) / 3000
+    assert per_row < 120
+    # The fixed part (markup, styles, script) is paid once, not per row.
+    assert sizes[1000] < 1000 * per_row + 20_000
+
+
+def test_render_from_an_existing_index(tmp_path: Path) -> None:
+    index = tmp_path / "index.ndjson"
+    index.write_text("\n".join(json.dumps(_entry(i)) for i in range(3)) + "\n\n", encoding="utf-8")
+    assert render_fleet_dashboard(index, tmp_path / "out" / "dashboard.html") == 3
+    assert len(_payload(tmp_path / "out" / "dashboard.html")["rows"]) == 3
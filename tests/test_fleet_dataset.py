@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+from dataclasses import fields
+from pathlib import Path
+
+import numpy as np
+import pytest
+from typer.testing import CliRunner
+
+from okml.cli import app
+from okml.domain.batch_scoring import ScoringColumns
+from okml.domain.models import LegacyEnvironment
+from okml.storage.fleet_dataset import FleetDataset, FleetDatasetWriter
+
+
+def test_dataset_roundtrip_without_revalidation(
+    tmp_path: Path, sample_env: LegacyEnvironment, random_envs: list[LegacyEnvironment]
+) -> None:
+    envs = [sample_env, *random_envs]
+    with FleetDatasetWriter(tmp_path / "ds") as writer:
+        for env in envs:
+            writer.append(env)
+
+    ds = FleetDataset(tmp_path / "ds")
+    assert len(ds) == len(envs)
+    assert [e.model_dump() for e in ds.iter_environments()] == [e.model_dump() for e in envs]
+    assert ds.environment(0).model_dump() == sample_env.model_dump()
+
+    expected = ScoringColumns.from_environments(envs[10:50])
+    actual = ds.scoring_columns(10, 50)
+    for f in fields(ScoringColumns):
+        np.testing.assert_array_equal(getattr(actual, f.name), getattr(expected, f.name))
+
+
+def test_dataset_rejects_incompatible_schema(tmp_path: Path, sample_env: LegacyEnvironment) -> None:
+    with FleetDatasetWriter(tmp_path / "ds") as writer:
+        writer.append(sample_env)
+    meta_path = tmp_path / "ds" / "meta.json"
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    meta["tables"]["env"][0]["kind"] = "int"
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    with pytest.raises(ValueError, match="rebuild"):
+        FleetDataset(tmp_path / "ds")
+
+
+def test_assess_dataset_matches_ndjson_fleet(
+    tmp_path: Path, random_envs: list[LegacyEnvironment]
+) -> None:
+    src = tmp_path / "fleet.ndjson"
+    lines = [env.model_dump_json() for env in random_envs[:40]] + ['{"name": 1}']
+    src.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    runner = CliRunner()
+
+    ds_dir = tmp_path / "ds"
+    result = runner.invoke(app, ["dataset", "build", "--input", str(src), "--output", str(ds_dir)])
+    assert result.exit_code == 0, result.stdout
+    assert "Wrote 40 environments" in result.stdout
+
+    def index(args: list[str], out: Path) -> list[dict[str, object]]:
+        res = runner.invoke(app, ["assess", *args, "--workers", "1", "--artifacts-dir", str(out)])
+        assert res.exit_code in (0, 1), res.stdout
+        lines = (out / "fleet" / "index.ndjson").read_text(encoding="utf-8").splitlines()
+        return [json.loads(line) for line in lines]
+
+    from_ndjson = index(["--input", str(src)], tmp_path / "a")
+    from_dataset = index(["--dataset", str(ds_dir)], tmp_path / "b")
+    assert len(from_dataset) == 40
+    for a, b in zip(from_ndjson, from_dataset, strict=True):
+        assert (a["env"], a["scores"], a["recommendations"], a["kpis"]) == (
+            b["env"],
+            b["scores"],
+            b["recommendations"],
+            b["kpis"],
+        )
+    report = tmp_path / "b" / "fleet" / str(from_dataset[0]["env"]) / "assessment"
+    assert (report / "assessment_report.json").exists()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from okml.services.job_scheduler import Attempt, Job, JobScheduler, is_transient
+
+
+def test_runs_most_urgent_first_within_the_concurrency_limit() -> None:
+    lock = threading.Lock()
+    started: list[str] = []
+    running: set[int] = set()
+    peak = 0
+
+    def work(name: str) -> Job:
+        def run(attempt: Attempt) -> str:
+            nonlocal peak
+            with lock:
+                assert attempt.slot not in running
+                running.add(attempt.slot)
+                peak = max(peak, len(running))
+                started.append(name)
+            time.sleep(0.02)
+            with lock:
+                running.discard(attempt.slot)
+            return name.upper()
+
+        return Job(name=name, run=run, priority=(int(name[1:]) % 4,))
+
+    jobs = [work(f"j{i}") for i in range(12)]
+    outcomes = list(JobScheduler(concurrency=1).run(jobs))
+    assert started == ["j0", "j4", "j8", "j1", "j5", "j9", "j2", "j6", "j10", "j3", "j7", "j11"]
+    assert [o.result for o in outcomes] == [n.upper() for n in started]
+
+    started.clear()
+    outcomes = list(JobScheduler(concurrency=3).run(jobs))
+    assert peak == 3
+    assert all(o.ok and o.attempts == 1 for o in outcomes) and len(outcomes) == 12
+
+
+def test_transient_failures_are_retried_with_backoff() -> None:
+    calls: dict[str, list[Attempt]] = {"flaky": [], "broken": [], "down": []}
+
+    def flaky(attempt: Attempt) -> str:
+        calls["flaky"].append(attempt)
+        if attempt.number < 3:
+            raise RuntimeError("Command failed (rc=1): connection reset by peer")
+        return "planned"
+
+    def broken(attempt: Attempt) -> str:
+        calls["broken"].append(attempt)
+        raise RuntimeError("Command failed (rc=1): Error: Unsupported argument")
+
+    def down(attempt: Attempt) -> str:
+        calls["down"].append(attempt)
+        raise TimeoutError("plan took too long")
+
+    scheduler = JobScheduler(concurrency=2, timeout_s=30, retries=2, backoff_s=0.01)
+    jobs = [Job("flaky", flaky), Job("broken", broken), Job("down", down)]
+    outcomes = {o.name: o for o in scheduler.run(jobs)}
+
+    assert outcomes["flaky"].ok and outcomes["flaky"].result == "planned"
+    assert [a.number for a in calls["flaky"]] == [1, 2, 3]
+    assert {a.timeout_s for a in calls["flaky"]} == {30}
+    assert not outcomes["broken"].ok and outcomes["broken"].attempts == 1
+    assert (
+        outcomes["broken"].error
+        == "RuntimeError: Command failed (rc=1): Error: Unsupported argument"
+    )
+    assert not outcomes["down"].ok and outcomes["down"].attempts == 3
+    assert outcomes["down"].elapsed_s >= 0.005 + 0.01  # the two backoffs, at least
+
+
+def test_backoff_doubles_with_jitter_up_to_the_cap() -> None:
+    scheduler = JobScheduler(concurrency=1, backoff_s=1.0, max_backoff_s=8.0, seed=3)
+    for failures, full in [(1, 1.0), (2, 2.0), (3, 4.0), (4, 8.0), (9, 8.0)]:
+        assert full / 2 <= scheduler.backoff(failures) <= full
+    assert is_transient(RuntimeError("Error: Error acquiring the state lock"))
+    assert not is_transient(ValueError("connection reset"))
+    with pytest.raises(ValueError, match="concurrency"):
+        JobScheduler(concurrency=0)
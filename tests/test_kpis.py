@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from okml.domain.kpis import generate_kpis
+from okml.domain.kpis import generate_kpis, simulate_kpis
 from okml.domain.models import LegacyEnvironment
 from okml.domain.recommendations import recommend
 from okml.domain.scoring import score_environment
@@ -15,3 +15,23 @@ def test_kpis_show_expected_improvement(sample_env: LegacyEnvironment) -> None:
         kpis["after"]["provisioning_time_minutes_p50"]
         < kpis["before"]["provisioning_time_minutes_p50"]
     )
+
+
+def test_simulation_bands_are_ordered_and_seeded(sample_env: LegacyEnvironment) -> None:
+    scores = score_environment(sample_env)
+    recs = recommend(sample_env, scores)
+    sim = simulate_kpis(scores=scores, recommendations=recs, seed=2026, runs=100_000)
+    assert sim == simulate_kpis(scores=scores, recommendations=recs, seed=2026, runs=100_000)
+
+    for band in (
+        sim["after"]["uptime_monthly_percent"],
+        sim["after"]["provisioning_time_minutes_p50"],
+        sim["provisioning_improvement_percent"],
+    ):
+        assert band["p5"] <= band["p50"] <= band["p95"]
+    assert 99.9 <= sim["after"]["uptime_monthly_percent"]["p5"]
+    assert sim["after"]["uptime_monthly_percent"]["p95"] <= 99.95
+
+    point = generate_kpis(scores=scores, recommendations=recs, seed=2026)
+    prov = sim["after"]["provisioning_time_minutes_p50"]
+    assert prov["p5"] - 1 <= point["after"]["provisioning_time_minutes_p50"] <= prov["p95"] + 1
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+import random
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from okml.utils.logging import (
+    _BatchingStreamHandler,
+    _IsoTimestamps,
+    configure_logging,
+    parse_sample_rates,
+    shutdown_logging,
+)
+from okml.utils.tracing import Tracer, span, tracing
+
+
+@pytest.fixture(autouse=True)
+def _restore_logging() -> Iterator[None]:
+    yield
+    configure_logging("pretty", run_id="test")
+
+
+def _read_json_lines(path: Path) -> list[dict[str, object]]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_queue_mode_writes_json_with_spans_captured_at_the_call(tmp_path: Path) -> None:
+    log_file = tmp_path / "logs" / "okml.log"
+    configure_logging("json", run_id="r1", queue=True, log_file=log_file)
+    log = logging.getLogger("okml.test")
+    with tracing(Tracer()) as tracer, span("fleet.env") as sp:
+        assert sp is not None
+        log.info("env_done", extra={"run_id": "r1", "env": "east-1"})
+    log.info("after %s", "span")
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        log.exception("failed")
+    shutdown_logging()
+
+    first, second, third = _read_json_lines(log_file)
+    assert first["msg"] == "env_done"
+    assert (first["trace_id"], first["span_id"]) == (tracer.trace_id, sp.span_id)
+    assert first["extra"] == {"run_id": "r1", "env": "east-1"}
+    assert second["msg"] == "after span" and "trace_id" not in second
+    assert "RuntimeError: boom" in str(third["exc_info"])
+
+
+def test_cached_timestamps_match_datetime_isoformat() -> None:
+    ts = _IsoTimestamps()
+    rng = random.Random(3)
+    base = 1_790_000_000.0
+    stamps = [base, base + 0.5, base + 0.9999996, base + 1.000001]
+    stamps += sorted(base + rng.uniform(0, 5) for _ in range(500))
+    for created in stamps:
+        assert ts(created) == datetime.fromtimestamp(created, tz=UTC).isoformat()
+
+
+def test_batching_handler_writes_once_per_batch() -> None:
+    class CountingStream(io.StringIO):
+        writes = 0
+
+        def write(self, s: str) -> int:
+            self.writes += 1
+            return super().write(s)
+
+    stream = CountingStream()
+    handler = _BatchingStreamHandler(stream, pending=lambda: True, batch_size=10)
+    for i in range(25):
+        handler.handle(logging.makeLogRecord({"msg": f"m{i}"}))
+    assert stream.writes == 2
+    handler.flush()
+    assert stream.writes == 3
+    assert stream.getvalue().splitlines() == [f"m{i}" for i in range(25)]
+
+
+def test_sampling_keeps_one_in_n_and_all_warnings(tmp_path: Path) -> None:
+    log_file = tmp_path / "okml.log"
+    configure_logging(
+        "json", run_id="r1", log_file=log_file, sample=parse_sample_rates("noisy=10, write=1")
+    )
+    log = logging.getLogger("okml.test")
+    for _ in range(25):
+        log.info("noisy")
+    log.warning("noisy")
+    log.info("quiet")
+    shutdown_logging()
+
+    lines = _read_json_lines(log_file)
+    assert [line["msg"] for line in lines] == ["noisy"] * 4 + ["quiet"]
+    assert [line.get("extra") for line in lines[:3]] == [{"sample_rate": 10}] * 3
+    with pytest.raises(ValueError, match="EVENT=N"):
+        parse_sample_rates("noisy=0")
+
+
+def test_log_file_rotates_by_size(tmp_path: Path) -> None:
+    log_file = tmp_path / "okml.log"
+    configure_logging(
+        "pretty", run_id="r1", queue=True, log_file=log_file, max_bytes=2000, backups=2
+    )
+    log = logging.getLogger("okml.test")
+    for i in range(200):
+        log.info("event %d %s", i, "x" * 40)
+    shutdown_logging()
+
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert files == ["okml.log", "okml.log.1", "okml.log.2"]
+    assert "event 199 " in log_file.read_text(encoding="utf-8")
+    assert all(p.stat().st_size <= 2000 for p in tmp_path.iterdir())
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from okml.config import Settings
+from okml.domain.models import LegacyEnvironment
+from okml.services.artifact_bus import ASSESSMENT_REPORT, KPIS, ArtifactBus
+from okml.services.assessment_service import assess_environment
+from okml.services.executive_service import ExecutiveService
+from okml.services.kpi_service import KPIService
+from okml.services.pipeline import Stage, StagePipeline
+from okml.storage.build_cache import CACHE_FILE, BuildCache, fingerprint
+from okml.utils.logging import _JsonFormatter
+from okml.utils.profiling import Profiler, profile_step, profiling
+from okml.utils.tracing import Tracer, span, trace_file, tracing
+
+
+def test_independent_stages_overlap_and_dependencies_are_respected() -> None:
+    finished: list[str] = []
+    lock = threading.Lock()
+
+    def work(name: str, seconds: float) -> Stage:
+        def run() -> None:
+            time.sleep(seconds)
+            with lock:
+                finished.append(name)
+
+        return Stage(name, run)
+
+    a, b, c = work("a", 0.2), work("b", 0.2), work("c", 0.05)
+    pipeline = StagePipeline(
+        [a, b, Stage("c", c.run, after=("a",)), Stage("d", lambda: None, after=("b", "c"))],
+        run_id="test",
+    )
+    result = pipeline.run()
+
+    assert finished.index("c") > finished.index("a")
+    assert result.timings["d"].start_s >= result.timings["c"].end_s
+    # a and b run side by side: the run takes ~a+c, not a+b+c.
+    assert result.wall_s < 0.4
+    assert result.critical_path == ["a", "c", "d"]
+
+
+def test_invalid_graphs_are_rejected() -> None:
+    with pytest.raises(ValueError, match="unknown stage"):
+        StagePipeline([Stage("a", lambda: None, after=("missing",))], run_id="test")
+    with pytest.raises(ValueError, match="cycle"):
+        StagePipeline(
+            [Stage("a", lambda: None, after=("b",)), Stage("b", lambda: None, after=("a",))],
+            run_id="test",
+        )
+
+
+def test_failure_stops_downstream_stages() -> None:
+    ran: list[str] = []
+
+    def boom() -> None:
+        raise RuntimeError("stage failed")
+
+    pipeline = StagePipeline(
+        [Stage("a", boom), Stage("b", lambda: ran.append("b"), after=("a",))], run_id="test"
+    )
+    with pytest.raises(RuntimeError, match="stage failed"):
+        pipeline.run()
+    assert ran == []
+
+
+def test_chained_stages_hand_off_through_the_bus(
+    tmp_path: Path, sample_env: LegacyEnvironment
+) -> None:
+    settings = Settings(artifacts_dir=tmp_path)
+    bus = ArtifactBus()
+    bus.publish(ASSESSMENT_REPORT, assess_environment(sample_env))
+
+    # Nothing on disk yet: the KPI stage must get the report from the bus.
+    kpis = KPIService(settings=settings, run_id="test", bus=bus).run()
+    assert bus.get(KPIS) is kpis
+
+    ExecutiveService(settings=settings, run_id="test", bus=bus).run()
+    from_bus = (tmp_path / "executive" / "executive_summary.md").read_text(encoding="utf-8")
+    ExecutiveService(settings=settings, run_id="test").run()
+    from_disk = (tmp_path / "executive" / "executive_summary.md").read_text(encoding="utf-8")
+    assert from_bus == from_disk
+
+    with pytest.raises(FileNotFoundError):
+        KPIService(settings=settings, run_id="test").run()
+
+
+def test_build_cache_skips_fresh_stages_and_reruns_on_change(tmp_path: Path) -> None:
+    source = tmp_path / "input.txt"
+    source.write_text("v1", encoding="utf-8")
+    out = tmp_path / "out"
+    runs: list[str] = []
+
+    def build() -> None:
+        runs.append("build")
+        out.mkdir(exist_ok=True)
+        (out / "result.txt").write_text(source.read_text(encoding="utf-8"), encoding="utf-8")
+
+    def run_once(cache: BuildCache) -> bool:
+        stage = Stage("build", build, key=lambda: fingerprint(source), outputs=(out,))
+        return StagePipeline([stage], run_id="test", cache=cache).run().timings["build"].cached
+
+    cache_path = tmp_path / CACHE_FILE
+    assert run_once(BuildCache.load(cache_path)) is False
+    assert run_once(BuildCache.load(cache_path)) is True
+
+    (out / "result.txt").write_text("tampered", encoding="utf-8")
+    assert run_once(BuildCache.load(cache_path)) is False
+
+    source.write_text("v2", encoding="utf-8")
+    assert run_once(BuildCache.load(cache_path)) is False
+    assert run_once(BuildCache(cache_path)) is False  # --force: empty cache
+    assert runs == ["build"] * 4
+
+
+def test_profiler_records_stages_steps_and_pstats(tmp_path: Path) -> None:
+    def work() -> None:
+        with profile_step("busy"):
+            sum(range(100_000))
+        with profile_step("busy"):
+            time.sleep(0.01)
+
+    profiler = Profiler(pstats_dir=tmp_path)
+    pipeline = StagePipeline([Stage("a", work)], run_id="test", profiler=profiler)
+    with profiling(profiler):
+        pipeline.run()
+    with profile_step("ignored"):  # profiling is off again
+        pass
+
+    stage = profiler.as_dict()["a"]
+    assert stage["wall_s"] >= 0.01
+    assert stage["max_rss_mb"] > 0
+    assert stage["steps"]["busy"]["count"] == 2
+    assert stage["steps"]["busy"]["cpu_s"] < stage["steps"]["busy"]["wall_s"]
+    assert Path(stage["pstats"]).exists()
+    assert "ignored" not in stage["steps"]
+
+
+def test_pstats_profiling_runs_stages_one_at_a_time(tmp_path: Path) -> None:
+    lock = threading.Lock()
+    active = peak = 0
+
+    def work() -> None:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+
+    stages = [Stage(name, work) for name in ("a", "b", "c")]
+    profiler = Profiler(pstats_dir=tmp_path)
+    StagePipeline(stages, run_id="test", profiler=profiler).run()
+    assert peak == 1
+    assert {p.name for p in tmp_path.iterdir()} == {"a.pstats", "b.pstats", "c.pstats"}
+
+    StagePipeline(stages, run_id="test", profiler=Profiler()).run()
+    assert peak == 3  # without cProfile they overlap as usual
+
+
+def test_streamed_trace_holds_no_spans(tmp_path: Path) -> None:
+    path = tmp_path / "trace.json"
+    tracer = Tracer(stream_to=path)
+    worker = Tracer(trace_id=tracer.trace_id, parent_id="00" * 8)
+    with tracing(worker):
+        for i in range(1000):
+            with span("fleet.env", i=i):
+                pass
+    tracer.extend(worker.drain())
+    assert tracer.drain() == [] and not path.exists()  # written through, not held
+    tracer.close()
+
+    spans = json.loads(path.read_text(encoding="utf-8"))["resourceSpans"][0]["scopeSpans"][0]
+    assert len(spans["spans"]) == 1000
+    assert {"key": "i", "value": {"intValue": "999"}} in spans["spans"][-1]["attributes"]
+    assert [p.name for p in tmp_path.iterdir()] == ["trace.json"]
+
+
+def test_trace_spans_nest_across_stage_threads_and_export_otlp(tmp_path: Path) -> None:
+    lines: list[str] = []
+
+    def work() -> None:
+        with profile_step("step", size=3):
+            record = logging.LogRecord("t", logging.INFO, __file__, 1, "inside", None, None)
+            lines.append(_JsonFormatter("test").format(record))
+
+    def boom() -> None:
+        with span("doomed"):
+            raise RuntimeError("no")
+
+    trace_path = tmp_path / "trace.json"
+    pipeline = StagePipeline(
+        [Stage("a", work), Stage("b", work, after=("a",))], run_id="test", max_workers=2
+    )
+    with trace_file(trace_path, "root"):
+        pipeline.run()
+        with pytest.raises(RuntimeError):
+            boom()
+
+    payload = json.loads(trace_path.read_text(encoding="utf-8"))
+    spans = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    by_id = {s["spanId"]: s for s in spans}
+    parent = {s["name"]: by_id[s["parentSpanId"]]["name"] for s in spans if "parentSpanId" in s}
+    assert len({s["traceId"] for s in spans}) == 1
+    assert parent["stage:a"] == parent["stage:b"] == parent["doomed"] == "root"
+    assert {by_id[s["parentSpanId"]]["name"] for s in spans if s["name"] == "step"} == {
+        "stage:a",
+        "stage:b",
+    }
+    step = next(s for s in spans if s["name"] == "step")
+    assert {"key": "size", "value": {"intValue": "3"}} in step["attributes"]
+    doomed = next(s for s in spans if s["name"] == "doomed")
+    assert doomed["status"] == {"code": 2, "message": "RuntimeError: no"}
+
+    logged = json.loads(lines[0])
+    assert logged["trace_id"] == step["traceId"]
+    assert logged["span_id"] in {s["spanId"] for s in spans if s["name"] == "step"}
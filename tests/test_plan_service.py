@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from okml.config import Settings
+from okml.domain.models import LegacyEnvironment
+from okml.services.plan_service import FleetPlanService, plan_target
+
+FAKE_TERRAFORM = Path(__file__).resolve().parents[1] / "benchmarks" / "fake_terraform.py"
+
+
+@pytest.fixture()
+def fake_terraform(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "terraform"
+    script.write_text(f"#!{sys.executable}\n{FAKE_TERRAFORM.read_text()}", encoding="utf-8")
+    script.chmod(0o755)
+    log = tmp_path / "terraform-calls.ndjson"
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_TF_LOG", str(log))
+    monkeypatch.setenv("FAKE_TF_LATENCY_S", "0")
+    monkeypatch.setenv("FAKE_TF_INIT_LATENCY_S", "0")
+    return log
+
+
+def _fleet(path: Path, envs: list[LegacyEnvironment]) -> Path:
+    lines = [env.model_dump_json() for env in envs] + ['{"name": "broken"}']
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def _index(settings: Settings) -> list[dict[str, Any]]:
+    lines = (settings.artifacts_dir / "plans" / "index.ndjson").read_text().splitlines()
+    return [json.loads(line) for line in lines]
+
+
+def test_plans_run_in_recommendation_priority_order(
+    tmp_path: Path, fake_terraform: Path, random_envs: list[LegacyEnvironment]
+) -> None:
+    envs = random_envs[:8]
+    settings = Settings(artifacts_dir=tmp_path / "artifacts", terraform_cache_dir=tmp_path / "tf")
+    summary = FleetPlanService(settings=settings, run_id="test").run(
+        input_path=_fleet(tmp_path / "fleet.ndjson", envs), concurrency=1
+    )
+    assert (summary.total, summary.succeeded, summary.rejected) == (8, 8, 1)
+
+    index = _index(settings)
+    expected = sorted((plan_target(e) for e in envs), key=lambda t: t.rank)
+    assert [e["env"] for e in index] == [t.env for t in expected]
+    assert all(e["mode"] == "real" and e["attempts"] == 1 for e in index)
+    first = index[0]
+    assert first["variables"]["provisioning_units"] == expected[0].variables["provisioning_units"]
+    log = (settings.artifacts_dir / "plans" / first["plan_log"]).read_text()
+    assert f"environment = {first['env']!r}" in log
+
+    commands = [json.loads(line)["args"][0] for line in fake_terraform.read_text().splitlines()]
+    assert commands == ["init"] + ["plan"] * 8  # one slot: one workspace, initialized once
+
+
+def test_transient_failures_retry_and_timeouts_fail(
+    tmp_path: Path,
+    fake_terraform: Path,
+    random_envs: list[LegacyEnvironment],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("FAKE_TF_FAIL_ONCE_DIR", str(tmp_path))
+    monkeypatch.setenv("FAKE_TF_INIT_LATENCY_S", "0.2")  # slots would overlap their inits
+    settings = Settings(artifacts_dir=tmp_path / "artifacts", terraform_cache_dir=tmp_path / "tf")
+    fleet = _fleet(tmp_path / "fleet.ndjson", random_envs[:6])
+    summary = FleetPlanService(settings=settings, run_id="test").run(
+        input_path=fleet, concurrency=3, backoff_s=0.01
+    )
+    assert (summary.succeeded, summary.retried) == (6, 6)
+    assert {e["attempts"] for e in _index(settings)} == {2}
+    workspaces = {json.loads(line)["cwd"] for line in fake_terraform.read_text().splitlines()}
+    assert 1 < len(workspaces) <= 3
+
+    monkeypatch.setenv("FAKE_TF_LATENCY_S", "30")
+    summary = FleetPlanService(settings=settings, run_id="test").run(
+        input_path=fleet, concurrency=6, timeout_s=0.5, retries=0
+    )
+    assert summary.failed == 6
+    assert all(e["error"].startswith("TimeoutExpired") for e in _index(settings))
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import random
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from okml.cli import app
+from okml.domain.recommendations import CATALOG
+from okml.reporting.risk_register import (
+    RANK_BY,
+    FleetRiskRegisterWriter,
+    iter_fleet_risks,
+    rank_key,
+    top_risks,
+)
+
+
+def _entries(n: int, seed: int = 7) -> list[dict[str, object]]:
+    rng = random.Random(seed)
+    ids = list(CATALOG)
+    return [
+        {
+            "env": f"env-{i}",
+            "region": f"r{i % 3}",
+            "scores": {"reliability_risk": round(rng.uniform(0, 100), 1)},
+            "recommendations": sorted(rng.sample(ids, rng.randint(2, len(ids)))),
+        }
+        for i in range(n)
+    ]
+
+
+def test_risk_ids_are_unique_across_the_fleet() -> None:
+    rows = list(iter_fleet_risks(_entries(50)))
+    assert [r.risk_id for r in rows] == [f"RISK-{i:06d}" for i in range(1, len(rows) + 1)]
+    assert rows[0].env == "env-0" and rows[-1].env == "env-49"
+
+
+@pytest.mark.parametrize("by", RANK_BY)
+def test_top_k_matches_a_full_sort(by: str) -> None:
+    entries = _entries(300)
+    expected = sorted(iter_fleet_risks(entries), key=rank_key(by))
+    assert top_risks(iter_fleet_risks(entries), 25, by=by) == expected[:25]
+
+    sre = [r for r in expected if "sre" in r.item.tags]
+    assert top_risks(iter_fleet_risks(entries), 10, by=by, tag="sre") == sre[:10]
+
+
+def test_unknown_ranks_and_recommendations_are_rejected() -> None:
+    with pytest.raises(ValueError, match="Cannot rank"):
+        top_risks([], 1, by="effort")
+    with pytest.raises(ValueError, match="unknown recommendation 'X-999'"):
+        list(
+            iter_fleet_risks(
+                [{"env": "e", "scores": {"reliability_risk": 1}, "recommendations": ["X-999"]}]
+            )
+        )
+
+
+def test_cli_queries_the_register_written_by_the_fleet_run(tmp_path: Path) -> None:
+    entries = _entries(40)
+    fleet_dir = tmp_path / "artifacts" / "fleet"
+    fleet_dir.mkdir(parents=True)
+    index = fleet_dir / "index.ndjson"
+    index.write_text("".join(json.dumps(e) + "\n" for e in entries), encoding="utf-8")
+    with FleetRiskRegisterWriter(fleet_dir / "risk_register.csv") as register:
+        for e in entries:
+            register.add(e)
+    full = {r["risk_id"]: r for r in csv.DictReader(io.StringIO(register.path.read_text()))}
+    assert len(full) == register.rows
+
+    runner = CliRunner()
+    args = ["risks", "--artifacts-dir", str(tmp_path / "artifacts"), "--top", "5"]
+    result = runner.invoke(app, [*args, "--by", "impact", "--tag", "network"])
+    assert result.exit_code == 0, result.output
+    top = list(csv.DictReader(io.StringIO(result.output)))
+    assert len(top) == 5
+    assert all(row == full[row["risk_id"]] for row in top)
+    assert all("network" in row["tags"].split(";") for row in top)
+    assert [float(r["reliability_risk"]) for r in top] == sorted(
+        (float(r["reliability_risk"]) for r in top), reverse=True
+    )
+
+    out = tmp_path / "all.csv"
+    result = runner.invoke(app, ["risks", "--index", str(index), "--output", str(out)])
+    assert result.exit_code == 0, result.output
+    assert out.read_text() == register.path.read_text()
+
+    result = runner.invoke(app, [*args, "--by", "effort"])
+    assert result.exit_code != 0
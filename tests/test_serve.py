@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import http.client
+import json
+import queue
+import urllib.error
+import urllib.request
+from concurrent.futures import BrokenExecutor, Executor, Future
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from okml.config import Settings
+from okml.domain.models import LegacyEnvironment
+from okml.services.assessment_service import assess_environment
+from okml.services.serve_service import AssessmentServer, _Batcher
+
+
+def _post(url: str, body: bytes) -> tuple[int, dict[str, Any]]:
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_serve_assesses_payloads(tmp_path: Path, sample_env: LegacyEnvironment) -> None:
+    server = AssessmentServer(settings=Settings(artifacts_dir=tmp_path), run_id="test", workers=1)
+    address = server.start(port=0)
+    try:
+        status, report = _post(f"{address}/assess", sample_env.model_dump_json().encode())
+        assert status == 200
+        assert report == json.loads(assess_environment(sample_env).model_dump_json())
+
+        status, error = _post(f"{address}/assess", b'{"name": "broken"}')
+        assert status == 422
+        assert error["error"] == "invalid LegacyEnvironment"
+
+        with urllib.request.urlopen(f"{address}/healthz", timeout=10) as resp:
+            health = json.loads(resp.read())
+        assert health["assessed"] == 2
+
+        host, port = address.removeprefix("http://").split(":")
+        for headers, body in [
+            ({"Content-Length": "-5"}, b""),
+            ({"Content-Length": "lots"}, b""),
+            ({"Content-Length": "2"}, b"\xff\xfe"),
+        ]:
+            conn = http.client.HTTPConnection(host, int(port), timeout=10)
+            conn.request("POST", "/assess", body=body, headers=headers, encode_chunked=False)
+            resp = conn.getresponse()
+            assert resp.status == 400, headers
+            assert "error" in json.loads(resp.read())
+            conn.close()
+    finally:
+        server.stop()
+
+
+class _StalledExecutor(Executor):
+    def submit(self, fn: Any, /, *args: Any, **kwargs: Any) -> Future[Any]:
+        return Future()  # never completes: every batch slot stays taken
+
+
+def test_batcher_rejects_when_the_pool_is_saturated() -> None:
+    batcher = _Batcher(
+        _StalledExecutor(), queue_size=1, batch_size=1, batch_wait_s=0.0, max_in_flight=1
+    )
+    # At most one batch in flight, one held by the batcher and one queued.
+    with pytest.raises(queue.Full):
+        for _ in range(4):
+            batcher.submit("{}")
+    assert batcher.stats().rejected == 1
+
+
+class _BrokenExecutor(Executor):
+    def submit(self, fn: Any, /, *args: Any, **kwargs: Any) -> Future[Any]:
+        raise BrokenExecutor("a worker died")
+
+
+class _InlineExecutor(Executor):
+    def submit(self, fn: Any, /, *args: Any, **kwargs: Any) -> Future[Any]:
+        future: Future[Any] = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+def test_batcher_survives_a_broken_pool() -> None:
+    batcher = _Batcher(
+        _BrokenExecutor(), queue_size=4, batch_size=1, batch_wait_s=0.0, max_in_flight=1
+    )
+    # Without a replacement every batch fails fast, and the slot is released each time.
+    for _ in range(3):
+        status, body = batcher.submit("{}").result(timeout=5)
+        assert status == 500 and "a worker died" in body
+    batcher.close()
+
+    replaced: list[Executor] = []
+
+    def replace(broken: Executor) -> Executor:
+        replaced.append(broken)
+        return _InlineExecutor()
+
+    batcher = _Batcher(
+        _BrokenExecutor(),
+        queue_size=4,
+        batch_size=1,
+        batch_wait_s=0.0,
+        max_in_flight=1,
+        replace_pool=replace,
+    )
+    assert batcher.submit('{"name": "broken"}').result(timeout=5)[0] == 422
+    assert batcher.submit('{"name": "broken"}').result(timeout=5)[0] == 422
+    assert len(replaced) == 1
+    batcher.close()
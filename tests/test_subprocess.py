@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from okml.utils.subprocess import run_cmd, stream_cmd
+
+PY = sys.executable
+
+
+def test_stream_cmd_tees_everything_and_keeps_a_bounded_tail(tmp_path: Path) -> None:
+    script = (
+        "import sys\n"
+        "for i in range(20000):\n"
+        "    print(f'line {i}')\n"
+        "print('oops', file=sys.stderr)\n"
+    )
+    seen: list[tuple[str, str]] = []
+    tee = tmp_path / "out.log"
+    res = stream_cmd(
+        [PY, "-c", script],
+        tee=tee,
+        tail_lines=3,
+        on_line=lambda stream, line: seen.append((stream, line)),
+    )
+
+    assert res.returncode == 0
+    assert (res.stdout_lines, res.stderr_lines) == (20000, 1)
+    assert res.stdout_tail == ["line 19997\n", "line 19998\n", "line 19999\n"]
+    assert res.stdout.startswith(f"[... 19997 earlier lines in {tee} ...]\n")
+    assert res.stderr == "oops\n"
+    assert len(seen) == 20001 and ("stderr", "oops\n") in seen
+    lines = tee.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 20001 and lines[0] == "line 0" and "oops" in lines
+
+
+def test_stream_cmd_failure_reports_only_the_tail() -> None:
+    script = "import sys\nprint('x' * 100 + '\\n' * 5000, end='')\nsys.exit(3)\n"
+    with pytest.raises(RuntimeError, match="rc=3") as e:
+        stream_cmd([PY, "-c", script], check=True, tail_lines=10)
+    assert len(str(e.value)) < 500
+    assert run_cmd([PY, "-c", script], check=False).returncode == 3
+
+
+def test_stream_cmd_timeout_kills_the_process_group(tmp_path: Path) -> None:
+    pid_file = tmp_path / "grandchild.pid"
+    script = (
+        "import subprocess, sys, time\n"
+        "p = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        f"open({str(pid_file)!r}, 'w').write(str(p.pid))\n"
+        "print('started', flush=True)\n"
+        "time.sleep(60)\n"
+    )
+    t0 = time.perf_counter()
+    with pytest.raises(subprocess.TimeoutExpired) as e:
+        stream_cmd([PY, "-c", script], timeout_s=1.0, kill_grace_s=1.0)
+    assert time.perf_counter() - t0 < 10
+    assert e.value.output == "started\n"
+
+    grandchild = int(pid_file.read_text())
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            os.kill(grandchild, 0)
+        except ProcessLookupError:
+            break
+        time.sleep(0.05)
+    else:
+        pytest.fail("grandchild still running after the timeout kill")
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from okml.reporting.svg_charts import _ticks, provisioning_time_svg, uptime_trend_svg
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+def test_bar_heights_are_proportional_and_markup_is_valid() -> None:
+    root = ET.fromstring(provisioning_time_svg(before_p50=200.0, after_p50=120.0))
+    before, after = root.iter(f"{SVG}rect")
+    assert float(after.get("height", 0)) / float(before.get("height", 1)) == pytest.approx(
+        0.6, rel=0.01
+    )
+    assert [t.text for t in root.iter(f"{SVG}title")][-2:] == ["Before: 200", "After: 120"]
+
+
+def test_line_chart_plots_every_month_inside_the_axis_range() -> None:
+    svg = uptime_trend_svg(before_uptime=98.5, after_uptime=99.9)
+    root = ET.fromstring(svg)
+    points = list(root.iter(f"{SVG}circle"))
+    assert len(points) == 6
+    ys = [float(p.get("cy", 0)) for p in points]
+    assert ys[-1] < ys[0]  # higher uptime is drawn higher up
+    assert svg == uptime_trend_svg(before_uptime=98.5, after_uptime=99.9)
+
+
+def test_ticks_use_round_steps() -> None:
+    assert _ticks(97.0, 100.0) == [97.0, 97.5, 98.0, 98.5, 99.0, 99.5, 100.0]
+    assert _ticks(0.0, 220.0) == [0.0, 50.0, 100.0, 150.0, 200.0]
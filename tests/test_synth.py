@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from okml.cli import app
+from okml.config import Settings
+from okml.domain.models import LegacyEnvironment
+from okml.domain.synth import SynthConfig, synth_environments, synth_range
+from okml.services.assessment_service import load_environment
+from okml.services.synth_service import SynthService, shard_bounds
+
+
+def test_synth_is_deterministic_valid_and_slice_stable() -> None:
+    config = SynthConfig(count=200, seed=7)
+    fleet = list(synth_environments(config))
+
+    assert fleet == list(synth_environments(config))
+    assert fleet != list(synth_environments(SynthConfig(count=200, seed=8)))
+    assert list(synth_range(config, 50, 120)) == fleet[50:120]
+    envs = [LegacyEnvironment.model_validate(r) for r in fleet]
+    assert len({e.name for e in envs}) == 200
+    assert any(e.incidents_last_90d for e in envs)
+    assert {len(e.provisioning_workflow) for e in envs} <= set(range(2, 8))
+
+
+def test_region_skew_and_hot_regions() -> None:
+    skewed = Counter(r["region"] for r in synth_environments(SynthConfig(count=2000, seed=1)))
+    assert skewed["region-00"] > 3 * skewed["region-07"]
+
+    even = Counter(
+        r["region"] for r in synth_environments(SynthConfig(count=2000, seed=1, region_skew=0))
+    )
+    assert max(even.values()) < 1.5 * min(even.values())
+
+    config = SynthConfig(count=40, seed=1, regions=4, hot_regions=1, hot_incidents=500)
+    for r in synth_environments(config):
+        hot = r["region"] == "region-00"
+        assert (len(r["incidents_last_90d"]) == 500) == hot
+
+    with pytest.raises(ValueError, match="hot_regions"):
+        SynthConfig(count=1, regions=2, hot_regions=3)
+
+
+def test_shard_bounds_cover_the_range() -> None:
+    assert shard_bounds(10, 3) == [(0, 4), (4, 7), (7, 10)]
+    assert shard_bounds(2, 4) == [(0, 1), (1, 2), (2, 2), (2, 2)]
+
+
+def test_synth_service_writes_every_format(tmp_path: Path) -> None:
+    service = SynthService(settings=Settings(), run_id="test")
+    config = SynthConfig(count=7, seed=3)
+
+    single = service.run(config=config, output=tmp_path / "fleet.ndjson")
+    lines = (tmp_path / "fleet.ndjson").read_text(encoding="utf-8").splitlines()
+    assert single.files == 1 and len(lines) == 7
+
+    sharded = service.run(config=config, output=tmp_path / "shards", shards=3)
+    shard_lines = [
+        line
+        for p in sorted((tmp_path / "shards").glob("shard-*.ndjson"))
+        for line in p.read_text(encoding="utf-8").splitlines()
+    ]
+    assert sharded.files == 3 and shard_lines == lines
+
+    service.run(config=config, output=tmp_path / "yaml", fmt="yaml")
+    first = json.loads(lines[0])
+    env = load_environment(tmp_path / "yaml" / f"{first['name']}.yaml")
+    assert env == LegacyEnvironment.model_validate(first)
+
+    per_shard = service.run(config=config, output=tmp_path / "json", fmt="json", shards=2)
+    assert per_shard.files == 7
+    assert len(list((tmp_path / "json").glob("shard-*/*.json"))) == 7
+
+
+def test_cli_synth_feeds_fleet_assessment(tmp_path: Path) -> None:
+    runner = CliRunner()
+    fleet = tmp_path / "fleet.ndjson"
+    result = runner.invoke(app, ["synth", "--output", str(fleet), "--count", "5", "--seed", "1"])
+    assert result.exit_code == 0, result.output
+    assert "Wrote 5 environments" in result.output
+
+    result = runner.invoke(
+        app,
+        [
+            "assess",
+            "--input",
+            str(fleet),
+            "--workers",
+            "1",
+            "--artifacts-dir",
+            str(tmp_path / "artifacts"),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "Assessed 5/5 environments" in result.output
+
+    result = runner.invoke(
+        app, ["synth", "--output", str(tmp_path / "x"), "--count", "1", "--format", "xml"]
+    )
+    assert result.exit_code != 0
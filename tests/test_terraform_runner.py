@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from okml.adapters.terraform_runner import PLAN_FILE, TerraformRunner
+
+# Stands in for terraform: records each call and fakes just enough of init/plan/apply/output.
+FAKE_TERRAFORM = """\
+import json, os, sys
+from pathlib import Path
+
+args = sys.argv[1:]
+with open(os.environ["FAKE_TF_LOG"], "a") as log:
+    log.write(json.dumps({"args": args, "cwd": os.getcwd(),
+                          "plugins": os.environ.get("TF_PLUGIN_CACHE_DIR")}) + "\\n")
+cmd = args[0]
+if cmd == "init":
+    Path(".terraform").mkdir(exist_ok=True)
+    Path(".terraform.lock.hcl").write_text("provider null 3.2.0\\n")
+elif cmd == "plan":
+    assert Path(".terraform").is_dir(), "not initialized"
+    assert not Path("terraform.tfstate").exists(), "stale state"
+    out = next(a.split("=", 1)[1] for a in args if a.startswith("-out="))
+    Path(out).write_text("plan")
+    print("Plan: 1 to add, 0 to change, 0 to destroy.")
+elif cmd == "apply":
+    assert Path(args[-1]).read_text() == "plan"
+    Path("terraform.tfstate").write_text("{}")
+    print("Apply complete! Resources: 1 added, 0 changed, 0 destroyed.")
+elif cmd == "output":
+    print(json.dumps({"provisioning_units": {"value": 12, "type": "number"}}))
+"""
+
+
+@pytest.fixture()
+def fake_terraform(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "terraform"
+    script.write_text(f"#!{sys.executable}\n{FAKE_TERRAFORM}", encoding="utf-8")
+    script.chmod(0o755)
+    log = tmp_path / "terraform-calls.ndjson"
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_TF_LOG", str(log))
+    return log
+
+
+def _calls(log: Path) -> list[dict[str, Any]]:
+    calls = [json.loads(line) for line in log.read_text(encoding="utf-8").splitlines()]
+    log.unlink()
+    return calls
+
+
+def test_workspace_is_reused_and_init_skipped(tmp_path: Path, fake_terraform: Path) -> None:
+    repo = tmp_path / "repo"
+    shutil.copytree("iac/terraform", repo / "iac" / "terraform")
+    cache = tmp_path / "tf-cache"
+    runner = TerraformRunner(repo, cache_dir=cache)
+
+    first = runner.run()
+    assert first.mode == "real"
+    assert "Plan: 1 to add" in first.plan_text and "Apply complete!" in first.plan_text
+    assert first.outputs["provisioning_units"] == {"value": 12, "type": "number"}
+    calls = _calls(fake_terraform)
+    assert [c["args"][0] for c in calls] == ["init", "plan", "apply", "output"]
+    assert f"-out={PLAN_FILE}" in calls[1]["args"]
+    assert calls[2]["args"][-1] == PLAN_FILE
+    assert {c["plugins"] for c in calls} == {str((cache / "plugins").resolve())}
+
+    # Same config: the workspace is reused, init skipped and last run's state cleared.
+    assert runner.run().mode == "real"
+    calls = _calls(fake_terraform)
+    assert [c["args"][0] for c in calls] == ["plan", "apply", "output"]
+
+    # A changed lock file re-inits; a changed config gets a workspace of its own.
+    (Path(calls[0]["cwd"]) / ".terraform.lock.hcl").write_text("provider null 3.3.0\n")
+    runner.run()
+    assert _calls(fake_terraform)[0]["args"][0] == "init"
+    with (repo / "iac" / "terraform" / "main.tf").open("a") as f:
+        f.write("\n# changed\n")
+    runner.run()
+    calls = _calls(fake_terraform)
+    assert calls[0]["args"][0] == "init"
+    assert len(list(cache.glob("ws-*"))) == 2
+
+
+def test_plan_and_apply_stream_to_log_dir(tmp_path: Path, fake_terraform: Path) -> None:
+    logs = tmp_path / "logs"
+    result = TerraformRunner(Path.cwd(), cache_dir=tmp_path / "tf-cache", log_dir=logs).run()
+    assert result.mode == "real"
+    assert (logs / "terraform_plan.log").read_text(encoding="utf-8").startswith("Plan: 1 to add")
+    assert "Apply complete!" in (logs / "terraform_apply.log").read_text(encoding="utf-8")
+    assert "Plan: 1 to add" in result.plan_text
+
+
+def test_failing_terraform_falls_back_to_mock(
+    tmp_path: Path, fake_terraform: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("FAKE_TF_LOG", str(tmp_path / "missing-dir" / "log"))
+    result = TerraformRunner(Path.cwd(), cache_dir=tmp_path / "tf-cache").run()
+    assert result.mode == "mock"